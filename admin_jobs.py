@@ -0,0 +1,237 @@
+"""
+Hintergrund-Jobs für den Admin-Bereich (Struktur-Check und -Generierung).
+
+Eine Anfrage startet einen Job mit `submit(kind)` und erhält sofort seinen
+Status samt Job-ID zurück. Die Arbeit läuft in einem Thread-Pool mit höchstens
+`max_workers` Threads je Prozess; pro Art (`kind`) läuft höchstens ein Job
+gleichzeitig. Wer einen Job startet, während einer derselben Art läuft,
+erhält diesen zurück.
+
+Status und Log eines Jobs liegen als Dateien unter `directory`:
+
+    <id>.json     Status (queued, running, done, failed), Zeiten, Ergebnis
+    <id>.log      Log-Zeilen, während der Job läuft fortlaufend geschrieben
+    <kind>.lock   Sperre für submit
+    <kind>.current / <kind>.cached   ID des letzten bzw. des wiederverwendbaren Jobs
+
+Dadurch kann jeder Worker-Prozess Status und Log eines Jobs lesen
+(`status`, `read_log`, `stream`), nicht nur der, der ihn gestartet hat. Solange
+ein Job läuft, erneuert sein Prozess regelmäßig die Statusdatei. Bleibt das aus,
+etwa weil der Worker beendet wurde, gilt der Job nach `stale_after` Sekunden als
+abgebrochen.
+
+Arten mit einer `signature`-Funktion verwenden ihr letztes Ergebnis wieder,
+solange sich die Signatur (z. B. der Verzeichnisbaum) nicht geändert hat.
+"""
+import os
+import re
+import json
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from storage.locks import file_lock
+
+JOB_ID_PATTERN = re.compile(r'^[a-z_]+-[0-9a-f]{32}$')
+ACTIVE_STATES = ('queued', 'running')
+# Höchstens so viele Bytes Log liefert ein einzelner read_log-Aufruf
+READ_CHUNK_BYTES = 256 * 1024
+
+
+class AdminJobs:
+    """Dateibasierte Job-Verwaltung mit begrenztem Thread-Pool."""
+
+    def __init__(self, directory, max_workers=2, keep=20, stale_after=30):
+        self.directory = directory
+        self.keep = keep
+        self.stale_after = stale_after
+        self._handlers = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='admin-job')
+        self._active = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def register(self, kind, run, signature=None):
+        """
+        Meldet eine Job-Art an. `run(log)` führt den Job aus, schreibt Ausgaben mit
+        `log(zeile)` und gibt ein JSON-fähiges Ergebnis zurück. `signature()` kennzeichnet
+        den Zustand, von dem das Ergebnis abhängt (None: nicht wiederverwendbar).
+        """
+        self._handlers[kind] = (run, signature)
+
+    # --- Dateien ---
+
+    def _path(self, name, suffix):
+        return os.path.join(self.directory, name + suffix)
+
+    def _write_status(self, job):
+        tmp_path = self._path(job['id'], f".json.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(job['id'], '.json'))
+
+    def _read_pointer(self, kind, name):
+        try:
+            with open(self._path(kind, '.' + name), 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _write_pointer(self, kind, name, job_id):
+        with open(self._path(kind, '.' + name), 'w', encoding='utf-8') as f:
+            f.write(job_id)
+
+    def _is_stale(self, job):
+        try:
+            return time.time() - os.path.getmtime(self._path(job['id'], '.json')) > self.stale_after
+        except OSError:
+            return True
+
+    # --- Lesen ---
+
+    def status(self, job_id):
+        """Status eines Jobs als Dict oder None, wenn es ihn nicht (mehr) gibt."""
+        if not job_id or not JOB_ID_PATTERN.match(job_id):
+            return None
+        try:
+            with open(self._path(job_id, '.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def read_log(self, job_id, offset=0):
+        """Vollständige Log-Zeilen ab Byte-Position `offset`. Gibt (zeilen, neue_position) zurück."""
+        if not JOB_ID_PATTERN.match(job_id or ''):
+            return [], offset
+        try:
+            with open(self._path(job_id, '.log'), 'rb') as f:
+                f.seek(offset)
+                data = f.read(READ_CHUNK_BYTES)
+        except OSError:
+            return [], offset
+        # Nur bis zum letzten Zeilenende: Eine halb geschriebene Zeile kommt beim nächsten Lesen
+        end = data.rfind(b'\n') + 1
+        if not end:
+            return [], offset
+        return data[:end].decode('utf-8', 'replace').splitlines(), offset + end
+
+    def stream(self, job_id, offset=0, poll_interval=0.25, keepalive=15):
+        """
+        Server-Sent Events für das Log eines Jobs: je Zeile ein `data:`-Ereignis (mit der
+        Byte-Position als `id`, für Last-Event-ID), zum Schluss `event: end` mit dem Status.
+        """
+        idle = 0.0
+        while True:
+            job = self.status(job_id)
+            lines, offset = self.read_log(job_id, offset)
+            if lines:
+                idle = 0.0
+                events = [f"data: {line.rstrip()}\n\n" for line in lines]
+                # Die Position gehört zum letzten Ereignis, bei einer Wiederverbindung geht es dort weiter
+                events[-1] = f"id: {offset}\n" + events[-1]
+                yield ''.join(events)
+                continue
+            # Der Status wurde vor dem Lesen geholt: Ist der Job fertig, ist das Log vollständig gelesen
+            if job is None or job['status'] not in ACTIVE_STATES:
+                yield f"event: end\ndata: {json.dumps(job, ensure_ascii=False)}\n\n"
+                return
+            time.sleep(poll_interval)
+            idle += poll_interval
+            if idle >= keepalive:
+                idle = 0.0
+                yield ": keepalive\n\n"
+
+    # --- Ausführen ---
+
+    def submit(self, kind):
+        """Startet einen Job der Art `kind` oder gibt den bereits laufenden zurück. Wirft KeyError bei unbekannter Art."""
+        if kind not in self._handlers:
+            raise KeyError(kind)
+        os.makedirs(self.directory, exist_ok=True)
+        with file_lock(self._path(kind, '.lock')):
+            current = self.status(self._read_pointer(kind, 'current'))
+            if current and current['status'] in ACTIVE_STATES:
+                if not self._is_stale(current):
+                    return current
+                current.update(status='failed', error="Abgebrochen: Der ausführende Prozess antwortet nicht mehr.",
+                               finished=time.time())
+                self._write_status(current)
+            job = {"id": f"{kind}-{uuid.uuid4().hex}", "kind": kind, "status": "queued", "cached": False,
+                   "created": time.time(), "started": None, "finished": None, "result": None, "error": None}
+            open(self._path(job['id'], '.log'), 'w').close()
+            self._write_status(job)
+            self._write_pointer(kind, 'current', job['id'])
+        with self._lock:
+            self._active.add(job['id'])
+            self._start_heartbeat()
+        self._pool.submit(self._run, job)
+        self._prune()
+        return job
+
+    def _run(self, job):
+        run, signature = self._handlers[job['kind']]
+        job.update(status='running', started=time.time())
+        self._write_status(job)
+        try:
+            with open(self._path(job['id'], '.log'), 'a', encoding='utf-8') as log_file:
+                def log(line):
+                    log_file.write(str(line).rstrip('\n') + '\n')
+                    log_file.flush()
+
+                job['signature'] = signature() if signature else None
+                cached = self.status(self._read_pointer(job['kind'], 'cached')) if job['signature'] else None
+                if cached and cached.get('signature') == job['signature'] and cached['status'] == 'done':
+                    lines, _ = self.read_log(cached['id'])
+                    for line in lines:
+                        log(line)
+                    job.update(result=cached['result'], cached=True)
+                else:
+                    job['result'] = run(log)
+            job['status'] = 'done'
+            if job['signature']:
+                self._write_pointer(job['kind'], 'cached', job['id'])
+        except Exception as e:
+            job.update(status='failed', error=str(e))
+        finally:
+            job['finished'] = time.time()
+            self._write_status(job)
+            with self._lock:
+                self._active.discard(job['id'])
+
+    def _start_heartbeat(self):
+        if self._heartbeat is None:
+            self._heartbeat = threading.Thread(target=self._heartbeat_loop, name='admin-job-heartbeat', daemon=True)
+            self._heartbeat.start()
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.stale_after / 3):
+            with self._lock:
+                active = list(self._active)
+            for job_id in active:
+                try:
+                    os.utime(self._path(job_id, '.json'))
+                except OSError:
+                    pass
+
+    def _prune(self):
+        """Löscht die Dateien alter, abgeschlossener Jobs (die neuesten `keep` bleiben)."""
+        try:
+            names = [name[:-5] for name in os.listdir(self.directory)
+                     if name.endswith('.json') and JOB_ID_PATTERN.match(name[:-5])]
+        except OSError:
+            return
+        jobs = sorted((job for job in map(self.status, names) if job), key=lambda job: job['created'], reverse=True)
+        for job in jobs[self.keep:]:
+            if job['status'] in ACTIVE_STATES:
+                continue
+            for suffix in ('.json', '.log'):
+                try:
+                    os.remove(self._path(job['id'], suffix))
+                except OSError:
+                    pass
+
+    def close(self):
+        self._stop.set()
+        self._pool.shutdown(wait=False)
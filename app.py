@@ -3,83 +3,333 @@ import json
 import re
 import uuid
 import sys
-import subprocess
+import sqlite3
+import threading
 from functools import wraps
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for, flash
+from flask import Flask, Response, current_app, render_template, jsonify, request, session, redirect, url_for, flash
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.local import LocalProxy
 import shutil
-
-app = Flask(__name__)
-app.secret_key = 'your_very_secret_key_12345'
+import atexit
+from storage import document_cache, configure_codec, configure_writes, flush_writes, load_json as _load_json, create_engine, is_valid_project_id
+from storage.json_patch import apply_patch, JsonPatchError, JsonPatchTestFailed
+from http_cache import HttpCache, etag_matches, if_match_fails, not_modified
+from storage.guest_store import GUEST_ID_PREFIX, GuestRoutingEngine, GuestWorkspaceStore
+from storage.maintenance import MaintenanceScheduler, run_maintenance
+from storage.limits import DEFAULT_GUEST_LIMITS, LimitExceeded, ProjectLimits
+from storage.global_settings import GlobalSettingsService, SettingsError
+from storage.templates import TemplateCatalog, INITIAL_TEMPLATE_ID, instantiate_template
+from admin_jobs import AdminJobs
+from storage.project_listing import DEFAULT_LIST_FIELDS, ListingError, encode_cursor, iter_project_summaries, parse_fields, project_fields
 
 # --- Konfiguration ---
-DATA_ROOT = os.path.join('static', 'data')
-USER_DATA_DIR = os.path.join(DATA_ROOT, 'user_data')
-USERS_FILE = os.path.join(DATA_ROOT, 'users.json')
-SETTINGS_FILE = os.path.join('api', 'global_settings.json')
-TEMPLATES_DIR = os.path.join(DATA_ROOT, 'templates') 
-STRUCTURE_FILE = 'structure.json'
-os.makedirs(USER_DATA_DIR, exist_ok=True)
-os.makedirs(TEMPLATES_DIR, exist_ok=True) 
-
-# NEU: Standard-Profilbild und Profil-Datei-Pfade
+# Standardwerte; create_app(config) übernimmt sie in app.config und überschreibt sie mit `config`.
+# Alle Pfade beziehen sich auf das Verzeichnis dieser Datei, nicht auf das aktuelle Arbeitsverzeichnis.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SECRET_KEY = 'your_very_secret_key_12345'
+# Anzahl der Worker-Prozesse, die gleichzeitig auf dieselben Daten zugreifen (setzt gunicorn.conf.py)
+SERVER_WORKERS = int(os.environ.get('PROJEKTPLANER_WORKERS', '1'))
+# Höchstgröße eines Anfrage-Bodys; größere Anfragen werden mit 413 abgelehnt
+MAX_CONTENT_LENGTH = 16 * 1024 * 1024
+# Debug-Modus des Entwicklungsservers (python app.py); im Produktivbetrieb über wsgi.py ohne Bedeutung
+DEV_SERVER_DEBUG = os.environ.get('PROJEKTPLANER_DEBUG', '1') == '1'
+DATA_ROOT = os.path.join(BASE_DIR, 'static', 'data')
+# Pfade relativ zu DATA_ROOT; wird nur DATA_ROOT überschrieben, folgen sie ihm (siehe create_app)
+DATA_PATHS = {
+    'USER_DATA_DIR': 'user_data',
+    'USERS_FILE': 'users.json',
+    'USERS_DIR': 'users',
+    'TEMPLATES_DIR': 'templates',
+    'SQLITE_DATABASE': 'projektplaner.sqlite3',
+    'MAINTENANCE_STAMP_FILE': 'maintenance.stamp',
+    'ORPHAN_QUARANTINE_DIR': 'user_data_orphans',
+}
+USER_DATA_DIR = os.path.join(DATA_ROOT, DATA_PATHS['USER_DATA_DIR'])
+USERS_FILE = os.path.join(DATA_ROOT, DATA_PATHS['USERS_FILE'])
+USERS_DIR = os.path.join(DATA_ROOT, DATA_PATHS['USERS_DIR'])
+SETTINGS_FILE = os.path.join(BASE_DIR, 'api', 'global_settings.json')
+TEMPLATES_DIR = os.path.join(DATA_ROOT, DATA_PATHS['TEMPLATES_DIR'])
+STRUCTURE_FILE = os.path.join(BASE_DIR, 'structure.json')
+# Speicherbudget für den In-Prozess-Cache geparster JSON-Dokumente
+JSON_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# JSON-Codec für Dateien und API-Antworten: 'auto' (orjson > ujson > json), 'orjson', 'ujson' oder 'json'
+JSON_CODEC = 'auto'
+# True schreibt Dateien eingerückt (lesbar), False kompakt (etwa halb so viele Bytes)
+JSON_PRETTY_PRINT = False
+# Schreibstrategie: 'always' (fsync pro Speichern), 'group' (gebündelter fsync) oder 'never'
+FSYNC_POLICY = 'always'
+# Optionales Write-Ahead-Journal (z. B. os.path.join(DATA_ROOT, 'write_journal.log')).
+# Nur für den Betrieb mit einem einzelnen Worker-Prozess geeignet; bei SERVER_WORKERS > 1 ignoriert.
+WRITE_JOURNAL_FILE = None
+# Speicher-Engine: 'json' (Dateien unter static/data, Standard) oder 'sqlite' (SQLITE_DATABASE).
+# Umzug der Daten zwischen den Engines: python -m storage.transfer json sqlite
+STORAGE_ENGINE = 'json'
+SQLITE_DATABASE = os.path.join(DATA_ROOT, DATA_PATHS['SQLITE_DATABASE'])
+# Gäste arbeiten im Arbeitsspeicher statt unter USER_DATA_DIR (siehe storage.guest_store):
+# Verfall nach GUEST_WORKSPACE_TTL Sekunden ohne Zugriff, höchstens GUEST_WORKSPACE_MAX Gäste je Prozess
+GUEST_WORKSPACE_TTL = 3600
+GUEST_WORKSPACE_MAX = 1000
+GUEST_REAP_INTERVAL = 60
+# Wartung (storage.maintenance): verwaiste Benutzerverzeichnisse, abgelaufene Gäste, Logs kürzen.
+# Läuft alle MAINTENANCE_INTERVAL Sekunden im Hintergrund (0: nur per python -m storage.maintenance)
+# und höchstens mit MAINTENANCE_IO_RATE Dateioperationen pro Sekunde
+MAINTENANCE_INTERVAL = 6 * 3600
+MAINTENANCE_IO_RATE = 50
+MAINTENANCE_STAMP_FILE = os.path.join(DATA_ROOT, DATA_PATHS['MAINTENANCE_STAMP_FILE'])
+# Verzeichnisse ohne Benutzer werden erst gelöscht, wenn sie so viele Sekunden unverändert sind
+ORPHAN_DIR_MIN_AGE = 3600
+# Verwaiste Verzeichnisse werden nach ORPHAN_QUARANTINE_DIR verschoben; gelöscht nur mit DELETE_ORPHAN_DIRS
+ORPHAN_QUARANTINE_DIR = os.path.join(DATA_ROOT, DATA_PATHS['ORPHAN_QUARANTINE_DIR'])
+DELETE_ORPHAN_DIRS = False
+# Einträge, die im Log eines Benutzers bleiben; ältere werden archiviert (LOG_ARCHIVES_KEPT Archive je Benutzer)
+LOG_MAX_ENTRIES = 500
+LOG_ARCHIVES_KEPT = 5
+# Vorlagen werden im Speicher gehalten; auf Änderungen wird höchstens alle TEMPLATE_CHECK_INTERVAL Sekunden geprüft
+TEMPLATE_CHECK_INTERVAL = 2.0
+# Globale Einstellungen werden im Speicher gehalten; Änderungen aus anderen Worker-Prozessen
+# sind nach höchstens GLOBAL_SETTINGS_CHECK_INTERVAL Sekunden überall wirksam
+GLOBAL_SETTINGS_CHECK_INTERVAL = 1.0
+# Hintergrund-Jobs im Admin-Bereich (Struktur-Check/-Generierung, siehe admin_jobs.py).
+# Status und Logs liegen unter ADMIN_JOBS_DIR, damit jeder Worker-Prozess sie lesen kann;
+# höchstens ADMIN_JOB_WORKERS Jobs gleichzeitig je Prozess, die neuesten ADMIN_JOBS_KEPT bleiben erhalten
+ADMIN_JOBS_DIR = os.path.join(BASE_DIR, 'instance', 'admin_jobs')
+ADMIN_JOB_WORKERS = 2
+ADMIN_JOBS_KEPT = 20
+# Seitengröße für die Benutzerliste im Admin-Bereich
+ADMIN_USERS_PAGE_SIZE = 100
+# Standard- und Höchstgröße einer Seite der Projektliste (/api/projects/list)
+PROJECT_LIST_PAGE_SIZE = 50
+PROJECT_LIST_MAX_PAGE_SIZE = 200
+# HTTP-Caching: ETags/304 für JSON-Antworten, Kompression ab COMPRESSION_MIN_BYTES,
+# versionierte statische URLs mit STATIC_MAX_AGE Sekunden Cache-Dauer
+COMPRESSION_MIN_BYTES = 1024
+STATIC_MAX_AGE = 365 * 24 * 3600
+# Vorlagen und globale Einstellungen schon beim Start laden statt bei der ersten Anfrage
+WARM_UP = True
+
+# NEU: Standard-Profilbild und Standard-Profildaten
 STANDARD_PROFILE_PICTURE = 'static/img/standard_profile_picture.png'
-PROFILE_FILE_NAME = 'profile.json'
+DEFAULT_PROFILE_DATA = {
+    "profilbild": STANDARD_PROFILE_PICTURE, "alter": 0, "wohnort": "", "land": "", "plz": "", "aboutme": ""
+}
 
-# --- Helper-Funktionen ---
+def create_storage_engine(kind=STORAGE_ENGINE, database_path=SQLITE_DATABASE, config=None):
+    """Erzeugt eine Speicher-Engine mit den Pfaden dieser Anwendung (oder aus `config`)."""
+    paths = config or globals()
+    return create_engine(kind, paths['USER_DATA_DIR'], paths['USERS_DIR'], paths['USERS_FILE'],
+                         paths['SETTINGS_FILE'], paths['TEMPLATES_DIR'], database_path)
 
-def _load_json(filepath, default_data={}):
+
+class AppServices:
     """
-    Lädt JSON-Daten aus einer Datei.
-    Wenn die Datei nicht existiert, leer ist oder fehlerhaftes JSON enthält, wird default_data zurückgegeben.
+    Speicher-Engine, Vorlagenkatalog und globale Einstellungen einer App-Instanz.
+    Beides wird erst beim ersten Zugriff angelegt (oder in warm_up), nicht beim Import.
     """
-    if not os.path.exists(filepath):
-        print(f"DEBUG: Datei nicht gefunden: {filepath}", file=sys.stderr)
-        return default_data
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            if not content:
-                print(f"DEBUG: Datei ist leer: {filepath}", file=sys.stderr)
-                return default_data
-            return json.loads(content)
-    except (json.JSONDecodeError, FileNotFoundError) as e:
-        print(f"FEHLER: Beim Laden von JSON aus {filepath}: {e}", file=sys.stderr)
-        return default_data
-
-def _save_json(filepath, data):
+
+    def __init__(self, config):
+        self.config = config
+        self._lock = threading.Lock()
+        self._storage_engine = None
+        self._template_catalog = None
+        self._global_settings = None
+        self._maintenance = None
+        self._admin_jobs = None
+
+    @property
+    def storage_engine(self):
+        if self._storage_engine is None:
+            with self._lock:
+                if self._storage_engine is None:
+                    os.makedirs(self.config['USER_DATA_DIR'], exist_ok=True)
+                    os.makedirs(self.config['TEMPLATES_DIR'], exist_ok=True)
+                    guests = GuestWorkspaceStore(self.config['GUEST_WORKSPACE_TTL'], self.config['GUEST_WORKSPACE_MAX'],
+                                                 self.config['GUEST_REAP_INTERVAL'])
+                    engine = GuestRoutingEngine(create_storage_engine(self.config['STORAGE_ENGINE'],
+                                                                      self.config['SQLITE_DATABASE'], self.config), guests)
+                    atexit.register(engine.close)
+                    self._storage_engine = engine
+                    self._maintenance = MaintenanceScheduler(self.run_maintenance, self.config['MAINTENANCE_INTERVAL'],
+                                                             self.config['MAINTENANCE_STAMP_FILE'])
+                    self._maintenance.start()
+        return self._storage_engine
+
+    @property
+    def template_catalog(self):
+        if self._template_catalog is None:
+            engine = self.storage_engine
+            with self._lock:
+                if self._template_catalog is None:
+                    self._template_catalog = TemplateCatalog(engine, check_interval=self.config['TEMPLATE_CHECK_INTERVAL'])
+        return self._template_catalog
+
+    @property
+    def global_settings(self):
+        if self._global_settings is None:
+            engine = self.storage_engine
+            with self._lock:
+                if self._global_settings is None:
+                    self._global_settings = GlobalSettingsService(engine, check_interval=self.config['GLOBAL_SETTINGS_CHECK_INTERVAL'])
+        return self._global_settings
+
+    @property
+    def admin_jobs(self):
+        if self._admin_jobs is None:
+            with self._lock:
+                if self._admin_jobs is None:
+                    jobs = AdminJobs(self.config['ADMIN_JOBS_DIR'], self.config['ADMIN_JOB_WORKERS'], self.config['ADMIN_JOBS_KEPT'])
+                    jobs.register('check', _check_structure_job, signature=_structure_signature)
+                    # Inhaltsprüfungen nicht wiederverwenden: Die Signatur erfasst nur den Verzeichnisbaum
+                    jobs.register('verify', lambda log: _check_structure_job(log, verify=True))
+                    jobs.register('generate', _generate_structure_job)
+                    jobs.register('generate_manifest', lambda log: _generate_structure_job(log, with_hashes=True))
+                    atexit.register(jobs.close)
+                    self._admin_jobs = jobs
+        return self._admin_jobs
+
+    def run_maintenance(self, dry_run=False):
+        """Ein Wartungslauf mit den Einstellungen dieser App (siehe storage.maintenance)."""
+        return run_maintenance(self.storage_engine, self.config['USER_DATA_DIR'], dry_run=dry_run,
+                               io_rate=self.config['MAINTENANCE_IO_RATE'], orphan_min_age=self.config['ORPHAN_DIR_MIN_AGE'],
+                               log_max_entries=self.config['LOG_MAX_ENTRIES'], log_archives_kept=self.config['LOG_ARCHIVES_KEPT'],
+                               quarantine_dir=self.config['ORPHAN_QUARANTINE_DIR'], delete_orphans=self.config['DELETE_ORPHAN_DIRS'])
+
+    def warm_up(self):
+        """Lädt Vorlagen und globale Einstellungen vorab, damit die erste Anfrage nicht darauf wartet."""
+        self.template_catalog.refresh(force=True)
+        self.global_settings.refresh(force=True)
+
+
+def _services():
+    return current_app.extensions['projektplaner']
+
+# Stellvertreter für die Dienste der App, die die aktuelle Anfrage bearbeitet
+storage_engine = LocalProxy(lambda: _services().storage_engine)
+template_catalog = LocalProxy(lambda: _services().template_catalog)
+global_settings = LocalProxy(lambda: _services().global_settings)
+admin_jobs = LocalProxy(lambda: _services().admin_jobs)
+
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """JSON-Provider für jsonify/request.get_json, der den konfigurierten Codec verwendet."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.codec = configure_codec(app.config['JSON_CODEC'], pretty=app.config['JSON_PRETTY_PRINT'])
+
+    def dumps(self, obj, **kwargs):
+        return self.codec.dumps(obj, default=kwargs.get('default', self.default)).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return self.codec.loads(s)
+
+
+_routes = []
+
+def route(rule, **options):
+    """Wie @app.route, merkt die Route aber nur vor; create_app registriert sie an jeder neuen App."""
+    def decorator(f):
+        _routes.append((rule, f, options))
+        return f
+    return decorator
+
+
+def create_app(config=None):
     """
-    Speichert JSON-Daten in einer Datei.
-    Erstellt bei Bedarf die Verzeichnisse.
+    Erzeugt eine App-Instanz. `config` überschreibt einzelne Standardwerte von oben
+    (z. B. {'DATA_ROOT': ..., 'STORAGE_ENGINE': 'sqlite'}). Speicher und Caches werden
+    erst beim ersten Zugriff angelegt, mit WARM_UP sofort über warm_up(app).
     """
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    return True
+    overrides = dict(config or {})
+    if 'DATA_ROOT' in overrides:
+        for key, name in DATA_PATHS.items():
+            overrides.setdefault(key, os.path.join(overrides['DATA_ROOT'], name))
+
+    app = Flask(__name__, root_path=BASE_DIR)
+    app.config.from_mapping({key: value for key, value in globals().items() if key.isupper()})
+    app.config.update(overrides)
+
+    document_cache.configure(max_bytes=app.config['JSON_CACHE_MAX_BYTES'])
+    journal_path = app.config['WRITE_JOURNAL_FILE']
+    if journal_path and app.config['SERVER_WORKERS'] > 1:
+        # Das Journal hält Schreibvorgänge im Speicher eines Prozesses; andere Worker sähen sie verspätet
+        print(f"WARNUNG: WRITE_JOURNAL_FILE wird bei {app.config['SERVER_WORKERS']} Worker-Prozessen ignoriert.", file=sys.stderr)
+        journal_path = None
+    configure_writes(fsync_policy=app.config['FSYNC_POLICY'], journal_path=journal_path)
+    atexit.register(flush_writes)
+
+    app.json = CodecJSONProvider(app)
+    HttpCache(app, min_size=app.config['COMPRESSION_MIN_BYTES'], static_max_age=app.config['STATIC_MAX_AGE'])
+    app.extensions['projektplaner'] = AppServices(app.config)
+    for rule, view_func, options in _routes:
+        app.add_url_rule(rule, view_func=view_func, **options)
+
+    if app.config['WARM_UP']:
+        warm_up(app)
+    return app
+
+
+def warm_up(app):
+    """Warm-up-Hook: lädt Vorlagenkatalog und globale Einstellungen der App vorab."""
+    app.extensions['projektplaner'].warm_up()
+
+# --- Helper-Funktionen ---
 
 def is_valid_email(email):
     """Prüft, ob eine E-Mail-Adresse ein gültiges Format hat."""
     return re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email)
 
-def get_user_data_path(user_id, data_type="projects"):
-    """Gibt den Pfad zu den benutzerspezifischen Daten zurück und erstellt das Verzeichnis, falls nötig."""
-    if not user_id: return None
-    user_dir = os.path.join(USER_DATA_DIR, str(user_id))
-    os.makedirs(user_dir, exist_ok=True)
-    return os.path.join(user_dir, f"{data_type}.json")
-
 def get_user_img_path(user_id):
     """Gibt den Pfad zum Bildverzeichnis des Benutzers zurück und erstellt es, falls nötig."""
     if not user_id: return None
-    user_img_dir = os.path.join(USER_DATA_DIR, str(user_id), 'img')
+    user_img_dir = os.path.join(current_app.config['USER_DATA_DIR'], str(user_id), 'img')
     os.makedirs(user_img_dir, exist_ok=True)
     return user_img_dir
 
-def get_user_profile_path(user_id):
-    """Gibt den Pfad zur Profildatei des Benutzers zurück."""
-    if not user_id: return None
-    user_dir = os.path.join(USER_DATA_DIR, str(user_id))
-    os.makedirs(user_dir, exist_ok=True)
-    return os.path.join(user_dir, PROFILE_FILE_NAME)
+def _default_user_documents():
+    """Grunddaten eines neuen Benutzers (Profil, Einstellungen, Logs)."""
+    return {"profile": dict(DEFAULT_PROFILE_DATA), "settings": {"design": "default"}, "logs": []}
+
+
+def _guest_project_count_error(user_id):
+    """Prüft, ob ein Gast noch ein weiteres Projekt anlegen darf. Gibt die Fehlermeldung oder None zurück."""
+    global_app_settings = global_settings.get()
+    max_projects = global_app_settings.get('guest_limits', {}).get('projects', 1)
+    if storage_engine.count_projects(user_id) >= max_projects:
+        return f"Als Gast können Sie maximal {max_projects} Projekte erstellen."
+    return None
+
+
+def _project_limits():
+    """Limits für Projekte des aktuellen Benutzers: Gast-Limits, Limits seines Tarifs (plan_limits) oder None."""
+    app_settings = global_settings.get()
+    if session.get('is_guest'):
+        return ProjectLimits.from_settings(app_settings.get('guest_limits'), DEFAULT_GUEST_LIMITS)
+    plan_limits = app_settings.get('plan_limits') or {}
+    plan = session.get('plan')
+    if plan in plan_limits:
+        return ProjectLimits.from_settings(plan_limits[plan], subject="In Ihrem Tarif")
+    return None
+
+
+def _project_from_request(limits):
+    """
+    Liest den Projekt-Body der Anfrage; None bei ungültigem JSON.
+    Mit Limits wird die Größe vor dem Lesen geprüft und das Parsen beim ersten Verstoß
+    abgebrochen (wirft LimitExceeded), statt erst den vollständigen Body aufzubauen.
+    """
+    if limits is None:
+        return request.get_json(silent=True)
+    limits.check_size(request.content_length)
+    if limits.max_project_bytes is not None:
+        data = request.stream.read(limits.max_project_bytes + 1)
+    else:
+        data = request.get_data(cache=False)
+    try:
+        return limits.loads(data)
+    except LimitExceeded:
+        raise
+    except ValueError:
+        return None
 
 
 # --- Decorators ---
@@ -105,71 +355,64 @@ def admin_required(f):
     return decorated_function
 
 # --- New API Endpoints for Templates ---
-@app.route('/api/templates', methods=['GET'])
+@route('/api/templates', methods=['GET'])
 def get_templates():
-    """Gibt eine Liste verfügbarer Projektvorlagen zurück."""
-    templates = []
-    for filename in os.listdir(TEMPLATES_DIR):
-        if filename.endswith('.json') and filename != 'bsp.json': 
-            template_path = os.path.join(TEMPLATES_DIR, filename)
-            try:
-                data = _load_json(template_path)
-                templates.append({
-                    'id': filename.replace('.json', ''),
-                    'name': data.get('name', filename.replace('.json', '')),
-                    'description': data.get('description', '')
-                })
-            except Exception:
-                continue 
-    return jsonify(templates)
-
-@app.route('/api/template/<template_id>', methods=['GET'])
+    """Gibt eine Liste verfügbarer Projektvorlagen aus dem Vorlagenkatalog zurück (mit ETag, 304 bei unverändertem Stand)."""
+    templates, etag = template_catalog.index()
+    if etag_matches(etag):
+        return not_modified(etag)
+    response = jsonify(templates)
+    if etag:
+        response.set_etag(etag)
+    return response
+
+@route('/api/template/<template_id>', methods=['GET'])
 def get_template_content(template_id):
     """Gibt den Inhalt einer spezifischen Projektvorlage zurück."""
-    base_path = os.path.abspath(TEMPLATES_DIR)
-    requested_path = os.path.abspath(os.path.join(base_path, f"{template_id}.json"))
-
-    if not requested_path.startswith(base_path):
+    if not is_valid_project_id(template_id):
         return jsonify({"error": "Invalid template ID."}), 400
 
-    if not os.path.exists(requested_path) or template_id == 'bsp': 
+    if template_id == INITIAL_TEMPLATE_ID: 
         return jsonify({"error": "Template not found."}), 404
-    try:
-        template_data = _load_json(requested_path)
-        return jsonify(template_data)
-    except Exception:
-        return jsonify({"error": "Error loading template content."}), 500
+    template = template_catalog.get(template_id)
+    if template is None:
+        return jsonify({"error": "Template not found."}), 404
+    if etag_matches(template.etag):
+        return not_modified(template.etag)
+    response = jsonify(template.body)
+    response.set_etag(template.etag)
+    return response
 
-@app.route('/api/initial-project', methods=['GET'])
+@route('/api/initial-project', methods=['GET'])
 def get_initial_project():
     """Gibt den Inhalt des initialen Beispielprojekts (bsp.json) zurück."""
-    bsp_path = os.path.join(TEMPLATES_DIR, 'bsp.json')
-    if not os.path.exists(bsp_path):
+    template = template_catalog.get(INITIAL_TEMPLATE_ID)
+    if template is None:
         return jsonify({"error": "Initial project template not found."}), 404
-    try:
-        project_data = _load_json(bsp_path)
-        return jsonify(project_data)
-    except Exception:
-        return jsonify({"error": "Error loading initial project content."}), 500
+    if etag_matches(template.etag):
+        return not_modified(template.etag)
+    response = jsonify(template.body)
+    response.set_etag(template.etag)
+    return response
 
 
 # --- Routen für Seiten ---
-@app.route('/')
+@route('/')
 def index():
     """Startseite der Anwendung. Leitet angemeldete Benutzer zum Dashboard weiter."""
     if 'user_id' in session: return redirect(url_for('dashboard'))
     return render_template('index.html')
 
-@app.route('/guest')
+@route('/guest')
 def guest_login():
     """Meldet einen Benutzer als Gast an."""
     session.clear()
     session['is_guest'] = True
     session['username'] = 'Gast'
-    session['user_id'] = f"guest_{uuid.uuid4()}"
+    session['user_id'] = f"{GUEST_ID_PREFIX}{uuid.uuid4()}"
     return redirect(url_for('dashboard'))
 
-@app.route('/login', methods=['GET', 'POST'])
+@route('/login', methods=['GET', 'POST'])
 def login_route():
     """Login-Seite für Benutzer."""
     if 'user_id' in session: 
@@ -178,20 +421,15 @@ def login_route():
     if request.method == 'POST':
         identifier = request.form.get('identifier')
         password = request.form.get('password')
-        users = _load_json(USERS_FILE)
-
-        user_found = None
-        for username, user_data in users.items():
-            if identifier == username or identifier == user_data.get('email'):
-                user_found = user_data
-                user_found['username'] = username
-                break
+        user_found = storage_engine.find_user(identifier)
         
         if user_found and user_found['password'] == password:
             session.clear()
             session['user_id'] = user_found['id']
             session['username'] = user_found['username']
             session['isAdmin'] = user_found.get('isAdmin', False)
+            # Tarif für Limits aus plan_limits der globalen Einstellungen (ohne Tarif: unbegrenzt)
+            session['plan'] = user_found.get('plan')
             flash(f"Willkommen zurück, {session['username']}!", "success")
             return redirect(url_for('dashboard'))
         else:
@@ -200,10 +438,10 @@ def login_route():
 
     return render_template('login.html')
 
-@app.route('/register', methods=['GET', 'POST'])
+@route('/register', methods=['GET', 'POST'])
 def register_route():
     """Registrierungsseite für neue Benutzer."""
-    global_app_settings = _load_json(SETTINGS_FILE, {"registration_enabled": True}) 
+    global_app_settings = global_settings.get()
 
     if 'user_id' in session: return redirect(url_for('dashboard'))
 
@@ -219,113 +457,107 @@ def register_route():
         password = request.form.get('password')
         email = request.form.get('email')
         agb = request.form.get('agb')
-        users = _load_json(USERS_FILE)
 
         if not agb:
             flash('Sie müssen den AGB zustimmen.', 'error')
+        elif not username or not username.strip():
+            flash('Geben Sie einen Benutzernamen ein.', 'error')
         elif not is_valid_email(email):
             flash('Geben Sie eine gültige E-Mail-Adresse ein.', 'error')
-        elif username in users:
+        elif storage_engine.username_exists(username):
             flash('Benutzername bereits vergeben.', 'error')
-        elif any(u.get('email') == email for u in users.values()):
+        elif storage_engine.email_exists(email):
             flash('Diese E-Mail-Adresse wird bereits verwendet.', 'error')
         else:
             new_user_id = str(uuid.uuid4())
-            users[username] = {"id": new_user_id, "email": email, "password": password, "isAdmin": False}
-            _save_json(USERS_FILE, users)
-            
-            get_user_img_path(new_user_id)
-            user_profile_path = get_user_profile_path(new_user_id)
-            default_profile_data = {
-                "profilbild": STANDARD_PROFILE_PICTURE, "alter": 0, "wohnort": "", "land": "", "plz": "", "aboutme": ""
-            }
-            _save_json(user_profile_path, default_profile_data)
+            if not storage_engine.add_user(username, {"id": new_user_id, "email": email, "password": password, "isAdmin": False}):
+                flash('Benutzername oder E-Mail-Adresse wurde soeben vergeben.', 'error')
+                return render_template('register.html', registration_disabled=False)
 
-            _save_json(get_user_data_path(new_user_id, 'projects'), {})
-            _save_json(get_user_data_path(new_user_id, 'settings'), {"design": "default"})
-            _save_json(get_user_data_path(new_user_id, 'logs'), [])
+            get_user_img_path(new_user_id)
+            storage_engine.init_user(new_user_id, _default_user_documents())
             
             flash('Registrierung erfolgreich! Sie können sich jetzt anmelden.', 'success')
             return redirect(url_for('login_route'))
     return render_template('register.html', registration_disabled=False)
 
-@app.route('/logout')
+@route('/logout')
 def logout():
     """Meldet den Benutzer ab und löscht die Session."""
     session.clear()
     flash("Sie wurden erfolgreich abgemeldet.", "success")
     return redirect(url_for('index'))
 
-@app.route('/dashboard')
+@route('/dashboard')
 @login_required
 def dashboard():
     """Dashboard-Seite für angemeldete Benutzer."""
     return render_template('dashboard.html')
 
-@app.route('/project/<project_id>')
+@route('/project/<project_id>')
 @login_required
 def project_manager(project_id):
     """Projektmanager-Seite zum Bearbeiten von Projekten."""
     return render_template('project_manager.html', project_id=project_id)
 
-@app.route('/project-overview/<project_id>')
+@route('/project-overview/<project_id>')
 @login_required
 def project_overview(project_id):
     """Projektübersichtsseite."""
     return render_template('project_overview.html', project_id=project_id)
 
-@app.route('/project-checklist/<project_id>')
+@route('/project-checklist/<project_id>')
 @login_required
 def project_checklist(project_id):
     """Projekt-Checklisten-Seite."""
     return render_template('project_checklist.html', project_id=project_id)
 
-@app.route('/settings')
+@route('/settings')
 @login_required
 def settings():
     """Benutzereinstellungen-Seite."""
     return render_template('settings.html')
 
-@app.route('/info')
+@route('/info')
 def info():
     """Informations- und Hilfeseite."""
     return render_template('info.html')
 
-@app.route('/agb')
+@route('/agb')
 def agb():
     """Allgemeine Geschäftsbedingungen Seite."""
     return render_template('agb.html')
 
 # --- Admin-Routen ---
-@app.route('/admin')
+@route('/admin')
 @login_required
 @admin_required
 def admin_dashboard():
     """Admin-Dashboard-Seite."""
     return render_template('admin_dashboard.html')
 
-@app.route('/admin/users')
+@route('/admin/users')
 @login_required
 @admin_required
 def admin_user_management():
     """Admin-Seite zur Benutzerverwaltung."""
     return render_template('admin_user_management.html')
 
-@app.route('/admin/settings')
+@route('/admin/settings')
 @login_required
 @admin_required
 def admin_global_settings():
     """Admin-Seite für globale Einstellungen."""
     return render_template('admin_global_settings.html')
 
-@app.route('/admin/structure-check')
+@route('/admin/structure-check')
 @login_required
 @admin_required
 def admin_structure_check():
     """Admin-Seite für den Struktur-Check."""
     return render_template('admin_run_check.html')
 
-@app.route('/admin/factory-reset')
+@route('/admin/factory-reset')
 @login_required
 @admin_required
 def admin_factory_reset():
@@ -333,21 +565,32 @@ def admin_factory_reset():
     return render_template('admin_factory_reset.html')
 
 # --- API-Endpunkte ---
-@app.route('/api/admin/users', methods=['GET'])
+@route('/api/admin/users', methods=['GET'])
 @login_required
 @admin_required
 def admin_user_management_api():
-    """Gibt eine Liste aller Benutzer zurück (nur für Admins)."""
-    users = _load_json(USERS_FILE)
+    """
+    Gibt eine Seite der Benutzerliste zurück (nur für Admins).
+    Query-Parameter: offset, limit. Die Gesamtzahl steht im Header X-Total-Count.
+    """
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', current_app.config['ADMIN_USERS_PAGE_SIZE'], type=int), 1), current_app.config['ADMIN_USERS_PAGE_SIZE'])
     users_safe = []
-    for username, user_data in users.items():
-        user_copy = user_data.copy()
-        user_copy['username'] = username
-        user_copy.pop('password', None)
-        users_safe.append(user_copy)
-    return jsonify(users_safe)
-
-@app.route('/api/user/profile', methods=['GET'])
+    for user_data in storage_engine.list_users(offset, limit):
+        user_data.pop('password', None)
+        users_safe.append(user_data)
+    response = jsonify(users_safe)
+    response.headers['X-Total-Count'] = str(storage_engine.count_users())
+    return response
+
+@route('/api/admin/cache-stats', methods=['GET'])
+@login_required
+@admin_required
+def cache_stats_api():
+    """Gibt Treffer-, Fehl- und Verdrängungszähler des JSON-Dokument-Caches und die Zahl der Gast-Arbeitsbereiche zurück (nur für Admins)."""
+    return jsonify(dict(document_cache.stats(), guest_workspaces=storage_engine.guests.stats()))
+
+@route('/api/user/profile', methods=['GET'])
 @login_required
 def get_user_profile():
     """Gibt die Profildaten des aktuellen Benutzers zurück."""
@@ -355,13 +598,10 @@ def get_user_profile():
     if not user_id:
         return jsonify({"error": "Benutzer nicht angemeldet"}), 401
     
-    profile_path = get_user_profile_path(user_id)
-    profile_data = _load_json(profile_path, {
-        "profilbild": STANDARD_PROFILE_PICTURE, "alter": 0, "wohnort": "", "land": "", "plz": "", "aboutme": ""
-    })
+    profile_data = storage_engine.load_user_doc(user_id, 'profile', DEFAULT_PROFILE_DATA)
     return jsonify(profile_data)
 
-@app.route('/api/user/profile', methods=['POST'])
+@route('/api/user/profile', methods=['POST'])
 @login_required
 def update_user_profile():
     """Aktualisiert die Profildaten des aktuellen Benutzers."""
@@ -372,35 +612,92 @@ def update_user_profile():
     if session.get('is_guest'):
         return jsonify({"error": "Gäste können keine Profileinstellungen speichern"}), 403
 
-    profile_path = get_user_profile_path(user_id)
-    current_profile_data = _load_json(profile_path, {})
-    
     updated_data = request.get_json()
-    current_profile_data.update(updated_data)
-    
-    _save_json(profile_path, current_profile_data)
+
+    with storage_engine.user_lock(user_id):
+        current_profile_data = storage_engine.load_user_doc(user_id, 'profile', {}, mutable=True)
+        current_profile_data.update(updated_data)
+        storage_engine.save_user_doc(user_id, 'profile', current_profile_data)
     return jsonify({"message": "Profile updated successfully"}), 200
 
-@app.route('/api/projects', methods=['GET'])
+@route('/api/projects', methods=['GET'])
 @login_required
 def get_all_projects():
     """Gibt alle Projekte des aktuellen Benutzers zurück."""
-    user_projects_path = get_user_data_path(session['user_id'], 'projects')
-    projects = _load_json(user_projects_path, {})
-    return jsonify(list(projects.values()))
+    return jsonify(storage_engine.load_all_projects(session['user_id']))
 
-@app.route('/api/project/<project_id>', methods=['GET'])
+@route('/api/projects/summaries', methods=['GET'])
+@login_required
+def get_project_summaries():
+    """
+    Gibt die Kurzfassungen aller Projekte des aktuellen Benutzers zurück (Zähler für Phasen,
+    Aufgaben, Unteraufgaben und Kommentare, erledigte Elemente, Fortschritt, updatedAt).
+    Gelesen wird nur der bei jedem Speichern aktualisierte Index, nicht die Projekte selbst.
+    """
+    return jsonify(storage_engine.load_project_summaries(session['user_id']))
+
+def _list_page_size():
+    """Seitengröße der Projektliste aus dem Query-Parameter limit, begrenzt auf 1..PROJECT_LIST_MAX_PAGE_SIZE."""
+    limit = request.args.get('limit', current_app.config['PROJECT_LIST_PAGE_SIZE'], type=int)
+    return min(max(limit, 1), current_app.config['PROJECT_LIST_MAX_PAGE_SIZE'])
+
+@route('/api/projects/list', methods=['GET'])
+@login_required
+def list_projects():
+    """
+    Gibt eine Seite der Projektliste mit Kurzfassungen statt vollständiger Projekte zurück.
+    Query-Parameter (siehe storage.project_listing):
+      fields  kommagetrennte Felder, z. B. id,name,progress,updatedAt
+      sort    position (Standard), name, updated oder progress; order=asc|desc
+      limit   Seitengröße, cursor  Wert von nextCursor der vorherigen Seite
+    Die Antwort {"items": [...], "nextCursor": ...} wird elementweise gestreamt.
+    """
+    user_id = session['user_id']
+    sort = request.args.get('sort', 'position')
+    descending = request.args.get('order', 'asc') == 'desc'
+    limit = _list_page_size()
+    try:
+        fields = parse_fields(request.args.get('fields'))
+        entries = iter_project_summaries(storage_engine, user_id, sort, descending, request.args.get('cursor'), limit)
+        # Das erste Element vorab holen, damit ungültige Parameter noch als 400 gemeldet werden können
+        entry = next(entries, None)
+    except ListingError as e:
+        return jsonify({"error": str(e)}), 400
+
+    codec = current_app.json.codec
+
+    def generate(entry):
+        yield b'{"items":['
+        emitted, last, next_cursor = 0, None, None
+        while entry is not None:
+            if emitted == limit:
+                next_cursor = encode_cursor(sort, descending, last[0], last[1])
+                break
+            yield (b',' if emitted else b'') + codec.dumps(project_fields(entry[0], fields))
+            emitted, last = emitted + 1, entry
+            entry = next(entries, None)
+        yield b'],"nextCursor":' + codec.dumps(next_cursor) + b'}'
+
+    return Response(generate(entry), mimetype='application/json')
+
+@route('/api/project/<project_id>', methods=['GET'])
 @login_required
 def get_single_project(project_id):
     """Gibt ein spezifisches Projekt des aktuellen Benutzers zurück."""
-    user_projects_path = get_user_data_path(session['user_id'], 'projects')
-    projects = _load_json(user_projects_path, {})
-    project = projects.get(project_id)
+    user_id = session['user_id']
+    version = storage_engine.project_version(user_id, project_id)
+    # Unverändertes Projekt: 304 anhand der gespeicherten Version, ohne es zu laden
+    if etag_matches(version):
+        return not_modified(version)
+    project = storage_engine.load_project(user_id, project_id)
     if project:
-        return jsonify(project)
+        response = jsonify(project)
+        if version:
+            response.set_etag(version)
+        return response
     return jsonify({"error": "Project not found"}), 404
 
-@app.route('/api/project', methods=['POST'])
+@route('/api/project', methods=['POST'])
 @login_required
 def create_project():
     """Erstellt ein neues Projekt für den aktuellen Benutzer."""
@@ -410,154 +707,355 @@ def create_project():
     if not user_id:
         return jsonify({"error": "Benutzer nicht identifiziert."}), 400
 
-    new_project_data = request.get_json()
+    try:
+        new_project_data = _project_from_request(_project_limits())
+    except LimitExceeded as e:
+        return jsonify({"error": str(e)}), e.status
+    if not isinstance(new_project_data, dict):
+        return jsonify({"error": "Ungültige Projektdaten."}), 400
     project_id = new_project_data.get('projectId', str(uuid.uuid4()))
-    
-    user_projects_path = get_user_data_path(user_id, 'projects')
-    projects = _load_json(user_projects_path, {})
+    if not is_valid_project_id(project_id):
+        return jsonify({"error": "Ungültige Projekt-ID."}), 400
+
+    with storage_engine.user_lock(user_id):
+        # If-None-Match: * verhindert, dass ein bestehendes Projekt gleicher ID überschrieben wird;
+        # eine nicht erfüllte Vorbedingung ist 412 (RFC 9110 §13.1.2), nicht 409
+        if request.if_none_match.star_tag and storage_engine.project_exists(user_id, project_id):
+            return jsonify({"error": "Ein Projekt mit dieser ID existiert bereits."}), 412
 
-    if is_guest:
-        global_app_settings = _load_json(SETTINGS_FILE, {})
-        guest_limits = global_app_settings.get('guest_limits', {})
-        max_projects = guest_limits.get('projects', 1)
-        if len(projects) >= max_projects:
-            return jsonify({"error": f"Als Gast können Sie maximal {max_projects} Projekte erstellen."}), 403
+        if is_guest:
+            limit_error = _guest_project_count_error(user_id)
+            if limit_error:
+                return jsonify({"error": limit_error}), 403
 
-    projects[project_id] = new_project_data
-    _save_json(user_projects_path, projects)
-    return jsonify({"message": "Project created successfully", "projectId": project_id}), 201
+        storage_engine.save_project(user_id, project_id, new_project_data)
+        version = storage_engine.project_version(user_id, project_id)
 
-@app.route('/api/project/<project_id>', methods=['POST'])
+    response = jsonify({"message": "Project created successfully", "projectId": project_id, "version": version})
+    response.set_etag(version)
+    return response, 201
+
+@route('/api/projects/from-template', methods=['POST'])
+@login_required
+def create_project_from_template():
+    """
+    Legt ein neues Projekt direkt aus einer Vorlage an, ohne dass der Client sie erst herunterlädt.
+    Body: {"templateId": "software", "projectName": "...", "projectId": "..." (optional)}.
+    Ohne templateId wird das Beispielprojekt (bsp) verwendet. Antwortet nur mit der neuen projectId.
+    """
+    user_id = session['user_id']
+    payload = request.get_json(silent=True) or {}
+    template = template_catalog.get(payload.get('templateId') or INITIAL_TEMPLATE_ID)
+    if template is None:
+        return jsonify({"error": "Template not found."}), 404
+
+    project_id = payload.get('projectId') or str(uuid.uuid4())
+    if not is_valid_project_id(project_id):
+        return jsonify({"error": "Ungültige Projekt-ID."}), 400
+    project_name = (payload.get('projectName') or '').strip() or None
+    project = instantiate_template(template, project_id, project_name)
+
+    limits = _project_limits()
+    if limits is not None:
+        try:
+            limits.check_project(project)
+        except LimitExceeded as e:
+            return jsonify({"error": str(e)}), e.status
+
+    with storage_engine.user_lock(user_id):
+        if storage_engine.project_exists(user_id, project_id):
+            return jsonify({"error": "Ein Projekt mit dieser ID existiert bereits."}), 409
+        if session.get('is_guest', False):
+            limit_error = _guest_project_count_error(user_id)
+            if limit_error:
+                return jsonify({"error": limit_error}), 403
+        storage_engine.save_project(user_id, project_id, project)
+        version = storage_engine.project_version(user_id, project_id)
+
+    response = jsonify({"projectId": project_id})
+    response.set_etag(version)
+    return response, 201
+
+@route('/api/project/<project_id>', methods=['POST'])
 @login_required
 def save_project(project_id):
-    """Speichert ein bestehendes Projekt des aktuellen Benutzers."""
-    user_projects_path = get_user_data_path(session['user_id'], 'projects')
-    projects = _load_json(user_projects_path, {})
-    
-    if project_id not in projects:
+    """
+    Speichert ein bestehendes Projekt des aktuellen Benutzers.
+    Sendet der Client einen If-Match-Header (ETag aus dem letzten GET/Speichern) und wurde
+    das Projekt inzwischen anderweitig geändert, wird mit 409 abgelehnt statt zu überschreiben.
+    """
+    user_id = session['user_id']
+    if not storage_engine.project_exists(user_id, project_id):
         return jsonify({"error": "Project not found"}), 404
     
-    updated_project_data = request.get_json()
-
-    if session.get('is_guest', False):
-        global_app_settings = _load_json(SETTINGS_FILE, {})
-        guest_limits = global_app_settings.get('guest_limits', {})
-        max_phases = guest_limits.get('phases_per_project', 5)
-        max_tasks = guest_limits.get('tasks_per_phase', 10)
-        max_subtasks = guest_limits.get('subtasks_per_task', 10)
-
-        if len(updated_project_data.get('phases', [])) > max_phases:
-            return jsonify({"error": f"Als Gast können Sie maximal {max_phases} Phasen pro Projekt erstellen."}), 403
-        for phase in updated_project_data.get('phases', []):
-            if len(phase.get('tasks', [])) > max_tasks:
-                return jsonify({"error": f"Als Gast können Sie maximal {max_tasks} Aufgaben pro Phase erstellen."}), 403
-            for task in phase.get('tasks', []):
-                if len(task.get('subtasks', [])) > max_subtasks:
-                    return jsonify({"error": f"Als Gast können Sie maximal {max_subtasks} Unteraufgaben pro Aufgabe erstellen."}), 403
-
-    projects[project_id] = updated_project_data
-    _save_json(user_projects_path, projects)
-    return jsonify({"message": "Project saved successfully"}), 200
-
-@app.route('/api/project/<project_id>', methods=['DELETE'])
+    try:
+        updated_project_data = _project_from_request(_project_limits())
+    except LimitExceeded as e:
+        return jsonify({"error": str(e)}), e.status
+    if not isinstance(updated_project_data, dict):
+        return jsonify({"error": "Ungültige Projektdaten."}), 400
+
+    with storage_engine.user_lock(user_id):
+        current_version = storage_engine.project_version(user_id, project_id)
+        if current_version is None:
+            return jsonify({"error": "Project not found"}), 404
+        if if_match_fails(current_version):
+            return jsonify({"error": "Das Projekt wurde zwischenzeitlich geändert. Bitte neu laden.", "version": current_version}), 409
+        storage_engine.save_project(user_id, project_id, updated_project_data)
+        version = storage_engine.project_version(user_id, project_id)
+
+    response = jsonify({"message": "Project saved successfully", "version": version})
+    response.set_etag(version)
+    return response, 200
+
+@route('/api/project/<project_id>', methods=['PATCH'])
+@login_required
+def patch_project(project_id):
+    """
+    Wendet einen JSON Patch (RFC 6902 oder Kompaktform, siehe storage.json_patch) auf ein Projekt an.
+    Body: Liste von Operationen oder {"baseVersion": "...", "ops": [...]}.
+    Die Basisversion kann alternativ als If-Match-Header gesendet werden; passt sie
+    nicht zum gespeicherten Stand, wird mit 409 abgelehnt.
+    """
+    user_id = session['user_id']
+    limits = _project_limits()
+    if limits is None:
+        payload = request.get_json(force=True, silent=True)
+    else:
+        # Wie beim Speichern: Größe vor dem Lesen prüfen, höchstens max_project_bytes + 1 Bytes lesen
+        try:
+            limits.check_size(request.content_length)
+            data = request.stream.read(limits.max_project_bytes + 1) if limits.max_project_bytes is not None else request.get_data(cache=False)
+            limits.check_size(len(data))
+        except LimitExceeded as e:
+            return jsonify({"error": str(e)}), e.status
+        try:
+            payload = current_app.json.loads(data)
+        except ValueError:
+            payload = None
+    if isinstance(payload, dict):
+        ops, base_version = payload.get('ops'), payload.get('baseVersion')
+    else:
+        ops, base_version = payload, None
+
+    with storage_engine.user_lock(user_id):
+        current_version = storage_engine.project_version(user_id, project_id)
+        if current_version is None:
+            return jsonify({"error": "Project not found"}), 404
+        if (base_version and base_version != current_version) or if_match_fails(current_version):
+            return jsonify({"error": "Das Projekt wurde zwischenzeitlich geändert. Bitte neu laden.", "version": current_version}), 409
+
+        try:
+            project = apply_patch(storage_engine.load_project(user_id, project_id, mutable=True), ops)
+        except JsonPatchTestFailed as e:
+            return jsonify({"error": str(e), "version": current_version}), 409
+        except JsonPatchError as e:
+            return jsonify({"error": f"Ungültiger Patch: {e}"}), 400
+        if not isinstance(project, dict):
+            # z. B. ["replace", "", [...]]: ein Projekt muss ein JSON-Objekt bleiben
+            return jsonify({"error": "Ungültiger Patch: Das Ergebnis ist kein Projekt-Objekt."}), 400
+
+        if limits is not None:
+            try:
+                limits.check_project(project)
+                # Ein kleiner Patch kann ein großes Projekt ergeben: die kodierte Größe zählt
+                limits.check_size(len(current_app.json.codec.dumps(project)))
+            except LimitExceeded as e:
+                return jsonify({"error": str(e)}), e.status
+
+        storage_engine.save_project(user_id, project_id, project)
+        version = storage_engine.project_version(user_id, project_id)
+
+    response = jsonify({"message": "Project patched successfully", "version": version})
+    response.set_etag(version)
+    return response, 200
+
+@route('/api/project/<project_id>', methods=['DELETE'])
 @login_required
 def delete_project(project_id):
     """Löscht ein Projekt des aktuellen Benutzers."""
-    user_projects_path = get_user_data_path(session['user_id'], 'projects')
-    projects = _load_json(user_projects_path, {})
-    
-    if project_id in projects:
-        del projects[project_id]
-        _save_json(user_projects_path, projects)
+    user_id = session['user_id']
+    with storage_engine.user_lock(user_id):
+        current_version = storage_engine.project_version(user_id, project_id)
+        if current_version is not None and if_match_fails(current_version):
+            return jsonify({"error": "Das Projekt wurde zwischenzeitlich geändert. Bitte neu laden.", "version": current_version}), 409
+        deleted = storage_engine.delete_project(user_id, project_id)
+    if deleted:
         return jsonify({"message": "Project deleted successfully"}), 200
     return jsonify({"error": "Project not found"}), 404
 
-@app.route('/api/session', methods=['GET'])
-def get_session():
-    """Gibt die aktuelle Benutzersession-Informationen zurück."""
+def _session_info():
+    """Session-Informationen für /api/session und /api/bootstrap."""
     if session.get('is_guest'):
-        return jsonify({"logged_in": False, "is_guest": True, "username": "Gast"})
+        return {"logged_in": False, "is_guest": True, "username": "Gast"}
     if 'user_id' in session:
-        return jsonify({"logged_in": True, "is_guest": False, "username": session.get('username'), "isAdmin": session.get('isAdmin', False)})
-    return jsonify({"logged_in": False, "is_guest": False})
+        return {"logged_in": True, "is_guest": False, "username": session.get('username'), "isAdmin": session.get('isAdmin', False)}
+    return {"logged_in": False, "is_guest": False}
+
+def _user_settings():
+    """Benutzereinstellungen für /api/settings und /api/bootstrap."""
+    if 'user_id' not in session and not session.get('is_guest'):
+        return {"design": "default"}
+    return storage_engine.load_user_doc(session['user_id'], 'settings', {"design": "default"})
+
+@route('/api/session', methods=['GET'])
+def get_session():
+    """Gibt die aktuelle Benutzersession-Informationen zurück."""
+    return jsonify(_session_info())
+
+@route('/api/bootstrap', methods=['GET'])
+def bootstrap():
+    """
+    Liefert alle Daten für den Seitenaufbau in einer Antwort statt in vier bis fünf Anfragen:
+    session, globalSettings und settings immer, dazu je nach Query-Parameter
+      project=<id>  das Projekt (als project) samt Version (projectVersion, wie das ETag von /api/project/<id>)
+      projects=1    die erste Seite von /api/projects/list mit den Standardfeldern (limit wie dort)
+      templates=1   die Vorlagenliste wie /api/templates
+    Jedes Dokument wird dabei genau einmal gelesen. Projektdaten gibt es nur für angemeldete
+    Benutzer; Gäste halten ihre Projekte im Browser.
+    """
+    data = {"session": _session_info(), "globalSettings": global_settings.get(), "settings": _user_settings()}
+    user_id = session.get('user_id')
+    if user_id and not session.get('is_guest'):
+        project_id = request.args.get('project')
+        if project_id and is_valid_project_id(project_id):
+            data['projectVersion'] = storage_engine.project_version(user_id, project_id)
+            data['project'] = storage_engine.load_project(user_id, project_id) if data['projectVersion'] else None
+        if request.args.get('projects'):
+            page_size = _list_page_size()
+            entries = list(iter_project_summaries(storage_engine, user_id, limit=page_size))
+            page = entries[:page_size]
+            data['projects'] = {
+                "items": [project_fields(summary, DEFAULT_LIST_FIELDS) for summary, position in page],
+                "nextCursor": encode_cursor('position', False, *page[-1]) if len(entries) > len(page) else None,
+            }
+    if request.args.get('templates'):
+        data['templates'] = template_catalog.index()[0]
+    return jsonify(data)
 
-@app.route('/api/settings', methods=['GET', 'POST'])
+@route('/api/settings', methods=['GET', 'POST'])
 def handle_settings():
     """Behandelt das Abrufen und Speichern von Benutzereinstellungen."""
     if request.method == 'GET':
-        if 'user_id' not in session and not session.get('is_guest'):
-            return jsonify({"design": "default"})
-        user_settings_path = get_user_data_path(session['user_id'], 'settings')
-        return jsonify(_load_json(user_settings_path, {"design": "default"}))
+        return jsonify(_user_settings())
     
     if request.method == 'POST':
         if 'user_id' not in session and not session.get('is_guest'):
             return jsonify({"error": "Sie müssen angemeldet sein, um Einstellungen zu speichern."}), 403
         if session.get('is_guest'):
             return jsonify({"error": "Gäste können keine Servereinstellungen speichern"}), 403
-        user_settings_path = get_user_data_path(session['user_id'], 'settings')
-        _save_json(user_settings_path, request.get_json())
+        storage_engine.save_user_doc(session['user_id'], 'settings', request.get_json())
         return jsonify({"success": True})
 
-@app.route('/api/global-settings', methods=['GET', 'POST'])
+@route('/api/global-settings', methods=['GET', 'POST'])
 def handle_global_settings_api():
     """Behandelt das Abrufen und Speichern globaler Anwendungseinstellungen (nur für Admins)."""
     if request.method == 'GET':
-        return jsonify(_load_json(SETTINGS_FILE))
+        return jsonify(global_settings.get())
     if request.method == 'POST':
         if not session.get('isAdmin'):
             return jsonify({"error": "Zugriff verweigert. Sie benötigen Administratorrechte."}), 403
-        current_settings = _load_json(SETTINGS_FILE)
-        updated_data = request.get_json()
-        for key, value in updated_data.items():
-            if isinstance(value, dict) and key in current_settings and isinstance(current_settings[key], dict):
-                current_settings[key].update(value)
-            else:
-                current_settings[key] = value
-        _save_json(SETTINGS_FILE, current_settings)
+        try:
+            global_settings.update(request.get_json(silent=True))
+        except SettingsError as e:
+            return jsonify({"error": f"Ungültige Einstellungen: {e}"}), 400
         return jsonify({"success": True})
 
-@app.route('/api/admin/get-structure', methods=['GET'])
+@route('/api/admin/get-structure', methods=['GET'])
 @login_required
 @admin_required
 def get_structure_api():
     """Gibt die gespeicherte Projektstruktur aus structure.json zurück (nur für Admins)."""
-    structure_data = _load_json(STRUCTURE_FILE, {"error": "structure.json nicht gefunden oder leer."})
+    structure_data = _load_json(current_app.config['STRUCTURE_FILE'], {"error": "structure.json nicht gefunden oder leer."})
     return jsonify(structure_data)
 
-@app.route('/api/admin/run-check', methods=['POST'])
+# Job-Arten für die Kommando-Flags von check_structure.py (die Jobs laufen im App-Prozess)
+STRUCTURE_JOB_KINDS = {'--check': 'check', '--verify': 'verify', '--generate': 'generate',
+                       '--generate --hashes': 'generate_manifest'}
+
+def _check_structure_job(log, verify=False):
+    """
+    Struktur-Check im eigenen Prozess; das Ergebnis (missing/orphans/changed) landet als JSON im Job-Status.
+    Mit `verify` werden auch Dateiinhalte gegen das Hash-Manifest geprüft.
+    """
+    import check_structure
+    def log_status(message, level="INFO"):
+        log(f"[{level}]: {message}")
+    result = check_structure.check_structure(incremental=True, log=log_status, verify=verify)
+    if result.error:
+        raise RuntimeError(result.error)
+    if result.ok:
+        log_status("Projektstruktur ist vollständig und korrekt.", "SUCCESS")
+    for message, level in result.report():
+        log_status(message, level)
+    return result.to_dict()
+
+def _generate_structure_job(log, with_hashes=False):
+    """Erzeugt structure.json im eigenen Prozess neu, mit `with_hashes` samt Hash-Manifest."""
+    import check_structure
+    result = check_structure.generate_structure(incremental=True, log=lambda message, level="INFO": log(f"[{level}]: {message}"),
+                                                with_hashes=with_hashes)
+    if not result['written']:
+        raise RuntimeError(f"{check_structure.STRUCTURE_FILE} konnte nicht geschrieben werden.")
+    return result
+
+def _structure_signature():
+    """Ändert sich mit dem Verzeichnisbaum; solange nicht, wird das letzte Check-Ergebnis wiederverwendet."""
+    import check_structure
+    return check_structure.tree_signature()
+
+@route('/api/admin/run-check', methods=['POST'])
 @login_required
 @admin_required
 def run_structure_check_api():
-    """Führt das externe Skript check_structure.py aus (nur für Admins)."""
-    command_flag = request.json.get('flag')
-    if command_flag not in ['--check', '--generate']:
+    """Startet Struktur-Check oder -Generierung als Hintergrund-Job und gibt den Job-Status zurück (nur für Admins)."""
+    kind = STRUCTURE_JOB_KINDS.get((request.get_json(silent=True) or {}).get('flag'))
+    if kind is None:
         return jsonify({"log": "Ungültiges Kommando."}), 400
-
     try:
-        result = subprocess.run(
-            [sys.executable, 'check_structure.py', command_flag],
-            capture_output=True, text=True, encoding='utf-8',
-            cwd=os.path.dirname(os.path.abspath(__file__))
-        )
-        log_output = result.stdout + result.stderr
-        return jsonify({"log": log_output})
-    except Exception as e:
-        return jsonify({"log": f"Fehler bei der Ausführung des Skripts: {e}"}), 500
+        job = admin_jobs.submit(kind)
+    except OSError as e:
+        return jsonify({"log": f"Job konnte nicht gestartet werden: {e}"}), 500
+    return jsonify({"job": job}), 202
+
+@route('/api/admin/jobs/<job_id>', methods=['GET'])
+@login_required
+@admin_required
+def admin_job_status_api(job_id):
+    """Status eines Admin-Jobs und seine Log-Zeilen ab der Byte-Position `offset` (zum Abfragen im Intervall)."""
+    job = admin_jobs.status(job_id)
+    if job is None:
+        return jsonify({"error": "Job nicht gefunden."}), 404
+    lines, offset = admin_jobs.read_log(job_id, request.args.get('offset', 0, type=int))
+    return jsonify({"job": job, "lines": lines, "offset": offset})
+
+@route('/api/admin/jobs/<job_id>/stream', methods=['GET'])
+@login_required
+@admin_required
+def admin_job_stream_api(job_id):
+    """Log eines Admin-Jobs als Server-Sent Events, bis der Job beendet ist."""
+    if admin_jobs.status(job_id) is None:
+        return jsonify({"error": "Job nicht gefunden."}), 404
+    offset = request.headers.get('Last-Event-ID', request.args.get('offset', '0'))
+    jobs = admin_jobs._get_current_object()
+    response = Response(jobs.stream(job_id, int(offset) if offset.isdigit() else 0), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx soll Ereignisse nicht puffern
+    return response
 
 # --- NEUE LOGIK FÜR FACTORY RESET ---
 
 def _delete_all_user_data_logic():
-    """Logik zum Löschen des user_data Ordners. Gibt einen Log-String zurück."""
+    """Logik zum Löschen aller Benutzerdaten (Projekte, Profile, Einstellungen, Logs). Gibt einen Log-String zurück."""
     log_messages = []
-    if os.path.exists(USER_DATA_DIR):
-        try:
-            shutil.rmtree(USER_DATA_DIR)
-            log_messages.append(f"[SUCCESS]: Verzeichnis '{USER_DATA_DIR}' und sein gesamter Inhalt wurden gelöscht.")
-        except OSError as e:
-            log_messages.append(f"[FEHLER]: Fehler beim Löschen des Verzeichnisses {USER_DATA_DIR}: {e}")
-    else:
-        log_messages.append(f"[INFO]: Verzeichnis '{USER_DATA_DIR}' existiert nicht, keine Aktion erforderlich.")
+    try:
+        log_messages.append(storage_engine.delete_all_user_data())
+    except (OSError, sqlite3.Error) as e:
+        log_messages.append(f"[FEHLER]: Fehler beim Löschen der Benutzerdaten: {e}")
+    user_data_dir = current_app.config['USER_DATA_DIR']
+    if storage_engine.name != 'json' and os.path.exists(user_data_dir):
+        # Profilbilder liegen unabhängig von der Engine im Dateisystem
+        shutil.rmtree(user_data_dir, ignore_errors=True)
     return "\n".join(log_messages)
 
 def _create_initial_users_logic():
@@ -571,11 +1069,12 @@ def _create_initial_users_logic():
         "testuser": {"id": testuser_id, "email": "test@example.com", "password": "test", "isAdmin": False}
     }
     
-    if _save_json(USERS_FILE, initial_users):
-        log_messages.append(f"[SUCCESS]: Datei '{USERS_FILE}' wurde erfolgreich mit 2 Testbenutzern erstellt.")
+    try:
+        storage_engine.replace_all_users(initial_users)
+        log_messages.append(f"[SUCCESS]: Benutzerablage ({storage_engine.name}) wurde erfolgreich mit 2 Testbenutzern erstellt.")
         return "\n".join(log_messages), [admin_id, testuser_id]
-    else:
-        log_messages.append(f"[FEHLER]: Konnte die Datei '{USERS_FILE}' nicht erstellen.")
+    except (OSError, sqlite3.Error) as e:
+        log_messages.append(f"[FEHLER]: Konnte die Benutzerablage nicht erstellen: {e}")
         return "\n".join(log_messages), []
 
 def _create_user_directories_logic(user_ids):
@@ -586,22 +1085,16 @@ def _create_user_directories_logic(user_ids):
         return "\n".join(log_messages)
         
     for user_id in user_ids:
-        user_dir = os.path.join(USER_DATA_DIR, user_id)
         try:
-            os.makedirs(os.path.join(user_dir, 'img'), exist_ok=True)
-            _save_json(os.path.join(user_dir, 'projects.json'), {})
-            _save_json(os.path.join(user_dir, 'settings.json'), {"design": "default"})
-            _save_json(os.path.join(user_dir, 'logs.json'), [])
-            _save_json(os.path.join(user_dir, 'profile.json'), {
-                "profilbild": STANDARD_PROFILE_PICTURE, "alter": 0, "wohnort": "", "land": "", "plz": "", "aboutme": ""
-            })
+            get_user_img_path(user_id)
+            storage_engine.init_user(user_id, _default_user_documents())
             log_messages.append(f"[SUCCESS]: Verzeichnis und Standarddateien für Benutzer {user_id} erstellt.")
-        except OSError as e:
+        except (OSError, sqlite3.Error) as e:
             log_messages.append(f"[FEHLER]: Fehler beim Erstellen des Verzeichnisses für Benutzer {user_id}: {e}")
     return "\n".join(log_messages)
 
 # NEUER API-ENDPUNKT zum Ausführen des Resets
-@app.route('/api/admin/run-factory-reset', methods=['POST'])
+@route('/api/admin/run-factory-reset', methods=['POST'])
 @login_required
 @admin_required
 def run_factory_reset_api():
@@ -619,4 +1112,5 @@ def run_factory_reset_api():
         return jsonify({"log": f"Ein unerwarteter Fehler ist aufgetreten: {e}"}), 500
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # Entwicklungsserver; für den Produktivbetrieb siehe wsgi.py, gunicorn.conf.py und serve.py
+    create_app().run(debug=DEV_SERVER_DEBUG)
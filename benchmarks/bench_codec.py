@@ -0,0 +1,90 @@
+"""
+Vergleicht die JSON-Codecs (storage.codec) beim Kodieren und Dekodieren.
+
+    python benchmarks/bench_codec.py                 # Vorlagen + synthetisches Großprojekt
+    python benchmarks/bench_codec.py --phases 50 --tasks 40 --subtasks 10 --repeat 20
+
+Gemessen werden die mittlere Zeit pro Aufruf (beste von drei Durchläufen) und
+die Größe der kodierten Daten, jeweils kompakt und eingerückt.
+"""
+import os
+import sys
+import glob
+import argparse
+import timeit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from storage.codec import available_codecs, get_codec  # noqa: E402
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'static', 'data', 'templates')
+
+
+def synthetic_project(phases, tasks, subtasks):
+    """Baut ein Projekt in der Struktur des Projektmanagers (Phasen > Aufgaben > Unteraufgaben)."""
+    return {
+        "projectId": "bench-project",
+        "projectName": "Benchmark-Projekt mit Umlauten äöü",
+        "phases": [{
+            "phaseId": f"phase-{p}",
+            "phaseName": f"Phase {p}",
+            "completed": False,
+            "tasks": [{
+                "taskId": f"task-{p}-{t}",
+                "taskName": f"Aufgabe {t} der Phase {p}",
+                "description": "Beschreibung " * 5,
+                "completed": t % 3 == 0,
+                "subtasks": [{
+                    "subtaskId": f"subtask-{p}-{t}-{s}",
+                    "subtaskName": f"Unteraufgabe {s}",
+                    "completed": s % 2 == 0,
+                } for s in range(subtasks)],
+            } for t in range(tasks)],
+        } for p in range(phases)],
+    }
+
+
+def load_documents(args):
+    codec = get_codec('json')
+    documents = []
+    for path in sorted(glob.glob(os.path.join(TEMPLATES_DIR, '*.json'))):
+        with open(path, 'rb') as f:
+            documents.append((f"Vorlage {os.path.basename(path)}", codec.loads(f.read())))
+    name = f"Synthetisch {args.phases}x{args.tasks}x{args.subtasks}"
+    documents.append((name, synthetic_project(args.phases, args.tasks, args.subtasks)))
+    return documents
+
+
+def measure(func, repeat):
+    return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark der JSON-Codecs.")
+    parser.add_argument('--phases', type=int, default=30)
+    parser.add_argument('--tasks', type=int, default=30)
+    parser.add_argument('--subtasks', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=10, help="Aufrufe pro Messung")
+    args = parser.parse_args(argv)
+
+    codecs = [get_codec(name) for name in available_codecs()]
+    print(f"Installierte Codecs: {', '.join(codec.name for codec in codecs)}\n")
+    header = f"{'Dokument':<34} {'Codec':<7} {'dumps kompakt':>14} {'dumps pretty':>13} {'loads':>9} {'Bytes kompakt':>14} {'Bytes pretty':>13}"
+    print(header)
+    print('-' * len(header))
+    for name, document in load_documents(args):
+        for codec in codecs:
+            compact = codec.dumps(document)
+            pretty = codec.dumps(document, pretty=True)
+            dumps_compact = measure(lambda: codec.dumps(document), args.repeat)
+            dumps_pretty = measure(lambda: codec.dumps(document, pretty=True), args.repeat)
+            loads = measure(lambda: codec.loads(compact), args.repeat)
+            print(f"{name[:34]:<34} {codec.name:<7} {dumps_compact:>11.3f} ms {dumps_pretty:>10.3f} ms "
+                  f"{loads:>6.3f} ms {len(compact):>14,} {len(pretty):>13,}")
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
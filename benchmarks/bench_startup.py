@@ -0,0 +1,95 @@
+"""
+Misst die Startzeit der Anwendung und prüft sie gegen ein Zeitziel.
+
+    python benchmarks/bench_startup.py                  # Ziel: STARTUP_TARGET_MS
+    python benchmarks/bench_startup.py --target 150 --repeat 5
+
+Gemessen werden der Import von app.py, create_app() ohne Warm-up (nur
+Konfiguration und Routen), das Warm-up (Speicher-Engine, Vorlagenkatalog,
+globale Einstellungen) und die erste Anfrage an /api/bootstrap. Jede Wiederholung
+erzeugt eine neue App-Instanz. Überschreitet Fabrik + Warm-up + erste Anfrage
+das Ziel, endet das Skript mit Exit-Code 1.
+
+Die Apps arbeiten auf einem temporären Datenverzeichnis mit Kopien der Vorlagen
+und globalen Einstellungen; echte Benutzerdaten werden weder gelesen noch migriert.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Ziel für create_app() + Warm-up + erste Anfrage eines neuen Workers
+STARTUP_TARGET_MS = 250
+
+
+def _ms(start):
+    return (time.perf_counter() - start) * 1000
+
+
+def _isolated_config(app_module, data_root):
+    """Konfiguration, die alle beschriebenen Pfade nach `data_root` umlenkt."""
+    templates_dir = os.path.join(data_root, app_module.DATA_PATHS['TEMPLATES_DIR'])
+    if os.path.isdir(app_module.TEMPLATES_DIR):
+        shutil.copytree(app_module.TEMPLATES_DIR, templates_dir)
+    settings_file = os.path.join(data_root, os.path.basename(app_module.SETTINGS_FILE))
+    if os.path.exists(app_module.SETTINGS_FILE):
+        shutil.copy2(app_module.SETTINGS_FILE, settings_file)
+    return {
+        'WARM_UP': False,
+        'DATA_ROOT': data_root,
+        'SETTINGS_FILE': settings_file,
+        'ADMIN_JOBS_DIR': os.path.join(data_root, 'admin_jobs'),
+        'WRITE_JOURNAL_FILE': os.path.join(data_root, 'write_journal.log') if app_module.WRITE_JOURNAL_FILE else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', type=float, default=STARTUP_TARGET_MS, help="Zeitziel in Millisekunden")
+    parser.add_argument('--repeat', type=int, default=3, help="Anzahl neu erzeugter App-Instanzen")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    import app as app_module
+    import_ms = _ms(start)
+    print(f"Import app.py: {import_ms:8.1f} ms")
+
+    worst = 0.0
+    for run in range(1, args.repeat + 1):
+        data_root = tempfile.mkdtemp(prefix='bench_startup_')
+        try:
+            config = _isolated_config(app_module, data_root)
+
+            start = time.perf_counter()
+            app = app_module.create_app(config)
+            factory_ms = _ms(start)
+
+            start = time.perf_counter()
+            app_module.warm_up(app)
+            warm_up_ms = _ms(start)
+
+            start = time.perf_counter()
+            response = app.test_client().get('/api/bootstrap?templates=1')
+            request_ms = _ms(start)
+            app_module.flush_writes()
+        finally:
+            shutil.rmtree(data_root, ignore_errors=True)
+
+        total = factory_ms + warm_up_ms + request_ms
+        worst = max(worst, total)
+        print(f"Lauf {run}: create_app {factory_ms:6.1f} ms | Warm-up {warm_up_ms:6.1f} ms | "
+              f"erste Anfrage {request_ms:6.1f} ms (HTTP {response.status_code}) | gesamt {total:6.1f} ms")
+
+    print(f"Schlechtester Lauf: {worst:.1f} ms, Ziel: {args.target:.0f} ms")
+    if worst > args.target:
+        print("Zeitziel verfehlt.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
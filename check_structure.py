@@ -1,15 +1,32 @@
 import os
 import json
 import sys
+import time
 import shutil
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from structure_rules import StructureRules
+
 # =================================================================
 # SKRIPT-KONFIGURATION
 # =================================================================
 STRUCTURE_FILE = 'structure.json'
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Unabhängig vom Arbeitsverzeichnis (das Skript wird auch als Modul aus app.py verwendet)
+STRUCTURE_PATH = os.path.join(BASE_DIR, STRUCTURE_FILE)
 BACKUP_DIR = os.path.join(BASE_DIR, 'structure_backup')
+# Threads für den Verzeichnis-Scan (I/O-gebunden, daher mehr als CPU-Kerne)
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Schnappschuss für `--incremental` (liegt im ignorierten Backup-Ordner)
+SNAPSHOT_FILE = os.path.join(BACKUP_DIR, 'scan_snapshot.json')
+# Verzeichnisse mit jüngerer mtime werden nicht zwischengespeichert
+SNAPSHOT_RACY_SECONDS = 2
+# Hash-Manifest (--generate --hashes): Dateien erhalten size, mtime_ns und hash (BLAKE2b, blockweise gelesen)
+HASH_ALGORITHM = 'blake2b'
+HASH_CHUNK_BYTES = 1024 * 1024
 
 # =================================================================
 # HELPER-FUNKTIONEN
@@ -23,7 +40,12 @@ def print_status(message, level="INFO"):
 def get_user_confirmation(prompt):
     """Fragt den Benutzer nach einer Ja/Nein-Bestätigung."""
     while True:
-        response = input(f"{prompt} (j/n): ").lower().strip()
+        try:
+            response = input(f"{prompt} (j/n): ").lower().strip()
+        except EOFError:
+            # Ohne Eingabe (z. B. als Job aus dem Admin-Bereich gestartet) wird nichts geändert
+            print()
+            return False
         if response in ['j', 'ja']: return True
         if response in ['n', 'nein']: return False
         print_status("Ungültige Eingabe.", "WARN")
@@ -41,7 +63,7 @@ def create_backup_session_folder():
     os.makedirs(session_path)
     return session_path
 
-def backup_item(path, backup_session_path):
+def backup_item(path, backup_session_path, log=print_status):
     """Sichert eine Datei oder einen Ordner in den Backup-Sitzungsordner."""
     if not os.path.exists(path):
         return
@@ -56,138 +78,402 @@ def backup_item(path, backup_session_path):
         else:
             # Suffix .backup hinzufügen, um die Originaldatei zu kennzeichnen
             shutil.copy2(path, backup_dest + '.backup')
-        print_status(f"'{rel_path}' gesichert.", "INFO")
+        log(f"'{rel_path}' gesichert.", "INFO")
     except Exception as e:
-        print_status(f"Sicherung von '{rel_path}' fehlgeschlagen: {e}", "ERROR")
+        log(f"Sicherung von '{rel_path}' fehlgeschlagen: {e}", "ERROR")
+
+# =================================================================
+# VERZEICHNIS-SCAN
+# =================================================================
+# Ein Scan liest jedes Verzeichnis genau einmal mit os.scandir (der Typ eines
+# Eintrags kommt aus dem Verzeichniseintrag, ohne eigenen stat-Aufruf) und
+# verteilt die Verzeichnisse einer Ebene auf einen Thread-Pool.
+#
+# Im inkrementellen Modus wird das Ergebnis als Schnappschuss
+# (Verzeichnis -> mtime + Einträge) gespeichert. Beim nächsten Scan genügt für
+# ein Verzeichnis mit unveränderter mtime ein stat; seine Einträge kommen aus
+# dem Schnappschuss. Nur geänderte Verzeichnisse werden neu gelesen.
+#
+# Welche Pfade ausgelassen werden und in welche Verzeichnisse (z. B. die
+# Benutzerdaten) nicht abgestiegen wird, legen die Regeln in structure.json
+# fest (siehe structure_rules.py).
+
+def load_rules():
+    """Regeln aus structure.json bzw. die Standardregeln."""
+    return StructureRules.from_structure_file(STRUCTURE_PATH)
+
+def _scan_dir(base_dir, rel_dir, cached, log):
+    """Liest ein Verzeichnis ein. Gibt (rel_dir, mtime_ns, {Name: 'directory'|'file'}) zurück."""
+    full_path = os.path.join(base_dir, rel_dir.replace('/', os.sep)) if rel_dir else base_dir
+    try:
+        mtime_ns = os.stat(full_path).st_mtime_ns
+        if cached is not None and cached[0] == mtime_ns:
+            return rel_dir, mtime_ns, cached[1]
+        entries = {}
+        with os.scandir(full_path) as it:
+            for entry in it:
+                try:
+                    # Symlinks auf Verzeichnisse zählen als Datei, damit der Scan keine Schleifen läuft
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                entries[entry.name] = 'directory' if is_dir else 'file'
+        return rel_dir, mtime_ns, entries
+    except OSError as e:
+        log(f"'{rel_dir or '.'}' konnte nicht gelesen werden: {e}", "WARN")
+        return rel_dir, None, {}
+
+def _load_snapshot(snapshot_file):
+    try:
+        with open(snapshot_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {rel: (mtime, entries) for rel, (mtime, entries) in data.get('dirs', {}).items()}
+    except (OSError, ValueError, TypeError, AttributeError):
+        return {}
+
+def _save_snapshot(snapshot_file, listing, started_ns, log):
+    # Verzeichnisse, die sich während des Scans (oder kurz davor) geändert haben, nicht
+    # zwischenspeichern: Eine weitere Änderung im selben mtime-Takt wäre sonst unsichtbar.
+    racy_ns = started_ns - SNAPSHOT_RACY_SECONDS * 1_000_000_000
+    dirs = {rel: [mtime, entries] for rel, (mtime, entries) in listing.items()
+            if mtime is not None and mtime < racy_ns}
+    try:
+        os.makedirs(os.path.dirname(snapshot_file), exist_ok=True)
+        tmp_file = f"{snapshot_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"dirs": dirs}, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_file, snapshot_file)
+    except OSError as e:
+        log(f"Scan-Schnappschuss konnte nicht gespeichert werden: {e}", "WARN")
+
+def scan_tree(rules, base_dir=None, incremental=False, snapshot_file=None, workers=None, log=print_status):
+    """
+    Liest den Verzeichnisbaum unter `base_dir` ein; ausgeschlossene und opake Verzeichnisse
+    werden nicht gelesen. Gibt {rel_dir: (mtime_ns, {Name: 'directory'|'file'})} zurück;
+    '' ist das Wurzelverzeichnis.
+    """
+    base_dir = base_dir or BASE_DIR
+    snapshot_file = snapshot_file or SNAPSHOT_FILE
+    snapshot = _load_snapshot(snapshot_file) if incremental else {}
+    started_ns = time.time_ns()
+    listing = {}
+    frontier = ['']
+    with ThreadPoolExecutor(max_workers=workers or SCAN_WORKERS) as pool:
+        while frontier:
+            results = pool.map(lambda rel: _scan_dir(base_dir, rel, snapshot.get(rel), log), frontier)
+            frontier = []
+            for rel_dir, mtime_ns, entries in results:
+                listing[rel_dir] = (mtime_ns, entries)
+                for name, kind in entries.items():
+                    rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                    if kind == 'directory' and not rules.is_excluded(rel_path, True) and not rules.is_opaque(rel_path):
+                        frontier.append(rel_path)
+    if incremental:
+        _save_snapshot(snapshot_file, listing, started_ns, log)
+    return listing
+
+def tree_signature(rules=None):
+    """
+    Kennung des Verzeichnisbaums und der structure.json. Sie ändert sich, sobald ein geprüfter
+    Eintrag hinzukommt, verschwindet oder umbenannt wird; dank des Schnappschusses kostet sie
+    nur einen stat-Aufruf je unverändertem Verzeichnis.
+    """
+    rules = rules or load_rules()
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        stat = os.stat(STRUCTURE_PATH)
+        digest.update(f"{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+    except OSError:
+        pass
+    # Die gefilterte Liste statt der mtimes: Änderungen an ausgeschlossenen Einträgen
+    # (Backups, __pycache__) ändern zwar die mtime des Elternverzeichnisses, aber nicht das Ergebnis
+    for rel_path, kind in sorted(iter_scanned_paths(scan_tree(rules, incremental=True), rules)):
+        digest.update(f"{rel_path}\0{kind}\n".encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()
+
+def iter_scanned_paths(listing, rules):
+    """Liefert (rel_path, typ) für alle gescannten Einträge, die nicht ausgeschlossen sind."""
+    for rel_dir, (_, entries) in listing.items():
+        for name, kind in entries.items():
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if not rules.is_excluded(rel_path, kind == 'directory'):
+                yield rel_path, kind
+
+# =================================================================
+# HASH-MANIFEST
+# =================================================================
+# Mit `--generate --hashes` erhält jeder Dateiknoten Größe, mtime und Inhalts-Hash.
+# `--verify` vergleicht zuerst Größe und mtime (ein stat je Datei) und hasht nur
+# Dateien, bei denen die mtime abweicht. Hashes werden im Thread-Pool berechnet
+# (hashlib gibt beim Hashen großer Blöcke den GIL frei).
+
+def _full_path(rel_path):
+    return os.path.join(BASE_DIR, rel_path.replace('/', os.sep))
+
+def hash_file(path):
+    """Inhalts-Hash einer Datei als 'blake2b:<hex>'."""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return f"{HASH_ALGORITHM}:{digest.hexdigest()}"
+
+def _file_manifest(rel_path):
+    full_path = _full_path(rel_path)
+    # stat vor dem Hashen: Ändert sich die Datei währenddessen, fällt das beim nächsten Verify auf
+    stat = os.stat(full_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": hash_file(full_path)}
+
+def _verify_file(node):
+    """Vergleicht eine Datei mit ihrem Manifest-Eintrag. Gibt (Abweichung oder None, gehasht) zurück."""
+    path = node['path']
+    full_path = _full_path(path)
+    stat = os.stat(full_path)
+    if stat.st_size == node.get('size') and stat.st_mtime_ns == node.get('mtime_ns'):
+        return None, False
+    actual = {"size": stat.st_size, "hash": None}
+    if stat.st_size == node.get('size'):
+        # Nur die mtime weicht ab (z. B. nach einem Checkout): der Inhalt entscheidet
+        actual["hash"] = hash_file(full_path)
+        if actual["hash"] == node['hash']:
+            return None, True
+    expected = {"size": node.get('size'), "hash": node['hash']}
+    return {"path": path, "reason": "content", "expected": expected, "actual": actual}, actual["hash"] is not None
 
 # =================================================================
 # STRUKTUR-GENERIERUNG
 # =================================================================
 
-def generate_structure_dict(path):
+def generate_structure_dict(listing, rel_path, kind, rules):
     """
-    Durchläuft rekursiv einen Pfad und erstellt ein Dictionary, das die Struktur repräsentiert.
+    Erstellt aus dem Scan-Ergebnis ein Dictionary, das die Struktur unter `rel_path` repräsentiert.
     """
-    if os.path.isdir(path):
-        # Ignoriere irrelevante Verzeichnisse
-        if os.path.basename(path) in ['__pycache__', '.git', '.vscode', 'venv', 'structure_backup']:
-            return None
-            
-        item = {"path": os.path.relpath(path, BASE_DIR).replace('\\', '/'), "type": "directory", "children": []}
-        for child_name in sorted(os.listdir(path)):
-            child_path = os.path.join(path, child_name)
-            child_item = generate_structure_dict(child_path)
-            if child_item:
-                item["children"].append(child_item)
-        return item
-    elif os.path.isfile(path):
-        # Ignoriere die Zieldatei und Backup-Dateien
-        if os.path.basename(path) == STRUCTURE_FILE or ".backup" in os.path.basename(path):
-            return None
-        return {"path": os.path.relpath(path, BASE_DIR).replace('\\', '/'), "type": "file"}
-    return None
-
-def generate_structure_file():
+    if rules.is_excluded(rel_path, kind == 'directory'):
+        return None
+    if kind != 'directory':
+        return {"path": rel_path, "type": "file"}
+    if rules.is_opaque(rel_path):
+        # Nur die Existenz wird geprüft, der Inhalt (Laufzeitdaten) nicht
+        return {"path": rel_path, "type": "directory", "opaque": True}
+    item = {"path": rel_path, "type": "directory", "children": []}
+    for child_name, child_kind in sorted(listing.get(rel_path, (None, {}))[1].items()):
+        child_item = generate_structure_dict(listing, f"{rel_path}/{child_name}", child_kind, rules)
+        if child_item:
+            item["children"].append(child_item)
+    return item
+
+def generate_structure(incremental=False, log=print_status, with_hashes=False):
     """
     Generiert die `structure.json`-Datei aus der aktuellen Verzeichnisstruktur.
-    Sichert eine eventuell vorhandene alte Datei.
+    Sichert eine eventuell vorhandene alte Datei. Mit `with_hashes` erhält jede Datei
+    Größe, mtime und Inhalts-Hash. Gibt ein Dict mit Anzahl der Einträge, gehashten
+    Dateien, Backup-Ordner und Erfolg zurück.
     """
-    print_status(f"Generiere neue `{STRUCTURE_FILE}` aus der aktuellen Projektstruktur...")
+    log(f"Generiere neue `{STRUCTURE_FILE}` aus der aktuellen Projektstruktur...")
+    rules = load_rules()
+    result = {"entries": 0, "hashed": 0, "backup": None, "written": False}
 
-    if os.path.exists(STRUCTURE_FILE):
+    if os.path.exists(STRUCTURE_PATH):
         backup_session_path = create_backup_session_folder()
-        backup_item(os.path.join(BASE_DIR, STRUCTURE_FILE), backup_session_path)
-        print_status(f"Bestehende `{STRUCTURE_FILE}` in `{os.path.relpath(backup_session_path)}` gesichert.", "INFO")
+        backup_item(STRUCTURE_PATH, backup_session_path, log)
+        result["backup"] = os.path.relpath(backup_session_path, BASE_DIR).replace('\\', '/')
+        log(f"Bestehende `{STRUCTURE_FILE}` in `{result['backup']}` gesichert.", "INFO")
+
+    listing = scan_tree(rules, incremental=incremental, log=log)
 
-    scan_paths = [p for p in os.listdir(BASE_DIR) if not p.startswith('.') and p not in ['__pycache__', 'venv', '.git', 'structure_backup']]
-    
     project_structure = {
         "name": os.path.basename(BASE_DIR),
         "type": "project_root",
+        "rules": rules.to_dict(),
         "children": []
     }
 
-    for path in sorted(scan_paths):
-        full_path = os.path.join(BASE_DIR, path)
-        structure_dict = generate_structure_dict(full_path)
+    for name, kind in sorted(listing[''][1].items()):
+        structure_dict = generate_structure_dict(listing, name, kind, rules)
         if structure_dict:
             project_structure["children"].append(structure_dict)
+    result["entries"] = sum(1 for _ in iter_scanned_paths(listing, rules))
+
+    if with_hashes:
+        file_nodes = []
+        def collect_files(node):
+            for child in node.get('children', []):
+                if child['type'] == 'file':
+                    file_nodes.append(child)
+                collect_files(child)
+        collect_files(project_structure)
+        log(f"Berechne Inhalts-Hashes für {len(file_nodes)} Dateien...")
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+            futures = [(node, pool.submit(_file_manifest, node['path'])) for node in file_nodes]
+            for node, future in futures:
+                try:
+                    node.update(future.result())
+                    result["hashed"] += 1
+                except OSError as e:
+                    log(f"'{node['path']}' konnte nicht gehasht werden: {e}", "WARN")
 
     try:
-        with open(STRUCTURE_FILE, 'w', encoding='utf-8') as f:
+        # Atomar ersetzen: Ein gleichzeitiger Check liest nie eine halb geschriebene Datei
+        tmp_path = f"{STRUCTURE_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(project_structure, f, indent=2, ensure_ascii=False)
-        print_status(f"`{STRUCTURE_FILE}` erfolgreich erstellt/aktualisiert.", "SUCCESS")
+        os.replace(tmp_path, STRUCTURE_PATH)
+        result["written"] = True
+        log(f"`{STRUCTURE_FILE}` erfolgreich erstellt/aktualisiert.", "SUCCESS")
     except IOError as e:
-        print_status(f"Konnte `{STRUCTURE_FILE}` nicht schreiben. Fehler: {e}", "ERROR")
+        log(f"Konnte `{STRUCTURE_FILE}` nicht schreiben. Fehler: {e}", "ERROR")
+    return result
+
+def generate_structure_file(incremental=False, with_hashes=False):
+    """Kommandozeile: wie generate_structure, mit farbiger Ausgabe."""
+    return generate_structure(incremental, with_hashes=with_hashes)
 
 # =================================================================
 # STRUKTUR-VALIDIERUNG & REPARATUR (OPTIMIERT)
 # =================================================================
 
-def check_structure_from_file():
-    """Liest structure.json und vergleicht sie mit dem Dateisystem."""
-    if not os.path.exists(STRUCTURE_FILE):
-        print_status(f"`{STRUCTURE_FILE}` nicht gefunden.", "ERROR")
-        return
+class StructureCheckResult:
+    """
+    Ergebnis eines Struktur-Checks. Pfade sind relativ zum Projektverzeichnis (mit '/').
 
-    print_status(f"Validiere Projektstruktur anhand von `{STRUCTURE_FILE}`...")
-    with open(STRUCTURE_FILE, 'r', encoding='utf-8') as f:
+    missing  in structure.json definiert, im Dateisystem nicht vorhanden ({"path", "type"})
+    orphans  im Dateisystem vorhanden, in structure.json nicht definiert ({"path", "type"})
+    changed  vorhanden, aber verändert ({"path", "reason", "expected", "actual"}):
+             reason 'type' bei anderem Typ als definiert, 'content' bei abweichender
+             Größe oder abweichendem Hash (nur mit verify, "hash": None ohne Hash-Berechnung)
+    """
+
+    def __init__(self):
+        self.missing = []
+        self.orphans = []
+        self.changed = []
+        self.error = None
+        self.verified = 0  # mit verify: geprüfte Dateien, davon `hashed` gehasht
+        self.hashed = 0
+        self._nodes = {}
+
+    @property
+    def ok(self):
+        return self.error is None and not (self.missing or self.orphans or self.changed)
+
+    def to_dict(self):
+        return {"ok": self.ok, "error": self.error, "missing": self.missing,
+                "orphans": self.orphans, "changed": self.changed,
+                "verified": self.verified, "hashed": self.hashed}
+
+    def report(self):
+        """Berichtszeilen als (Meldung, Level)."""
+        for item in self.missing:
+            yield f"Fehlend: [{str(item['type']).upper()}] {item['path']}", "WARN"
+        for item in self.orphans:
+            yield f"Verwaist: '{item['path']}' ist nicht in structure.json definiert.", "WARN"
+        for item in self.changed:
+            if item['reason'] == 'type':
+                yield f"Geändert: '{item['path']}' ist vom Typ {item['actual']} statt {item['expected']}.", "WARN"
+            elif item['expected']['size'] != item['actual']['size']:
+                yield (f"Geändert: '{item['path']}' ist {item['actual']['size']} statt "
+                       f"{item['expected']['size']} Bytes groß.", "WARN")
+            else:
+                yield f"Geändert: Der Inhalt von '{item['path']}' weicht vom Hash ab.", "WARN"
+
+    def actions(self):
+        """Reparaturschritte für apply_fixes: Fehlendes anlegen, Verwaistes löschen."""
+        actions = [{'type': 'create', 'node': self._nodes[item['path']],
+                    'path': os.path.join(BASE_DIR, item['path'].replace('/', os.sep))} for item in self.missing]
+        actions += [{'type': 'delete_orphan', 'path': os.path.join(BASE_DIR, item['path'].replace('/', os.sep)),
+                     'is_dir': item['type'] == 'directory'} for item in self.orphans]
+        return actions
+
+def check_structure(incremental=False, log=print_status, verify=False):
+    """
+    Liest structure.json, vergleicht sie mit dem Dateisystem und gibt ein StructureCheckResult zurück.
+    Mit `verify` werden zusätzlich Dateien mit Hash-Manifest auf Inhaltsänderungen geprüft.
+    """
+    result = StructureCheckResult()
+    if not os.path.exists(STRUCTURE_PATH):
+        result.error = f"`{STRUCTURE_FILE}` nicht gefunden."
+        log(result.error, "ERROR")
+        return result
+
+    log(f"Validiere Projektstruktur anhand von `{STRUCTURE_FILE}`...")
+    with open(STRUCTURE_PATH, 'r', encoding='utf-8') as f:
         structure_def = json.load(f)
 
-    actions = []
-    defined_paths = set()
+    defined_nodes = {}
+    rules = StructureRules.from_dict(structure_def.get('rules'))
 
     # 1. Sammle alle in structure.json definierten Pfade
     def collect_defined_paths(node):
         # Verwende immer forward slashes für interne Konsistenz
         path = node['path'].replace('\\', '/')
-        defined_paths.add(path)
+        if rules.is_excluded(path, node.get('type') == 'directory'):
+            return
+        defined_nodes[path] = node
+        if rules.is_opaque(path):
+            return  # Inhalte opaker Verzeichnisse werden nicht geprüft
         if node.get('type') == 'directory' and 'children' in node:
             for child in node['children']:
                 collect_defined_paths(child)
 
     for item in structure_def.get('children', []):
         collect_defined_paths(item)
+    result._nodes = defined_nodes
+
+    # 2. Ein Scan des Dateisystems statt eines exists-Aufrufs je definiertem Pfad
+    existing_paths = dict(iter_scanned_paths(scan_tree(rules, incremental=incremental, log=log), rules))
+
+    # 3. Prüfe, ob definierte Elemente im Dateisystem fehlen oder einen anderen Typ haben
+    for path, node in defined_nodes.items():
+        kind = existing_paths.get(path)
+        if kind is None:
+            result.missing.append({"path": path, "type": node.get('type')})
+        elif node.get('type') in ('directory', 'file') and kind != node['type']:
+            result.changed.append({"path": path, "reason": "type", "expected": node['type'], "actual": kind})
+
+    # 4. Inhalte: erst stat, gehasht wird nur bei abweichender mtime
+    if verify:
+        manifest_nodes = [node for path, node in defined_nodes.items()
+                          if node.get('type') == 'file' and node.get('hash') and existing_paths.get(path) == 'file']
+        if not manifest_nodes:
+            log(f"`{STRUCTURE_FILE}` enthält keine Hashes (erzeugen mit --generate --hashes).", "WARN")
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+            futures = [(node, pool.submit(_verify_file, node)) for node in manifest_nodes]
+            for node, future in futures:
+                try:
+                    change, hashed = future.result()
+                except OSError as e:
+                    log(f"'{node['path']}' konnte nicht geprüft werden: {e}", "WARN")
+                    continue
+                result.verified += 1
+                result.hashed += hashed
+                if change:
+                    result.changed.append(change)
+        log(f"Inhalte geprüft: {result.verified} Dateien, davon {result.hashed} gehasht.")
+
+    # 5. Finde verwaiste Dateien/Ordner im Dateisystem
+    for rel_path, kind in sorted(existing_paths.items()):
+        if rel_path not in defined_nodes:
+            result.orphans.append({"path": rel_path, "type": kind})
+
+    return result
+
+def check_structure_from_file(incremental=False, verify=False):
+    """Kommandozeile: prüft die Struktur, gibt den Bericht aus und bietet die Reparatur an."""
+    result = check_structure(incremental, verify=verify)
+    if result.error:
+        return result
+    if result.ok:
+        print_status("Projektstruktur ist vollständig und korrekt.", "SUCCESS")
+        return result
 
-    # 2. Prüfe, ob definierte Elemente im Dateisystem fehlen
-    def find_missing_items(node):
-        full_path = os.path.join(BASE_DIR, node['path'].replace('/', os.sep))
-        if not os.path.exists(full_path):
-            actions.append({'type': 'create', 'node': node, 'path': full_path})
-        
-        if node.get('type') == 'directory' and 'children' in node:
-            for child in node['children']:
-                find_missing_items(child)
-
-    for item in structure_def.get('children', []):
-        find_missing_items(item)
+    print("\n" + "="*50 + "\n Analysebericht\n" + "="*50)
+    for message, level in result.report():
+        print_status(message, level)
 
-    # 3. Finde verwaiste Dateien/Ordner im Dateisystem
-    for root, dirs, files in os.walk(BASE_DIR):
-        # Schließe spezielle Verzeichnisse von der Prüfung aus
-        dirs[:] = [d for d in dirs if d not in ['.git', '.vscode', '__pycache__', 'venv', 'structure_backup']]
-        
-        for name in dirs + files:
-            path = os.path.join(root, name)
-            rel_path = os.path.relpath(path, BASE_DIR).replace('\\', '/')
-            if rel_path not in defined_paths and rel_path != STRUCTURE_FILE:
-                actions.append({'type': 'delete_orphan', 'path': path, 'is_dir': os.path.isdir(path)})
-
-    # 4. Bericht und Reparatur
-    if not actions:
-        print_status("Projektstruktur ist vollständig und korrekt.", "SUCCESS")
-    else:
-        print("\n" + "="*50 + "\n Analysebericht\n" + "="*50)
-        for action in actions:
-            action_type = action['type']
-            path_str = os.path.relpath(action.get('path'), BASE_DIR)
-            if action_type == 'create':
-                print_status(f"Fehlend: [{action['node']['type'].upper()}] {path_str}", "WARN")
-            elif action_type == 'delete_orphan':
-                print_status(f"Verwaist: '{path_str}' ist nicht in structure.json definiert.", "WARN")
-        
-        if get_user_confirmation("\nMöchten Sie die notwendigen Änderungen jetzt durchführen?"):
-            apply_fixes(actions)
+    actions = result.actions()
+    if actions and get_user_confirmation("\nMöchten Sie die notwendigen Änderungen jetzt durchführen?"):
+        apply_fixes(actions)
+    return result
 
 def apply_fixes(actions):
     """Führt die notwendigen Änderungen durch und sichert betroffene Dateien."""
@@ -287,11 +573,12 @@ def restore_from_backup():
 # =================================================================
 def main():
     """Zeigt das Hauptmenü an und steuert den Skriptablauf."""
-    if '--check' in sys.argv:
-        check_structure_from_file()
+    incremental = '--incremental' in sys.argv
+    if '--check' in sys.argv or '--verify' in sys.argv:
+        check_structure_from_file(incremental, verify='--verify' in sys.argv)
         return
     if '--generate' in sys.argv:
-        generate_structure_file()
+        generate_structure_file(incremental, with_hashes='--hashes' in sys.argv)
         return
 
     while True:
@@ -301,6 +588,7 @@ def main():
         print("1. Projektstruktur validieren & reparieren")
         print("2. Neue `structure.json` aus Verzeichnis generieren")
         print("3. Aus Backup wiederherstellen")
+        print("4. Dateiinhalte anhand der Hashes prüfen")
         print("q. Beenden")
         print("="*50)
         
@@ -312,6 +600,8 @@ def main():
             generate_structure_file()
         elif choice == '3':
             restore_from_backup()
+        elif choice == '4':
+            check_structure_from_file(verify=True)
         elif choice == 'q':
             print_status("Skript wird beendet.", "INFO")
             break
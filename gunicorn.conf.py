@@ -0,0 +1,42 @@
+"""
+gunicorn-Konfiguration für den Produktivbetrieb:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Alle Werte lassen sich über Umgebungsvariablen überschreiben (PROJEKTPLANER_BIND,
+PROJEKTPLANER_WORKERS, PROJEKTPLANER_THREADS, ...).
+Neu laden ohne Unterbrechung: `kill -HUP <master-pid>` startet neue Worker und
+beendet die alten, sobald ihre laufenden Anfragen abgeschlossen sind.
+"""
+import os
+import multiprocessing
+
+bind = os.environ.get('PROJEKTPLANER_BIND', '0.0.0.0:8000')
+
+# Ein Prozess pro Kern; Threads je Worker überbrücken die Wartezeit auf Dateien und SQLite.
+workers = int(os.environ.get('PROJEKTPLANER_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('PROJEKTPLANER_THREADS', 4))
+worker_class = 'gthread'
+
+keepalive = int(os.environ.get('PROJEKTPLANER_KEEPALIVE', 5))
+timeout = int(os.environ.get('PROJEKTPLANER_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('PROJEKTPLANER_GRACEFUL_TIMEOUT', 30))
+
+# Worker nach einer zufällig gestreuten Anzahl von Anfragen erneuern (begrenzt Speicherwachstum)
+max_requests = int(os.environ.get('PROJEKTPLANER_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+# Grenzen für Anfragezeile und Header; die Größe des Bodys begrenzt MAX_CONTENT_LENGTH in app.py
+limit_request_line = 8190
+limit_request_fields = 100
+limit_request_field_size = 8190
+
+# Die App erst in den Workern laden: SQLite-Verbindungen, Sperren und Hintergrund-Threads
+# (Group-Commit, Journal) dürfen nicht über fork() geteilt werden.
+preload_app = False
+
+# Die App erfährt so, dass mehrere Prozesse auf dieselben Daten schreiben (siehe SERVER_WORKERS in app.py)
+raw_env = [f"PROJEKTPLANER_WORKERS={workers}"]
+
+accesslog = os.environ.get('PROJEKTPLANER_ACCESS_LOG', '-')
+errorlog = '-'
@@ -0,0 +1,154 @@
+"""
+HTTP-Caching für die Flask-Anwendung.
+
+- ETags: Antworten auf GET-Anfragen ohne eigenes ETag erhalten ein starkes
+  ETag aus dem Inhalt. Endpunkte mit gespeicherter Version (Projekte,
+  Vorlagen) setzen es selbst und prüfen If-None-Match schon vor dem Laden
+  (`etag_matches` / `not_modified`). Passt If-None-Match, wird mit 304 ohne
+  Body geantwortet.
+- Kompression: Text- und JSON-Antworten ab `min_size` Bytes werden mit Brotli
+  (falls das Paket `brotli` installiert ist) oder gzip komprimiert. Das ETag
+  erhält dann die Endung -br bzw. -gzip, damit es je Kodierung eindeutig bleibt.
+- Statische Dateien: `url_for('static', ...)` hängt einen Inhalts-Hash als
+  Parameter v an. Solche URLs ändern sich mit dem Inhalt und werden mit
+  einem langen Cache-Control (immutable) ausgeliefert.
+"""
+import os
+import gzip
+import hashlib
+import threading
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/javascript', 'text/html', 'text/css', 'text/plain')
+ENCODING_SUFFIXES = ('-br', '-gzip')
+
+
+def etag_matches(etag):
+    """Prüft If-None-Match gegen ein ETag, auch in seinen komprimierten Varianten (-br, -gzip)."""
+    if not etag:
+        return False
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return True
+    return any(if_none_match.contains(etag + suffix) for suffix in ('',) + ENCODING_SUFFIXES)
+
+
+def if_match_fails(etag):
+    """True, wenn ein If-Match-Header gesendet wurde, der zu keiner Variante des ETags passt."""
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return False
+    return not any(if_match.contains(etag + suffix) for suffix in ('',) + ENCODING_SUFFIXES)
+
+
+def not_modified(etag):
+    """Antwort 304 für ein unverändertes ETag."""
+    return '', 304, {'ETag': f'"{etag}"'}
+
+
+class StaticVersions:
+    """Inhalts-Hashes statischer Dateien, neu berechnet, sobald sich mtime oder Größe ändern."""
+
+    def __init__(self, static_folder):
+        self.static_folder = static_folder
+        self._hashes = {}  # Dateiname -> ((mtime_ns, size), Hash)
+        self._lock = threading.Lock()
+
+    def get(self, filename):
+        path = os.path.join(self.static_folder, filename)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._hashes.get(filename)
+        if cached and cached[0] == signature:
+            return cached[1]
+        digest = hashlib.blake2b(digest_size=6)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+        with self._lock:
+            self._hashes[filename] = (signature, digest.hexdigest())
+        return digest.hexdigest()
+
+
+class HttpCache:
+    """Registriert die Hooks für ETags, 304, Kompression und versionierte statische URLs."""
+
+    def __init__(self, app=None, min_size=1024, gzip_level=6, brotli_quality=4, static_max_age=365 * 24 * 3600):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.static_max_age = static_max_age
+        self.static_versions = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.static_versions = StaticVersions(app.static_folder)
+        app.url_defaults(self._add_static_version)
+        app.after_request(self._after_request)
+
+    def _add_static_version(self, endpoint, values):
+        if endpoint == 'static' and 'filename' in values and 'v' not in values:
+            version = self.static_versions.get(values['filename'])
+            if version:
+                values['v'] = version
+
+    def _after_request(self, response):
+        if request.endpoint == 'static':
+            if 'v' in request.args and response.status_code in (200, 304):
+                response.cache_control.no_cache = None  # setzt Flask für statische Dateien standardmäßig
+                response.cache_control.public = True
+                response.cache_control.max_age = self.static_max_age
+                response.cache_control.immutable = True
+            return response
+        if response.is_streamed or response.direct_passthrough:
+            return response
+
+        if request.method in ('GET', 'HEAD') and response.status_code == 200:
+            if response.mimetype == 'application/json':
+                # API-Daten sind benutzerbezogen: Browser darf sie speichern, muss aber jedes Mal nachfragen
+                if not response.cache_control.max_age and not response.cache_control.no_store:
+                    response.cache_control.private = True
+                    response.cache_control.no_cache = True
+                if not response.get_etag()[0]:
+                    response.add_etag()
+            etag = response.get_etag()[0]
+            if etag and etag_matches(etag):
+                response.status_code = 304
+                response.set_data(b'')
+                response.headers.pop('Content-Length', None)
+                response.headers.pop('Content-Type', None)
+                return response
+
+        return self._compress(response)
+
+    def _compress(self, response):
+        if (response.status_code != 200 or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'Content-Encoding' in response.headers):
+            return response
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            encoding, data = 'br', brotli.compress(data, quality=self.brotli_quality)
+        elif accepted['gzip']:
+            encoding, data = 'gzip', gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+        else:
+            return response
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f"{etag}-{encoding}", weak=weak)
+        return response
@@ -8,6 +8,8 @@ import uuid
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 USER_DATA_DIR = os.path.join(BASE_DIR, 'static', 'data', 'user_data')
 USERS_FILE = os.path.join(BASE_DIR, 'static', 'data', 'users.json')
+# Benutzerablage der App; sie übernimmt USERS_FILE beim nächsten Start
+USERS_DIR = os.path.join(BASE_DIR, 'static', 'data', 'users')
 STANDARD_PROFILE_PICTURE = 'static/img/standard_profile_picture.png'
 
 def print_status(message, level="INFO"):
@@ -44,6 +46,15 @@ def delete_all_user_data():
     else:
         print_status(f"Verzeichnis '{USER_DATA_DIR}' existiert nicht, keine Aktion erforderlich.", "WARN")
 
+def delete_user_repository():
+    """Löscht die Benutzerablage, damit nur die neue `users.json` übernommen wird."""
+    if os.path.exists(USERS_DIR):
+        try:
+            shutil.rmtree(USERS_DIR)
+            print_status(f"Benutzerablage '{USERS_DIR}' wurde gelöscht.", "SUCCESS")
+        except OSError as e:
+            print_status(f"Fehler beim Löschen der Benutzerablage {USERS_DIR}: {e}", "ERROR")
+
 def create_initial_users():
     """Erstellt die `users.json` mit zwei initialen Testbenutzern."""
     print_status("Erstelle initiale Testbenutzer...", "INFO")
@@ -123,6 +134,7 @@ def factory_reset():
             
             # Schritte ausführen
             delete_all_user_data()
+            delete_user_repository()
             new_user_ids = create_initial_users()
             create_user_directories(new_user_ids)
             
@@ -0,0 +1,27 @@
+"""
+Produktivserver mit waitress (reines Python, läuft auch unter Windows):
+
+    pip install waitress
+    python serve.py
+
+waitress arbeitet mit einem Prozess und mehreren Threads. Für mehrere Kerne
+unter Linux gunicorn verwenden (siehe gunicorn.conf.py).
+"""
+import os
+import sys
+
+try:
+    from waitress import serve
+except ImportError:
+    sys.exit("waitress ist nicht installiert: pip install waitress")
+
+from wsgi import app
+
+if __name__ == '__main__':
+    serve(
+        app,
+        listen=os.environ.get('PROJEKTPLANER_BIND', '0.0.0.0:8000'),
+        threads=int(os.environ.get('PROJEKTPLANER_THREADS', 8)),
+        channel_timeout=int(os.environ.get('PROJEKTPLANER_TIMEOUT', 30)),
+        max_request_body_size=app.config['MAX_CONTENT_LENGTH'],
+    )
@@ -15,6 +15,8 @@ export function setupStructureCheckPage() {
     window.debugLog("Admin_StructureCheck: Setup der Struktur-Check-Seite gestartet.", 'INFO', 'Admin_StructureCheck');
     const runCheckBtn = document.getElementById('run-check-btn');
     const runGenerateBtn = document.getElementById('run-generate-btn');
+    const runVerifyBtn = document.getElementById('run-verify-btn');
+    const runGenerateHashesBtn = document.getElementById('run-generate-hashes-btn');
     const checkLogOutput = document.getElementById('check-log-output');
     const structureDisplayContainer = document.querySelector('.structure-display-container'); // NEU: Container für Log-Feld
 
@@ -32,6 +34,8 @@ export function setupStructureCheckPage() {
         if (checkLogOutput) checkLogOutput.classList.add('hidden');
         if (runCheckBtn) runCheckBtn.classList.add('hidden');
         if (runGenerateBtn) runGenerateBtn.classList.add('hidden');
+        if (runVerifyBtn) runVerifyBtn.classList.add('hidden');
+        if (runGenerateHashesBtn) runGenerateHashesBtn.classList.add('hidden');
         // Den gesamten Container für das Logfeld ausblenden, wenn Debug-Modus deaktiviert
         if (structureDisplayContainer) structureDisplayContainer.classList.add('hidden');
         window.debugLog("Admin_StructureCheck: Debug-Modus ist deaktiviert oder Benutzer ist kein Admin. Log-Feld und Buttons ausgeblendet.", 'INFO', 'Admin_StructureCheck');
@@ -40,16 +44,38 @@ export function setupStructureCheckPage() {
         if (checkLogOutput) checkLogOutput.classList.remove('hidden');
         if (runCheckBtn) runCheckBtn.classList.remove('hidden');
         if (runGenerateBtn) runGenerateBtn.classList.remove('hidden');
+        if (runVerifyBtn) runVerifyBtn.classList.remove('hidden');
+        if (runGenerateHashesBtn) runGenerateHashesBtn.classList.remove('hidden');
         if (structureDisplayContainer) structureDisplayContainer.classList.remove('hidden');
     }
 
 
     /**
-     * Führt den Struktur-Check oder die Generierung über die API aus.
-     * @param {string} flag Das Kommando-Flag (--check oder --generate).
+     * Verfolgt das Log eines Admin-Jobs per Server-Sent Events, bis der Job beendet ist.
+     * @param {string} jobId Die ID des Jobs.
+     * @returns {Promise<object>} Der abschließende Job-Status.
+     */
+    const followJob = (jobId) => new Promise((resolve, reject) => {
+        const source = new EventSource(`/api/admin/jobs/${encodeURIComponent(jobId)}/stream`);
+        source.onmessage = (event) => {
+            if (checkLogOutput) checkLogOutput.textContent += event.data + '\n';
+        };
+        source.addEventListener('end', (event) => {
+            source.close();
+            resolve(JSON.parse(event.data));
+        });
+        source.onerror = () => {
+            // Bei Verbindungsabbrüchen verbindet sich der Browser selbst neu (Last-Event-ID)
+            if (source.readyState === EventSource.CLOSED) reject(new Error('Verbindung zum Job-Log verloren.'));
+        };
+    });
+
+    /**
+     * Startet den Struktur-Check oder die Generierung als Hintergrund-Job und zeigt das Log laufend an.
+     * @param {string} flag Das Kommando-Flag (--check, --verify, --generate oder --generate --hashes).
      */
     const runCheck = async (flag) => {
-        if (checkLogOutput) checkLogOutput.textContent = 'Befehl wird ausgeführt...';
+        if (checkLogOutput) checkLogOutput.textContent = 'Befehl wird ausgeführt...\n';
         window.debugLog(`Admin_StructureCheck: Führe Struktur-Check aus mit Flag: ${flag}`, 'INFO', 'Admin_StructureCheck');
         try {
             const response = await fetch('/api/admin/run-check', {
@@ -58,10 +84,22 @@ export function setupStructureCheckPage() {
                 body: JSON.stringify({ flag: flag })
             });
             const result = await response.json();
-            if (checkLogOutput) checkLogOutput.textContent = result.log;
-            window.debugLog(`Admin_StructureCheck: Struktur-Check Ergebnis für ${flag}.`, 'INFO', 'Admin_StructureCheck', result.log);
+            if (!response.ok) {
+                if (checkLogOutput) checkLogOutput.textContent = result.log;
+                return;
+            }
+            const job = await followJob(result.job.id);
+            if (checkLogOutput) {
+                if (job?.cached) checkLogOutput.textContent += '(Unveränderte Struktur: Ergebnis des letzten Checks)\n';
+                if (job?.status === 'failed') checkLogOutput.textContent += `Fehler: ${job.error}\n`;
+                const summary = job?.result;
+                if (summary?.missing) {
+                    checkLogOutput.textContent += `\nZusammenfassung: ${summary.missing.length} fehlend, ${summary.orphans.length} verwaist, ${summary.changed.length} geändert\n`;
+                }
+            }
+            window.debugLog(`Admin_StructureCheck: Struktur-Check für ${flag} beendet.`, 'INFO', 'Admin_StructureCheck', job);
         } catch (error) {
-            if (checkLogOutput) checkLogOutput.textContent = 'Fehler bei der Ausführung des Checks.';
+            if (checkLogOutput) checkLogOutput.textContent += 'Fehler bei der Ausführung des Checks.';
             console.error("Fehler beim Ausführen des Struktur-Checks:", error);
             window.debugLog(`Admin_StructureCheck: Fehler beim Ausführen des Struktur-Checks für ${flag}.`, 'ERROR', 'Admin_StructureCheck', error);
         }
@@ -69,6 +107,8 @@ export function setupStructureCheckPage() {
 
     if (runCheckBtn) runCheckBtn.addEventListener('click', () => runCheck('--check'));
     if (runGenerateBtn) runGenerateBtn.addEventListener('click', () => runCheck('--generate'));
+    if (runVerifyBtn) runVerifyBtn.addEventListener('click', () => runCheck('--verify'));
+    if (runGenerateHashesBtn) runGenerateHashesBtn.addEventListener('click', () => runCheck('--generate --hashes'));
     
     /**
      * Formatiert die Strukturdaten als lesbaren Text.
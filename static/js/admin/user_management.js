@@ -42,15 +42,30 @@ export async function setupUserManagementPage() {
         attachUserManagementListeners();
     };
 
+    let loadedUsers = [];
+
     /**
-     * Lädt die Benutzerdaten vom Server und rendert die Tabelle.
+     * Lädt die nächste Seite der Benutzerdaten vom Server und rendert die Tabelle.
+     * Die Gesamtzahl liefert der Server im Header X-Total-Count.
      */
     const loadUsers = async () => {
-        tableBody.innerHTML = '<tr><td colspan="4">Lade Benutzer...</td></tr>';
+        if (loadedUsers.length === 0) {
+            tableBody.innerHTML = '<tr><td colspan="4">Lade Benutzer...</td></tr>';
+        }
         try {
-            const response = await fetch('/api/admin/users');
+            const response = await fetch(`/api/admin/users?offset=${loadedUsers.length}`);
             const users = await response.json();
-            renderTable(users);
+            const total = parseInt(response.headers.get('X-Total-Count') || '0', 10);
+            loadedUsers = loadedUsers.concat(users);
+            renderTable(loadedUsers);
+            if (users.length > 0 && loadedUsers.length < total) {
+                tableBody.insertAdjacentHTML('beforeend', `
+                    <tr class="load-more-row"><td colspan="4" style="text-align: center;">
+                        <button class="btn btn-secondary" id="load-more-users-btn">Weitere Benutzer laden (${loadedUsers.length} von ${total})</button>
+                    </td></tr>
+                `);
+                document.getElementById('load-more-users-btn').addEventListener('click', loadUsers);
+            }
         } catch (error) {
             tableBody.innerHTML = '<tr><td colspan="4">Fehler beim Laden der Benutzer.</td></tr>';
             console.error("Fehler beim Laden der Benutzer:", error);
@@ -53,7 +53,7 @@ export async function renderProjectGrid() {
     }
 
     grid.innerHTML = projects.map(p => {
-        // Berechne den Fortschritt für jedes Projekt
+        // Berechne den Fortschritt für jedes Projekt (die Server-Projektliste liefert ihn bereits mit)
         let totalItems = 0;
         let completedItems = 0;
 
@@ -70,7 +70,9 @@ export async function renderProjectGrid() {
                 }
             });
         });
-        const progressPercentage = totalItems > 0 ? Math.round((completedItems / totalItems) * 100) : 0;
+        const progressPercentage = !p.phases && typeof p.progress === 'number'
+            ? p.progress
+            : (totalItems > 0 ? Math.round((completedItems / totalItems) * 100) : 0);
 
         return `
             <div class="project-card">
@@ -130,20 +132,8 @@ export async function renderProjectGrid() {
 async function createInitialProject() {
     window.debugLog("Dashboard: Versuche initiales Projekt zu erstellen.");
     try {
-        const response = await window.db.getInitialProjectContent();
-        if (response.error) {
-            showInfoModal('Fehler', `Fehler beim Laden des Beispielprojekts: ${response.error}`);
-            window.debugLog("Dashboard: Fehler beim Laden des Beispielprojekts.", response.error);
-            return;
-        }
-
-        const initialProject = {
-            projectId: "initial_bsp_project", // Use a fixed ID for the initial project
-            projectName: response.projectName || "Beispielprojekt",
-            phases: response.data?.phases || response.phases || [] // Use phases from template
-        };
-
-        const createResponse = await window.db.createProject(initialProject);
+        // Use a fixed ID for the initial project; der Server kopiert bsp.json direkt in die Projektablage
+        const createResponse = await window.db.createProjectFromTemplate('bsp', null, "initial_bsp_project");
         if (!createResponse.ok) {
             showInfoModal('Fehler', 'Das initiale Beispielprojekt konnte nicht automatisch erstellt werden.');
             window.debugLog("Dashboard: Initiales Beispielprojekt konnte nicht erstellt werden.", createResponse);
@@ -177,22 +167,15 @@ export async function createNewProject(showTemplateSelection = false) {
                 return; // User cancelled
             }
 
-            let newProjectData = {};
             let projectNamePrompt = '';
 
             if (selectedOption === 'blank') {
                 projectNamePrompt = 'Wie soll Ihr neues leeres Projekt heißen?';
-                newProjectData.phases = [];
                 window.debugLog("Dashboard: Leeres Projekt ausgewählt.");
             } else {
-                const templateContent = await window.db.getTemplateContent(selectedOption);
-                if (templateContent.error) {
-                    showInfoModal('Fehler', `Inhalt der Vorlage konnte nicht geladen werden: ${templateContent.error}`);
-                    window.debugLog("Dashboard: Inhalt der Vorlage konnte nicht geladen werden.", templateContent.error);
-                    return;
-                }
-                newProjectData.phases = templateContent.data?.phases || templateContent.phases || [];
-                projectNamePrompt = `Name für das Projekt (Vorlage: ${templateContent.name || selectedOption}):`;
+                // Der Vorlageninhalt wird nicht mehr geladen; das Projekt entsteht serverseitig aus der Vorlage.
+                const templateName = templates.find(t => t.id === selectedOption)?.name || selectedOption;
+                projectNamePrompt = `Name für das Projekt (Vorlage: ${templateName}):`;
                 window.debugLog(`Dashboard: Vorlage "${selectedOption}" ausgewählt.`);
             }
 
@@ -207,13 +190,10 @@ export async function createNewProject(showTemplateSelection = false) {
                     return;
                 }
 
-                const finalProject = {
-                    projectId: `proj_${Date.now()}`,
-                    projectName: projectName.trim(),
-                    phases: newProjectData.phases
-                };
-
-                const response = await window.db.createProject(finalProject);
+                const projectId = `proj_${Date.now()}`;
+                const response = selectedOption === 'blank'
+                    ? await window.db.createProject({ projectId, projectName: projectName.trim(), phases: [] })
+                    : await window.db.createProjectFromTemplate(selectedOption, projectName.trim(), projectId);
                 if (response.ok) {
                     const createdProject = await response.json();
                     window.location.href = `/project/${createdProject.projectId}`;
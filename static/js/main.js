@@ -22,6 +22,15 @@ window.currentUser = currentUser;
 window.globalSettings = globalSettings; // NEU: globalSettings exponiert
 window.hasInitialProjectBeenLoaded = hasInitialProjectBeenLoaded; // Expose this flag
 
+// Vorab geladene Daten aus /api/bootstrap (Projekt, Projektliste, Vorlagen, Einstellungen).
+// Jeder Eintrag wird nur einmal verwendet; spätere Aufrufe gehen wieder an die einzelnen Endpunkte.
+let bootstrapData = {};
+function takeBootstrap(key) {
+    const value = bootstrapData[key];
+    delete bootstrapData[key];
+    return value;
+}
+
 // =================================================================
 // GLOBALE DEBUG-FUNKTION (NEU)
 // =================================================================
@@ -454,30 +463,178 @@ function toggleDebugConsoleVisibility() {
 // =================================================================
 // DATABASE ABSTRAKTION
 // =================================================================
+
+/**
+ * Berechnet einen kompakten JSON Patch ([op, path, value]) zwischen zwei Ständen.
+ * Arrays werden elementweise verglichen; angehängte Elemente werden als "add" auf "/-",
+ * entfernte Elemente am Ende als "remove" ausgedrückt.
+ */
+function diffToPatch(before, after, path = '', ops = []) {
+    if (before === after) return ops;
+    const bothArrays = Array.isArray(before) && Array.isArray(after);
+    const bothObjects = !bothArrays && before && after && typeof before === 'object' && typeof after === 'object'
+        && !Array.isArray(before) && !Array.isArray(after);
+    if (bothArrays) {
+        const common = Math.min(before.length, after.length);
+        for (let i = 0; i < common; i++) diffToPatch(before[i], after[i], `${path}/${i}`, ops);
+        for (let i = before.length - 1; i >= common; i--) ops.push(['remove', `${path}/${i}`]);
+        for (let i = common; i < after.length; i++) ops.push(['add', `${path}/-`, after[i]]);
+    } else if (bothObjects) {
+        const escape = key => key.replace(/~/g, '~0').replace(/\//g, '~1');
+        Object.keys(before).forEach(key => {
+            if (!(key in after)) ops.push(['remove', `${path}/${escape(key)}`]);
+        });
+        Object.keys(after).forEach(key => {
+            if (!(key in before)) ops.push(['add', `${path}/${escape(key)}`, after[key]]);
+            else diffToPatch(before[key], after[key], `${path}/${escape(key)}`, ops);
+        });
+    } else if (JSON.stringify(before) !== JSON.stringify(after)) {
+        ops.push(['replace', path, after]);
+    }
+    return ops;
+}
+
+// Zwei Patches auf derselben Basis lassen sich nacheinander anwenden, wenn der fremde nur Werte
+// ersetzt (also keine Array-Indizes verschiebt) und keiner der Pfade einen des anderen enthält.
+function canRebase(localOps, remoteOps) {
+    if (remoteOps.some(op => op[0] !== 'replace')) return false;
+    const overlaps = (a, b) => a === b || a.startsWith(`${b}/`) || b.startsWith(`${a}/`);
+    return !remoteOps.some(remote => localOps.some(local => overlaps(local[1], remote[1])));
+}
+
+// Übernimmt einen nach einem Konflikt neu geladenen Stand: Seiten rendern ihn über das Ereignis
+// 'projectreloaded' neu. Der Hinweis erscheint nach der Meldung des Aufrufers und ersetzt sie.
+function announceProjectReload(id, project, message) {
+    if (window.currentProjectId !== id) return;
+    window.currentProjectData = project;
+    window.dispatchEvent(new CustomEvent('projectreloaded', { detail: { id } }));
+    setTimeout(() => window.showInfoModal('Projekt aktualisiert', message), 0);
+}
+
 const apiDb = {
+    // Zuletzt bekannte ETags je Projekt; werden beim Speichern als If-Match mitgesendet,
+    // damit der Server parallele Änderungen (z. B. aus einem zweiten Tab) mit 409 ablehnt.
+    _etags: {},
+    // Zuletzt mit dem Server abgeglichener Stand je Projekt, Basis für Delta-Speicherungen.
+    _snapshots: {},
     async getProjects() { 
-        window.debugLog("API: Rufe Projekte ab.", 'INFO', 'API_DB');
-        return (await fetch('/api/projects')).json(); 
+        // Nur Kurzfassungen (ID, Name, Fortschritt) statt vollständiger Projekte; folgt den Cursorn bis zur letzten Seite.
+        window.debugLog("API: Rufe Projektliste ab.", 'INFO', 'API_DB');
+        const projects = [];
+        let cursor = null;
+        const prefetched = takeBootstrap('projects');
+        if (prefetched) {
+            prefetched.items.forEach(p => projects.push({ ...p, projectId: p.id, projectName: p.name }));
+            cursor = prefetched.nextCursor;
+            if (!cursor) return projects;
+        }
+        do {
+            const params = new URLSearchParams({ fields: 'id,name,progress,updatedAt', limit: '200' });
+            if (cursor) params.set('cursor', cursor);
+            const page = await (await fetch(`/api/projects/list?${params}`)).json();
+            if (page.error) return [];
+            page.items.forEach(p => projects.push({ ...p, projectId: p.id, projectName: p.name }));
+            cursor = page.nextCursor;
+        } while (cursor);
+        return projects;
     },
     async getProject(id) { 
         window.debugLog(`API: Rufe Projekt '${id}' ab.`, 'INFO', 'API_DB');
-        return (await fetch(`/api/project/${id}`)).json(); 
+        const prefetched = takeBootstrap('project');
+        if (prefetched && prefetched.id === id) {
+            if (!prefetched.project) return { error: "Project not found" };
+            this._etags[id] = `"${prefetched.version}"`;
+            this._snapshots[id] = JSON.stringify(prefetched.project);
+            return prefetched.project;
+        }
+        const response = await fetch(`/api/project/${id}`);
+        const project = await response.json();
+        if (response.ok && response.headers.get('ETag')) {
+            this._etags[id] = response.headers.get('ETag');
+            this._snapshots[id] = JSON.stringify(project);
+        }
+        return project;
     },
     async saveProject(id, data) { 
         window.debugLog(`API: Speichere Projekt '${id}'.`, 'INFO', 'API_DB', data);
-        return fetch(`/api/project/${id}`, { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(data) }); 
+        const headers = { 'Content-Type': 'application/json' };
+        if (this._etags[id]) headers['If-Match'] = this._etags[id];
+        const body = JSON.stringify(data);
+
+        // Ist der Serverstand bekannt, nur die Änderungen als JSON Patch senden.
+        let response;
+        if (this._etags[id] && this._snapshots[id]) {
+            const ops = diffToPatch(JSON.parse(this._snapshots[id]), JSON.parse(body));
+            if (ops.length === 0) {
+                window.debugLog(`API: Projekt '${id}' unverändert, Speichern übersprungen.`, 'INFO', 'API_DB');
+                return { ok: true, status: 200 };
+            }
+            const patchBody = JSON.stringify(ops);
+            if (patchBody.length < body.length / 2) {
+                window.debugLog(`API: Sende ${ops.length} Änderung(en) als Patch für Projekt '${id}'.`, 'INFO', 'API_DB');
+                response = await fetch(`/api/project/${id}`, { method: 'PATCH', headers, body: patchBody });
+            }
+        }
+        if (!response) {
+            response = await fetch(`/api/project/${id}`, { method: 'POST', headers, body });
+        }
+
+        if (response.ok && response.headers.get('ETag')) {
+            this._etags[id] = response.headers.get('ETag');
+            this._snapshots[id] = body;
+        } else if (response.status === 409) {
+            window.debugLog(`API: Speichern von Projekt '${id}' abgelehnt, da es zwischenzeitlich geändert wurde.`, 'WARN', 'API_DB');
+            return this._resolveConflict(id, JSON.parse(body), response);
+        }
+        return response;
+    },
+    async _fetchServerCopy(id) {
+        // Serverstand und ETag neu laden und als Basis für weitere Speicherungen übernehmen.
+        const response = await fetch(`/api/project/${id}`);
+        if (!response.ok || !response.headers.get('ETag')) return null;
+        const project = await response.json();
+        this._etags[id] = response.headers.get('ETag');
+        this._snapshots[id] = JSON.stringify(project);
+        return project;
+    },
+    async _resolveConflict(id, data, conflictResponse) {
+        // Ohne neuen Serverstand scheitert jede weitere Speicherung ebenfalls mit 409. Berühren sich
+        // die eigenen und die fremden Änderungen nicht, werden die eigenen einmal erneut gesendet.
+        const base = this._snapshots[id] ? JSON.parse(this._snapshots[id]) : null;
+        const fresh = await this._fetchServerCopy(id);
+        if (!fresh) return conflictResponse;
+        let response = conflictResponse;
+        const localOps = base ? diffToPatch(base, data) : [];
+        if (localOps.length && canRebase(localOps, diffToPatch(base, fresh))) {
+            window.debugLog(`API: Wende ${localOps.length} Änderung(en) erneut auf Projekt '${id}' an.`, 'INFO', 'API_DB');
+            response = await fetch(`/api/project/${id}`, {
+                method: 'PATCH',
+                headers: { 'Content-Type': 'application/json', 'If-Match': this._etags[id] },
+                body: JSON.stringify(localOps)
+            });
+        }
+        const project = (response.ok && await this._fetchServerCopy(id)) || fresh;
+        announceProjectReload(id, project, response.ok
+            ? 'Das Projekt wurde zwischenzeitlich an anderer Stelle geändert. Ihre Änderung wurde auf den neuen Stand übertragen und gespeichert.'
+            : 'Das Projekt wurde zwischenzeitlich an anderer Stelle geändert. Ihre letzte Änderung konnte nicht übernommen werden; angezeigt wird jetzt der aktuelle Stand.');
+        return response;
     },
     async createProject(data) { 
         window.debugLog("API: Erstelle Projekt.", 'INFO', 'API_DB', data);
         return fetch('/api/project', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(data) }); 
     },
+    async createProjectFromTemplate(templateId, projectName, projectId) {
+        // Der Server kopiert die Vorlage selbst und vergibt neue IDs; die Antwort enthält nur die projectId.
+        window.debugLog(`API: Erstelle Projekt aus Vorlage '${templateId}'.`, 'INFO', 'API_DB');
+        return fetch('/api/projects/from-template', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ templateId, projectName, projectId }) });
+    },
     async deleteProject(id) { 
         window.debugLog(`API: Lösche Projekt '${id}'.`, 'WARN', 'API_DB');
         return fetch(`/api/project/${id}`, { method: 'DELETE' }); 
     },
     async getSettings() { 
         window.debugLog("API: Rufe Benutzereinstellungen ab.", 'INFO', 'API_DB');
-        return (await fetch('/api/settings')).json(); 
+        return takeBootstrap('settings') || (await fetch('/api/settings')).json(); 
     },
     async saveSettings(data) { 
         window.debugLog("API: Speichere Benutzereinstellungen.", 'INFO', 'API_DB', data);
@@ -489,7 +646,7 @@ const apiDb = {
     },
     async getTemplates() { 
         window.debugLog("API: Rufe Vorlagen ab.", 'INFO', 'API_DB');
-        return (await fetch('/api/templates')).json(); 
+        return takeBootstrap('templates') || (await fetch('/api/templates')).json(); 
     },
     async getTemplateContent(templateId) { 
         window.debugLog(`API: Rufe Vorlageninhalt für '${templateId}' ab.`, 'INFO', 'API_DB');
@@ -546,6 +703,17 @@ const guestDb = {
         window.debugLog(`GuestDB: Projekt '${data.projectId}' erstellt.`, 'INFO', 'GuestDB', data);
         return { ok: true, json: async () => data };
     },
+    async createProjectFromTemplate(templateId, projectName, projectId) {
+        // Gäste speichern lokal: Vorlage laden und hier kopieren.
+        const content = templateId === 'bsp' ? await this.getInitialProjectContent() : await this.getTemplateContent(templateId);
+        if (content.error) return { ok: false };
+        const source = content.data || (content.phases ? content : Object.values(content)[0]) || {};
+        return this.createProject({
+            projectId: projectId || `proj_${Date.now()}`,
+            projectName: projectName || content.name || source.projectName || 'Beispielprojekt',
+            phases: source.phases || []
+        });
+    },
     async deleteProject(id) {
         const projects = this._getProjects();
         delete projects[id];
@@ -581,7 +749,7 @@ const guestDb = {
     },
     async getTemplates() { 
         window.debugLog("API: Rufe Vorlagen ab.", 'INFO', 'API_DB');
-        return (await fetch('/api/templates')).json(); 
+        return takeBootstrap('templates') || (await fetch('/api/templates')).json(); 
     },
     async getTemplateContent(templateId) { 
         window.debugLog(`API: Rufe Vorlageninhalt für '${templateId}' ab.`, 'INFO', 'API_DB');
@@ -599,11 +767,21 @@ const guestDb = {
 document.addEventListener('DOMContentLoaded', async () => {
     window.debugLog("main.js: DOMContentLoaded Event gefeuert. Starte Initialisierung.", 'INFO', 'main.js');
     try {
-        // Lade Session und globale Einstellungen parallel
-        const [session, globalSettingsData] = await Promise.all([
-            fetch('/api/session').then(res => res.json()),
-            fetch('/api/global-settings').then(res => res.json())
-        ]);
+        // Session, globale Einstellungen, Benutzereinstellungen und die Daten der Seite in einer Anfrage
+        const bootstrapParams = new URLSearchParams();
+        const bootstrapProjectMatch = window.location.pathname.match(/^\/project(?:-overview|-checklist)?\/([A-Za-z0-9_-]+)/);
+        if (bootstrapProjectMatch) bootstrapParams.set('project', bootstrapProjectMatch[1]);
+        if (window.location.pathname.startsWith('/dashboard')) {
+            bootstrapParams.set('projects', '1');
+            bootstrapParams.set('templates', '1');
+        }
+        const bootstrap = await fetch(`/api/bootstrap?${bootstrapParams}`).then(res => res.json());
+        const session = bootstrap.session;
+        const globalSettingsData = bootstrap.globalSettings;
+        bootstrapData = { settings: bootstrap.settings, templates: bootstrap.templates, projects: bootstrap.projects };
+        if (bootstrapProjectMatch && 'project' in bootstrap) {
+            bootstrapData.project = { id: bootstrapProjectMatch[1], project: bootstrap.project, version: bootstrap.projectVersion };
+        }
 
         currentUser = session;
         globalSettings = globalSettingsData;
@@ -750,7 +928,7 @@ function runPageSpecificSetup() {
     setupGlobalUI(currentUser);
     const path = window.location.pathname;
 
-    const projectPageMatch = path.match(/^\/project(?:-overview|-checklist)?\/([a-zA-Z0-9_]+)/);
+    const projectPageMatch = path.match(/^\/project(?:-overview|-checklist)?\/([A-Za-z0-9_-]+)/);
 
     let projectTitle = '';
     let pageTitle = '';
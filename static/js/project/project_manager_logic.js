@@ -37,7 +37,25 @@ export async function setupProjectManagerPage() {
     document.getElementById('delete-project-btn')?.addEventListener('click', deleteCurrentProject);
     document.getElementById('edit-project-name-btn')?.addEventListener('click', editProjectName);
 
+    // Nach einem Speicherkonflikt den neu geladenen Stand anzeigen (siehe announceProjectReload in main.js)
+    window.addEventListener('projectreloaded', () => {
+        document.getElementById('page-main-title').textContent = `Projekt: ${window.currentProjectData.projectName}`;
+        GlobalUI.updateHeaderTitles(window.currentProjectData.projectName, 'Editor');
+        renderProjectTree(window.currentProjectData, document.getElementById('projectTree'));
+        // Das ausgewählte Element gehört zum alten Stand
+        window.currentlySelectedItem = null;
+        window.currentlySelectedType = null;
+        clearItemEditor();
+    });
+
     // Initialer Zustand für den Projekt-Editor-Hinweis
+    clearItemEditor();
+}
+
+/**
+ * Leert den Editor und zeigt den Hinweis an, dass kein Element ausgewählt ist.
+ */
+function clearItemEditor() {
     const editorContent = document.getElementById('editor-content');
     const editorEmptyHint = document.getElementById('editor-empty-hint');
     const selectedItemNameSpan = document.getElementById('selected-item-name');
@@ -80,6 +98,11 @@ export async function setupProjectChecklistPage() {
             }
         }
 
+        // Nach einem Speicherkonflikt den neu geladenen Stand anzeigen (siehe announceProjectReload in main.js)
+        window.addEventListener('projectreloaded', () => {
+            if (checklistTextViewContainer) renderChecklistTextView(window.currentProjectData, checklistTextViewContainer);
+        });
+
         // Ansichts-Umschalter einrichten
         document.getElementById('checklist-text-view-btn')?.addEventListener('click', () => {
             if (checklistTextViewContainer) checklistTextViewContainer.classList.remove('hidden');
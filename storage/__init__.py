@@ -0,0 +1,28 @@
+"""
+Persistenzschicht des Projektplaners.
+
+Kapselt den Zugriff auf die JSON-Dateien unter static/data und api/ bzw.
+auf die SQLite-Datenbank (siehe engine.py).
+"""
+from .json_cache import JsonDocumentCache, FrozenDict, FrozenList, freeze, thaw
+from .codec import available_codecs, get_codec
+from .json_io import document_cache, configure_codec, configure_writes, document_mtime, document_version, flush_writes, json_exists, load_json, remove_json, save_json
+from .users import UserRepository
+from .projects import ProjectStore, is_valid_project_id
+from .locks import directory_lock, file_lock
+from .engine import StorageEngine, USER_DOCUMENT_KINDS
+from .json_engine import JsonFileEngine
+
+STORAGE_ENGINES = ('json', 'sqlite')
+
+
+def create_engine(kind, user_data_dir, users_dir, users_file, settings_file, templates_dir, database_path=None):
+    """Erzeugt die konfigurierte Speicher-Engine ('json' oder 'sqlite')."""
+    if kind == 'json':
+        return JsonFileEngine(user_data_dir, users_dir, users_file, settings_file, templates_dir)
+    if kind == 'sqlite':
+        from .sqlite_engine import SqliteEngine
+        if not database_path:
+            raise ValueError("Für die SQLite-Engine muss ein Datenbankpfad angegeben werden.")
+        return SqliteEngine(database_path, settings_file, templates_dir)
+    raise ValueError(f"Unbekannte Speicher-Engine: {kind!r} (erlaubt: {', '.join(STORAGE_ENGINES)})")
@@ -0,0 +1,145 @@
+"""
+Atomares Schreiben von Dateien.
+
+Jede Datei wird zuerst in eine temporäre Datei im selben Verzeichnis
+geschrieben und dann per `os.replace` an ihren Platz gerückt. Leser sehen
+damit immer entweder den alten oder den neuen Inhalt, nie eine halb
+geschriebene Datei.
+
+Wann Daten auf die Platte gezwungen werden, bestimmt die fsync-Strategie:
+
+    'always'  fsync der Datei vor dem Umbenennen und des Verzeichnisses danach
+    'group'   Group-Commit: gleichzeitige Schreiber teilen sich einen fsync-Durchlauf,
+              der höchstens alle `group_commit_interval` Sekunden stattfindet
+    'never'   kein fsync (schnell, aber nach einem Stromausfall evtl. alter Stand)
+"""
+import os
+import tempfile
+import threading
+import time
+
+FSYNC_ALWAYS = 'always'
+FSYNC_GROUP = 'group'
+FSYNC_NEVER = 'never'
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_GROUP, FSYNC_NEVER)
+
+# Die umask lässt sich nur durch Setzen auslesen; einmalig beim Import erledigen.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+DEFAULT_FILE_MODE = 0o666 & ~_UMASK
+
+
+def fsync_directory(directory):
+    """Sichert einen Verzeichniseintrag (z. B. nach einem Rename). Auf Windows nicht möglich und übersprungen."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class _GroupCommitter:
+    """Bündelt fsync-Aufrufe mehrerer Threads in einem gemeinsamen Durchlauf."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._cond = threading.Condition()
+        self._pending = []        # (fd, Ticket) - Schreiber warten auf ihr Ticket
+        self._pending_dirs = set()  # Verzeichnisse werden ohne Warten nachgezogen
+        self._thread = None
+
+    def sync(self, fd):
+        """Blockiert, bis `fd` im nächsten Durchlauf per fsync gesichert wurde."""
+        ticket = {"done": threading.Event(), "error": None}
+        with self._cond:
+            self._pending.append((fd, ticket))
+            self._ensure_thread()
+            self._cond.notify()
+        ticket["done"].wait()
+        if ticket["error"] is not None:
+            raise ticket["error"]
+
+    def sync_directory_later(self, directory):
+        with self._cond:
+            self._pending_dirs.add(directory)
+            self._ensure_thread()
+            self._cond.notify()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._pending_dirs:
+                    self._cond.wait()
+            # Kurz warten, damit sich weitere Schreiber dem Durchlauf anschließen.
+            time.sleep(self.interval)
+            with self._cond:
+                batch, self._pending = self._pending, []
+                directories, self._pending_dirs = self._pending_dirs, set()
+            for fd, ticket in batch:
+                try:
+                    os.fsync(fd)
+                except OSError as e:
+                    ticket["error"] = e
+                ticket["done"].set()
+            for directory in directories:
+                fsync_directory(directory)
+
+
+class AtomicWriter:
+    """Schreibt Dateien atomar gemäß der konfigurierten fsync-Strategie."""
+
+    def __init__(self, fsync_policy=FSYNC_ALWAYS, group_commit_interval=0.005):
+        self._group = None
+        self.configure(fsync_policy, group_commit_interval)
+
+    def configure(self, fsync_policy=None, group_commit_interval=None):
+        if fsync_policy is not None:
+            if fsync_policy not in FSYNC_POLICIES:
+                raise ValueError(f"Unbekannte fsync-Strategie: {fsync_policy!r} (erlaubt: {', '.join(FSYNC_POLICIES)})")
+            self.fsync_policy = fsync_policy
+        if group_commit_interval is not None:
+            self.group_commit_interval = group_commit_interval
+            self._group = _GroupCommitter(group_commit_interval)
+
+    def write_bytes(self, filepath, payload):
+        """Schreibt `payload` atomar nach `filepath` und legt fehlende Verzeichnisse an."""
+        directory = os.path.dirname(os.path.abspath(filepath))
+        os.makedirs(directory, exist_ok=True)
+        try:
+            mode = os.stat(filepath).st_mode & 0o777
+        except FileNotFoundError:
+            mode = DEFAULT_FILE_MODE
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(filepath)}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                if self.fsync_policy == FSYNC_ALWAYS:
+                    os.fsync(f.fileno())
+                elif self.fsync_policy == FSYNC_GROUP:
+                    self._group.sync(f.fileno())
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        if self.fsync_policy == FSYNC_ALWAYS:
+            fsync_directory(directory)
+        elif self.fsync_policy == FSYNC_GROUP:
+            self._group.sync_directory_later(directory)
+
@@ -0,0 +1,103 @@
+"""
+JSON-Codecs für Dateien, Journal und HTTP-Antworten.
+
+Verfügbare Codecs (in der Reihenfolge der automatischen Auswahl):
+
+    orjson   schnellster Codec, falls installiert (pip install orjson)
+    ujson    falls installiert (pip install ujson)
+    json     Standardbibliothek, immer verfügbar
+
+Standardmäßig wird kompakt geschrieben (ohne Einrückung und Leerzeichen nach
+Trennzeichen); bei großen Projekten halbiert das etwa die geschriebenen und
+geparsten Bytes. Mit `pretty=True` bleibt die lesbare Form mit Einrückung
+um zwei Leerzeichen erhalten.
+
+Alle Codecs liefern beim Kodieren UTF-8-Bytes und werfen beim Dekodieren
+einen ValueError (json.JSONDecodeError ist ein Untertyp davon).
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+COMPACT_SEPARATORS = (',', ':')
+
+
+class StdlibCodec:
+    """Codec auf Basis des json-Moduls der Standardbibliothek."""
+
+    name = 'json'
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, data, pretty=False, default=None):
+        if pretty:
+            text = json.dumps(data, indent=2, ensure_ascii=False, default=default)
+        else:
+            text = json.dumps(data, separators=COMPACT_SEPARATORS, ensure_ascii=False, default=default)
+        return text.encode('utf-8')
+
+
+class UjsonCodec:
+    """Codec auf Basis von ujson."""
+
+    name = 'ujson'
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+    def dumps(self, data, pretty=False, default=None):
+        options = {'ensure_ascii': False, 'escape_forward_slashes': False, 'indent': 2 if pretty else 0}
+        if default is not None:
+            options['default'] = default
+        return ujson.dumps(data, **options).encode('utf-8')
+
+
+class OrjsonCodec:
+    """Codec auf Basis von orjson (schreibt direkt Bytes)."""
+
+    name = 'orjson'
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, data, pretty=False, default=None):
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, default=default, option=option)
+        except orjson.JSONEncodeError:
+            # z. B. Ganzzahlen über 64 Bit, die orjson nicht unterstützt
+            return StdlibCodec().dumps(data, pretty, default)
+
+
+CODECS = {'orjson': OrjsonCodec, 'ujson': UjsonCodec, 'json': StdlibCodec}
+_MODULES = {'orjson': orjson, 'ujson': ujson, 'json': json}
+
+
+def available_codecs():
+    """Namen der installierten Codecs in Auswahlreihenfolge."""
+    return [name for name in CODECS if _MODULES[name] is not None]
+
+
+def get_codec(name='auto'):
+    """
+    Gibt eine Codec-Instanz zurück. 'auto' wählt den schnellsten installierten Codec.
+    Ein ausdrücklich angeforderter, aber nicht installierter Codec führt zu einem ValueError.
+    """
+    if name == 'auto':
+        name = available_codecs()[0]
+    if name not in CODECS:
+        raise ValueError(f"Unbekannter JSON-Codec: {name!r} (erlaubt: auto, {', '.join(CODECS)})")
+    if _MODULES[name] is None:
+        raise ValueError(f"JSON-Codec {name!r} ist nicht installiert.")
+    return CODECS[name]()
@@ -0,0 +1,155 @@
+"""
+Schnittstelle der austauschbaren Speicher-Engines.
+
+Die Anwendung spricht ausschließlich über diese Methoden mit der
+Persistenz. Implementierungen:
+
+    JsonFileEngine  (storage.json_engine)   JSON-Dateien unter static/data (Standard)
+    SqliteEngine    (storage.sqlite_engine) eingebettete SQLite-Datenbank im WAL-Modus
+
+Welche Engine verwendet wird, entscheidet die Konfiguration (STORAGE_ENGINE
+in app.py). Mit `python -m storage.transfer` lassen sich Daten zwischen den
+Engines kopieren.
+
+Lesende Methoden geben, wie `load_json`, schreibgeschützte Ansichten zurück,
+sofern nicht `mutable=True` angefordert wird.
+"""
+
+# Dokumentarten, die pro Benutzer abgelegt werden (neben den Projekten)
+USER_DOCUMENT_KINDS = ('profile', 'settings', 'logs')
+
+
+class StorageEngine:
+    """Basisklasse aller Speicher-Engines."""
+
+    name = None
+
+    # --- Benutzer ---
+
+    def get_user(self, username):
+        """Datensatz (inkl. 'username') oder None."""
+        raise NotImplementedError
+
+    def find_user(self, identifier):
+        """Sucht per Benutzername, dann per E-Mail."""
+        raise NotImplementedError
+
+    def username_exists(self, username):
+        raise NotImplementedError
+
+    def email_exists(self, email):
+        raise NotImplementedError
+
+    def add_user(self, username, record):
+        """Legt einen Benutzer an. False, wenn Benutzername oder E-Mail vergeben sind."""
+        raise NotImplementedError
+
+    def count_users(self):
+        raise NotImplementedError
+
+    def list_users(self, offset=0, limit=100):
+        """Alphabetisch sortierte Seite von Datensätzen."""
+        raise NotImplementedError
+
+    def iter_users(self):
+        """Liefert (username, record) für alle Benutzer."""
+        raise NotImplementedError
+
+    def replace_all_users(self, users):
+        """Ersetzt alle Benutzer durch ein {username: record}-Dict."""
+        raise NotImplementedError
+
+    # --- Benutzerdokumente (Profil, Einstellungen, Logs) ---
+
+    def load_user_doc(self, user_id, kind, default=None, mutable=False):
+        raise NotImplementedError
+
+    def save_user_doc(self, user_id, kind, data):
+        raise NotImplementedError
+
+    def user_lock(self, user_id):
+        """Prozessübergreifende Sperre für Read-Modify-Write auf Daten eines Benutzers."""
+        raise NotImplementedError
+
+    def init_user(self, user_id, documents):
+        """Legt die Grunddaten eines neuen Benutzers an ({kind: Daten}, keine Projekte)."""
+        raise NotImplementedError
+
+    def delete_all_user_data(self):
+        """Löscht Projekte und Benutzerdokumente aller Benutzer. Gibt eine Log-Zeile zurück."""
+        raise NotImplementedError
+
+    # --- Projekte ---
+
+    def list_project_ids(self, user_id):
+        raise NotImplementedError
+
+    def count_projects(self, user_id):
+        return len(self.list_project_ids(user_id))
+
+    def project_exists(self, user_id, project_id):
+        raise NotImplementedError
+
+    def project_version(self, user_id, project_id):
+        """Versionskennung des gespeicherten Projekts (für ETags) oder None."""
+        raise NotImplementedError
+
+    def project_updated_at(self, user_id, project_id):
+        """Zeitpunkt der letzten Speicherung (Unix-Zeit) oder None."""
+        raise NotImplementedError
+
+    def load_project(self, user_id, project_id, mutable=False):
+        raise NotImplementedError
+
+    def load_all_projects(self, user_id):
+        """Liste aller Projekte (Dokumente) in Erstellungsreihenfolge."""
+        raise NotImplementedError
+
+    def load_project_summaries(self, user_id):
+        """
+        Kurzfassungen aller Projekte in Erstellungsreihenfolge (siehe storage.summaries).
+        Der Index wird von save_project/delete_project laufend mitgeführt.
+        """
+        raise NotImplementedError
+
+    def save_project(self, user_id, project_id, data):
+        """Speichert ein Projekt. Gibt True zurück, wenn es neu angelegt wurde."""
+        raise NotImplementedError
+
+    def delete_project(self, user_id, project_id):
+        raise NotImplementedError
+
+    # --- Globale Einstellungen ---
+
+    def load_global_settings(self, default=None, mutable=False):
+        raise NotImplementedError
+
+    def save_global_settings(self, data):
+        raise NotImplementedError
+
+    def global_settings_version(self):
+        """Kennung des gespeicherten Stands (ändert sich bei jedem Speichern) oder None, wenn es keinen gibt."""
+        raise NotImplementedError
+
+    def global_settings_lock(self):
+        raise NotImplementedError
+
+    # --- Projektvorlagen ---
+
+    def list_template_ids(self):
+        """Sortierte Vorlagen-IDs (Dateiname ohne .json), inkl. 'bsp'."""
+        raise NotImplementedError
+
+    def template_signatures(self):
+        """{template_id: Signatur}; die Signatur ändert sich mit jeder Änderung der Vorlage."""
+        raise NotImplementedError
+
+    def load_template(self, template_id):
+        """Vorlageninhalt oder None."""
+        raise NotImplementedError
+
+    def save_template(self, template_id, data):
+        raise NotImplementedError
+
+    def close(self):
+        """Gibt Ressourcen (z. B. Datenbankverbindungen) frei."""
@@ -0,0 +1,116 @@
+"""
+Globale Einstellungen als geprüfter Schnappschuss im Speicher.
+
+Anfragen lesen nur den Schnappschuss. Höchstens alle `check_interval` Sekunden
+fragt der Dienst die Engine nach der Version des gespeicherten Stands (JSON-Engine:
+ein `os.stat` der Datei, SQLite: der Versionszähler der Tabelle) und lädt nur bei
+einer Änderung neu. Änderungen eines Admins in einem anderen Worker-Prozess sind
+damit spätestens nach `check_interval` Sekunden überall sichtbar, im eigenen
+Prozess sofort.
+
+Ein ungültiger gespeicherter Stand (z. B. von Hand falsch bearbeitet) wird mit
+einer Warnung übergangen; es gilt weiter der letzte gültige Schnappschuss.
+"""
+import sys
+import time
+import threading
+
+from .json_cache import freeze
+
+# Erwarteter Typ bekannter Einstellungen; unbekannte Schlüssel werden unverändert übernommen
+SETTING_TYPES = {
+    'guest_limits': dict,
+    'plan_limits': dict,
+    'registration_enabled': bool,
+    'maintenance_mode': bool,
+    'general_debug_mode': bool,
+}
+LIMIT_KEYS = ('projects', 'phases_per_project', 'tasks_per_phase', 'subtasks_per_task', 'max_project_bytes')
+
+
+class SettingsError(ValueError):
+    """Globale Einstellungen mit ungültigem Aufbau oder Wert."""
+
+
+def validate_global_settings(data):
+    """Prüft Aufbau und Typen der globalen Einstellungen. Wirft SettingsError."""
+    if not isinstance(data, dict):
+        raise SettingsError("Die globalen Einstellungen sind kein JSON-Objekt.")
+    for key, expected in SETTING_TYPES.items():
+        if key in data and not isinstance(data[key], expected):
+            raise SettingsError(f"'{key}' muss vom Typ {expected.__name__} sein.")
+    limit_sets = {'guest_limits': data.get('guest_limits') or {}}
+    for plan, limits in (data.get('plan_limits') or {}).items():
+        if not isinstance(limits, dict):
+            raise SettingsError(f"'plan_limits.{plan}' muss vom Typ dict sein.")
+        limit_sets[f'plan_limits.{plan}'] = limits
+    for name, limits in limit_sets.items():
+        for key, value in limits.items():
+            if key in LIMIT_KEYS and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+                raise SettingsError(f"'{name}.{key}' muss eine nicht negative ganze Zahl sein.")
+
+
+def merge_settings(current, changes):
+    """Übernimmt `changes` in `current`; verschachtelte Objekte (z. B. guest_limits) werden zusammengeführt."""
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(current.get(key), dict):
+            current[key].update(value)
+        else:
+            current[key] = value
+    return current
+
+
+class GlobalSettingsService:
+    """Im Speicher gehaltene globale Einstellungen mit Änderungserkennung über die Engine."""
+
+    def __init__(self, engine, check_interval=1.0):
+        self.engine = engine
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = freeze({})
+        self._version = None
+        self._rejected_version = None
+        self._checked_at = None
+
+    def refresh(self, force=False):
+        """Lädt den gespeicherten Stand neu, falls sich seine Version geändert hat."""
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return
+            version = self.engine.global_settings_version()
+            if version != self._version and version != self._rejected_version:
+                data = self.engine.load_global_settings({})
+                try:
+                    validate_global_settings(data)
+                except SettingsError as e:
+                    print(f"WARNUNG: Globale Einstellungen ({version}) werden ignoriert: {e}", file=sys.stderr)
+                    self._rejected_version = version
+                else:
+                    self._snapshot = freeze(data)
+                    self._version = version
+            self._checked_at = time.monotonic()
+
+    def get(self):
+        """Aktueller Schnappschuss (schreibgeschützt)."""
+        self.refresh()
+        return self._snapshot
+
+    def update(self, changes):
+        """
+        Führt `changes` mit dem gespeicherten Stand zusammen, prüft und speichert das Ergebnis.
+        Gibt den neuen Schnappschuss zurück; wirft SettingsError, ohne zu speichern.
+        """
+        if not isinstance(changes, dict):
+            raise SettingsError("Die Änderungen sind kein JSON-Objekt.")
+        with self.engine.global_settings_lock():
+            settings = merge_settings(self.engine.load_global_settings({}, mutable=True), changes)
+            validate_global_settings(settings)
+            self.engine.save_global_settings(settings)
+            with self._lock:
+                self._snapshot = freeze(settings)
+                self._version = self.engine.global_settings_version()
+                self._checked_at = time.monotonic()
+            return self._snapshot
@@ -0,0 +1,246 @@
+"""
+Arbeitsbereiche von Gästen im Arbeitsspeicher statt im Dateisystem.
+
+Gäste erhalten beim Login eine Benutzer-ID `guest_<uuid>`. Ihre Projekte und
+Dokumente landen nicht unter static/data/user_data, sondern in einem
+`GuestWorkspaceStore`:
+
+- TTL: Ein Arbeitsbereich verfällt `ttl` Sekunden nach dem letzten Zugriff.
+- LRU: Es gibt höchstens `max_workspaces` Arbeitsbereiche; darüber hinaus wird
+  der am längsten nicht benutzte verdrängt. Zusammen mit den Gast-Limits
+  (Projekte, max_project_bytes) ist damit auch der Speicherbedarf begrenzt.
+- Ein Hintergrund-Thread entfernt alle `reap_interval` Sekunden verfallene Bereiche.
+
+`GuestRoutingEngine` schaltet den Store vor die eigentliche Engine: Aufrufe mit
+einer Gast-ID gehen an den Store, alle anderen unverändert an die Engine.
+
+Der Store gehört zu einem Prozess. Bei mehreren Worker-Prozessen sieht ein Gast
+nur die Daten des Workers, der seine Anfrage bearbeitet; der Gast-Client hält
+seine Projekte ohnehin im Browser (localStorage).
+"""
+import time
+import threading
+from collections import OrderedDict
+
+from .json_cache import freeze, thaw
+from .projects import is_valid_project_id
+from .summaries import summarize_project
+
+GUEST_ID_PREFIX = 'guest_'
+
+
+def is_guest_id(user_id):
+    return str(user_id).startswith(GUEST_ID_PREFIX)
+
+
+class _Workspace:
+    __slots__ = ('documents', 'projects', 'lock', 'touched')
+
+    def __init__(self):
+        self.documents = {}
+        self.projects = {}  # project_id -> (Version, updated_at, Kurzfassung, Daten), in Erstellungsreihenfolge
+        self.lock = threading.RLock()
+        self.touched = time.monotonic()
+
+
+class GuestWorkspaceStore:
+    """In-Memory-Ablage für Gast-Arbeitsbereiche mit TTL, LRU-Grenze und Aufräum-Thread."""
+
+    def __init__(self, ttl=3600, max_workspaces=1000, reap_interval=60):
+        self.ttl = ttl
+        self.max_workspaces = max_workspaces
+        self.reap_interval = reap_interval
+        self._workspaces = OrderedDict()
+        self._lock = threading.Lock()
+        self._version_counter = 0
+        self._evicted = self._expired = 0
+        self._reaper = None
+        self._stop = threading.Event()
+
+    # --- Verwaltung ---
+
+    def _workspace(self, user_id, create=False):
+        key = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            workspace = self._workspaces.get(key)
+            if workspace is not None and now - workspace.touched > self.ttl:
+                del self._workspaces[key]
+                self._expired += 1
+                workspace = None
+            if workspace is None:
+                if not create:
+                    return None
+                workspace = self._workspaces[key] = _Workspace()
+                while len(self._workspaces) > self.max_workspaces:
+                    self._workspaces.popitem(last=False)
+                    self._evicted += 1
+                self._start_reaper()
+            else:
+                self._workspaces.move_to_end(key)
+            workspace.touched = now
+            return workspace
+
+    def _next_version(self):
+        with self._lock:
+            self._version_counter += 1
+            return f"g{self._version_counter:x}"
+
+    def _start_reaper(self):
+        if self._reaper is None and self.reap_interval:
+            self._reaper = threading.Thread(target=self._reap_loop, name='guest-workspace-reaper', daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        while not self._stop.wait(self.reap_interval):
+            self.reap()
+
+    def reap(self):
+        """Entfernt alle verfallenen Arbeitsbereiche. Gibt ihre Anzahl zurück."""
+        deadline = time.monotonic() - self.ttl
+        with self._lock:
+            # Die OrderedDict ist nach letztem Zugriff sortiert: verfallene Bereiche stehen vorn
+            expired = []
+            for key, workspace in self._workspaces.items():
+                if workspace.touched > deadline:
+                    break
+                expired.append(key)
+            for key in expired:
+                del self._workspaces[key]
+            self._expired += len(expired)
+        return len(expired)
+
+    def stats(self):
+        with self._lock:
+            return {"workspaces": len(self._workspaces), "max_workspaces": self.max_workspaces,
+                    "expired": self._expired, "evicted": self._evicted}
+
+    def clear(self):
+        with self._lock:
+            count = len(self._workspaces)
+            self._workspaces.clear()
+        return count
+
+    def close(self):
+        self._stop.set()
+
+    # --- Dokumente (Einstellungen usw.) ---
+
+    def load_user_doc(self, user_id, kind, default=None, mutable=False):
+        workspace = self._workspace(user_id)
+        data = workspace.documents.get(kind) if workspace is not None else None
+        if data is None:
+            return default
+        return thaw(data) if mutable else data
+
+    def save_user_doc(self, user_id, kind, data):
+        workspace = self._workspace(user_id, create=True)
+        workspace.documents[kind] = freeze(thaw(data))
+
+    def user_lock(self, user_id):
+        return self._workspace(user_id, create=True).lock
+
+    def init_user(self, user_id, documents):
+        for kind, data in documents.items():
+            self.save_user_doc(user_id, kind, data)
+
+    # --- Projekte ---
+
+    def _projects(self, user_id):
+        workspace = self._workspace(user_id)
+        return workspace.projects if workspace is not None else {}
+
+    def list_project_ids(self, user_id):
+        return list(self._projects(user_id))
+
+    def count_projects(self, user_id):
+        return len(self._projects(user_id))
+
+    def project_exists(self, user_id, project_id):
+        return project_id in self._projects(user_id)
+
+    def project_version(self, user_id, project_id):
+        entry = self._projects(user_id).get(project_id)
+        return entry[0] if entry else None
+
+    def project_updated_at(self, user_id, project_id):
+        entry = self._projects(user_id).get(project_id)
+        return entry[1] if entry else None
+
+    def load_project(self, user_id, project_id, mutable=False):
+        entry = self._projects(user_id).get(project_id)
+        if entry is None:
+            return None
+        return thaw(entry[3]) if mutable else entry[3]
+
+    def load_all_projects(self, user_id):
+        # Wie die Engines: Liste der Projekte in Erstellungsreihenfolge
+        return [entry[3] for entry in self._projects(user_id).values()]
+
+    def load_project_summaries(self, user_id):
+        return [entry[2] for entry in self._projects(user_id).values()]
+
+    def save_project(self, user_id, project_id, data):
+        if not is_valid_project_id(project_id):
+            raise ValueError(f"Ungültige Projekt-ID: {project_id!r}")
+        workspace = self._workspace(user_id, create=True)
+        now = time.time()
+        entry = (self._next_version(), now, freeze(summarize_project(project_id, data, now)), freeze(thaw(data)))
+        with workspace.lock:
+            is_new = project_id not in workspace.projects
+            workspace.projects[project_id] = entry
+        return is_new
+
+    def delete_project(self, user_id, project_id):
+        workspace = self._workspace(user_id)
+        if workspace is None:
+            return False
+        with workspace.lock:
+            return workspace.projects.pop(project_id, None) is not None
+
+
+def _route(method):
+    def call(self, user_id, *args, **kwargs):
+        target = self.guests if is_guest_id(user_id) else self.engine
+        return getattr(target, method)(user_id, *args, **kwargs)
+    call.__name__ = method
+    return call
+
+
+class GuestRoutingEngine:
+    """
+    Speicher-Engine, die Daten von Gästen im GuestWorkspaceStore hält und
+    alles andere an die eigentliche Engine weiterreicht.
+    """
+
+    def __init__(self, engine, guests):
+        self.engine = engine
+        self.guests = guests
+        self.name = engine.name
+
+    def __getattr__(self, name):
+        # Benutzer, globale Einstellungen, Vorlagen: unverändert an die Engine
+        return getattr(self.engine, name)
+
+    load_user_doc = _route('load_user_doc')
+    save_user_doc = _route('save_user_doc')
+    user_lock = _route('user_lock')
+    init_user = _route('init_user')
+    list_project_ids = _route('list_project_ids')
+    count_projects = _route('count_projects')
+    project_exists = _route('project_exists')
+    project_version = _route('project_version')
+    project_updated_at = _route('project_updated_at')
+    load_project = _route('load_project')
+    load_all_projects = _route('load_all_projects')
+    load_project_summaries = _route('load_project_summaries')
+    save_project = _route('save_project')
+    delete_project = _route('delete_project')
+
+    def delete_all_user_data(self):
+        self.guests.clear()
+        return self.engine.delete_all_user_data()
+
+    def close(self):
+        self.guests.close()
+        self.engine.close()
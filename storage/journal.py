@@ -0,0 +1,168 @@
+"""
+Optionales Write-Ahead-Journal für JSON-Speichervorgänge.
+
+Ist das Journal aktiv, hängt `save_json` den neuen Inhalt nur als eine Zeile
+an die Journaldatei an und kehrt sofort zurück. Ein Hintergrund-Thread
+schreibt die Zieldateien nach `flush_delay` Sekunden atomar weg. Mehrere
+Speichervorgänge auf dieselbe Datei innerhalb dieses Fensters (typisch:
+schnelles Tippen im Projektmanager) werden dabei zu einem einzigen
+Schreibvorgang zusammengefasst.
+
+Nach einem Absturz spielt `replay()` beim Start die noch nicht
+übertragenen Einträge nach. Eine beim Absturz abgeschnittene letzte Zeile
+wird verworfen.
+
+Wichtig: Noch nicht übertragene Einträge sind nur in diesem Prozess
+sichtbar. Das Journal ist daher nur für den Betrieb mit einem einzelnen
+Worker-Prozess gedacht.
+"""
+import os
+import json
+import logging
+import threading
+
+from .atomic import FSYNC_ALWAYS, FSYNC_GROUP
+from .json_cache import freeze
+
+logger = logging.getLogger(__name__)
+
+# Obergrenze für den Abstand erneuter Flush-Versuche nach Schreibfehlern (Sekunden)
+FLUSH_RETRY_MAX_DELAY = 30.0
+
+
+class WriteJournal:
+    """Append-only-Journal mit zusammenfassendem Hintergrund-Flush."""
+
+    def __init__(self, journal_path, writer, encode, flush_delay=0.5, encode_line=None, decode=None):
+        """
+        `encode` kodiert den Inhalt der Zieldateien, `encode_line`/`decode` die
+        Journalzeilen (Standard: kompaktes JSON der Standardbibliothek).
+        """
+        self.journal_path = journal_path
+        self.writer = writer
+        self.encode = encode
+        self.encode_line = encode_line or (lambda entry: json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        self.decode = decode or json.loads
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        # Serialisiert ganze Flush-Durchläufe (Timer, flush_writes(), close()), getrennt von
+        # _lock, damit append() während des Schreibens nicht blockiert
+        self._flush_lock = threading.Lock()
+        self._pending = {}   # absoluter Pfad -> (Sequenznummer, eingefrorene Daten)
+        self._sequence = 0   # zählt Anhängevorgänge, um das Kürzen des Journals abzusichern
+        self._timer = None
+        self._retry_delay = flush_delay   # wächst nach fehlgeschlagenen Flushes bis FLUSH_RETRY_MAX_DELAY
+        self._closed = False
+        os.makedirs(os.path.dirname(os.path.abspath(journal_path)), exist_ok=True)
+        self.replay()
+        self._file = open(journal_path, 'ab')
+
+    def append(self, filepath, data):
+        """Protokolliert einen Speichervorgang und plant den Flush ein."""
+        key = os.path.abspath(filepath)
+        line = self.encode_line({"path": key, "data": data}) + b'\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if self.writer.fsync_policy in (FSYNC_ALWAYS, FSYNC_GROUP):
+                os.fsync(self._file.fileno())
+            self._sequence += 1
+            self._pending[key] = (self._sequence, freeze(data))
+            self._schedule(self.flush_delay)
+
+    def _schedule(self, delay):
+        """Plant einen Flush in `delay` Sekunden, sofern noch keiner geplant ist. Aufrufer hält _lock."""
+        if self._timer is None and not self._closed:
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def pending(self, filepath):
+        """Gibt (True, Daten) zurück, wenn für die Datei noch ein nicht übertragener Stand existiert."""
+        key = os.path.abspath(filepath)
+        with self._lock:
+            if key in self._pending:
+                return True, self._pending[key][1]
+        return False, None
+
+    def pending_sequence(self, filepath):
+        """Gibt die Sequenznummer des ausstehenden Stands zurück oder None."""
+        with self._lock:
+            entry = self._pending.get(os.path.abspath(filepath))
+        return entry[0] if entry else None
+
+    def discard(self, filepath):
+        """Verwirft einen ausstehenden Stand, z. B. wenn die Datei gelöscht wird."""
+        key = os.path.abspath(filepath)
+        with self._lock:
+            self._pending.pop(key, None)
+            # Grabstein, damit replay() die Datei nach einem Absturz nicht wiederbelebt. Auch ohne
+            # ausstehenden Stand nötig: Bereits übertragene Einträge bleiben im Journal, bis es gekürzt wird.
+            self._file.write(self.encode_line({"path": key, "deleted": True}) + b'\n')
+            self._file.flush()
+            if self.writer.fsync_policy in (FSYNC_ALWAYS, FSYNC_GROUP):
+                os.fsync(self._file.fileno())
+
+    def flush(self):
+        """
+        Schreibt alle ausstehenden Stände atomar und kürzt das Journal, wenn nichts mehr aussteht.
+
+        Gleichzeitige Aufrufe laufen nacheinander: Sonst könnte ein älterer Schnappschuss
+        nach einem neueren geschrieben werden und ihn auf der Platte überdecken.
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._timer = None
+                batch = dict(self._pending)
+                sequence = self._sequence
+            for key, (_, data) in batch.items():
+                try:
+                    self.writer.write_bytes(key, self.encode(data))
+                except OSError as e:
+                    with self._lock:
+                        delay = self._retry_delay
+                        self._retry_delay = min(delay * 2, FLUSH_RETRY_MAX_DELAY)
+                        self._schedule(delay)
+                    logger.error("Journal-Flush für %s fehlgeschlagen: %s (neuer Versuch in %.1f s)", key, e, delay)
+                    return
+            with self._lock:
+                self._retry_delay = self.flush_delay
+                for key, entry in batch.items():
+                    if self._pending.get(key) is entry:
+                        del self._pending[key]
+                # Nur kürzen, wenn seit dem Schnappschuss nichts Neues angehängt wurde.
+                if sequence == self._sequence and not self._pending:
+                    self._file.truncate(0)
+                    self._file.flush()
+
+    def replay(self):
+        """Überträgt Einträge aus einem vorherigen Lauf. Gibt die Anzahl wiederhergestellter Dateien zurück."""
+        if not os.path.exists(self.journal_path):
+            return 0
+        latest = {}
+        with open(self.journal_path, 'rb') as f:
+            for raw_line in f:
+                try:
+                    entry = self.decode(raw_line)
+                except ValueError:
+                    # Abgeschnittene letzte Zeile eines abgebrochenen Schreibvorgangs
+                    logger.warning("Unvollständiger Journaleintrag in %s verworfen.", self.journal_path)
+                    continue
+                latest[entry['path']] = None if entry.get('deleted') else entry['data']
+        for key, data in latest.items():
+            if data is not None:
+                self.writer.write_bytes(key, self.encode(data))
+        with open(self.journal_path, 'wb'):
+            pass
+        return len(latest)
+
+    def close(self):
+        """Überträgt alle ausstehenden Stände und schließt das Journal."""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,183 @@
+"""
+In-Prozess-Cache für geparste JSON-Dokumente.
+
+Einträge werden über den Dateipfad adressiert und bei jedem Zugriff gegen
+(st_mtime_ns, st_size, st_ino) der Datei validiert. Die Inode erkennt auch
+eine per os.replace ersetzte Datei mit gleicher Größe und gleichem
+Zeitstempel (grobe mtime-Auflösung mancher Dateisysteme). Ein Treffer kostet damit nur
+einen `os.stat`-Aufruf statt eines vollständigen `json.loads`.
+
+Gecachte Dokumente werden als schreibgeschützte Ansichten (FrozenDict /
+FrozenList) herausgegeben, damit Aufrufer den Cache-Zustand nicht
+versehentlich verändern können. Wer ändern möchte, holt sich mit `thaw()`
+eine veränderbare Kopie (Copy-on-Write).
+"""
+import os
+import threading
+from collections import OrderedDict
+
+
+class FrozenDict(dict):
+    """Schreibgeschütztes dict. Bleibt eine dict-Unterklasse, damit jsonify & Co. es direkt serialisieren können."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Gecachtes JSON-Dokument ist schreibgeschützt. Verwenden Sie thaw() für eine veränderbare Kopie.")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+
+class FrozenList(list):
+    """Schreibgeschützte Liste, Gegenstück zu FrozenDict."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Gecachtes JSON-Dokument ist schreibgeschützt. Verwenden Sie thaw() für eine veränderbare Kopie.")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+
+def freeze(data):
+    """Wandelt eine geparste JSON-Struktur rekursiv in schreibgeschützte Container um."""
+    if isinstance(data, FrozenDict) or isinstance(data, FrozenList):
+        return data
+    if isinstance(data, dict):
+        return FrozenDict((key, freeze(value)) for key, value in data.items())
+    if isinstance(data, list):
+        return FrozenList(freeze(item) for item in data)
+    return data
+
+
+def thaw(data):
+    """Erstellt eine veränderbare Tiefenkopie aus einer (ggf. eingefrorenen) JSON-Struktur."""
+    if isinstance(data, dict):
+        return {key: thaw(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [thaw(item) for item in data]
+    return data
+
+
+def file_signature(filepath):
+    """Gibt (st_mtime_ns, st_size, st_ino) einer Datei zurück. Wirft FileNotFoundError, wenn sie fehlt."""
+    st = os.stat(filepath)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class JsonDocumentCache:
+    """
+    Begrenzter LRU-Cache für JSON-Dokumente.
+
+    Der Speicherbedarf eines Eintrags wird über die Dateigröße mal
+    `size_factor` geschätzt (geparste Python-Objekte sind deutlich größer als
+    ihr JSON-Text). Überschreitet die Summe `max_bytes`, werden die am
+    längsten nicht benutzten Einträge verdrängt.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, size_factor=6):
+        self.max_bytes = max_bytes
+        self.size_factor = size_factor
+        self._entries = OrderedDict()  # Pfad -> (Signatur, Wert, Kosten)
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, max_bytes=None, size_factor=None):
+        """Passt das Speicherbudget zur Laufzeit an und verdrängt bei Bedarf."""
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if size_factor is not None:
+                self.size_factor = size_factor
+            self._evict_locked(0)
+
+    def load(self, filepath, parse):
+        """
+        Liefert das eingefrorene Dokument für `filepath`.
+        `parse(filepath)` wird nur bei einem Cache-Miss aufgerufen. Fehler aus
+        `os.stat` oder `parse` werden an den Aufrufer durchgereicht.
+        """
+        key = os.path.abspath(filepath)
+        try:
+            signature = file_signature(key)
+        except FileNotFoundError:
+            self.invalidate(key)
+            raise
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = freeze(parse(key))
+        self._store(key, signature, value)
+        return value
+
+    def store(self, filepath, data):
+        """Legt ein soeben geschriebenes Dokument direkt im Cache ab (Write-Through)."""
+        key = os.path.abspath(filepath)
+        try:
+            signature = file_signature(key)
+        except FileNotFoundError:
+            self.invalidate(key)
+            return
+        self._store(key, signature, freeze(data))
+
+    def invalidate(self, filepath):
+        """Entfernt einen Eintrag, z. B. nachdem die Datei gelöscht wurde."""
+        key = os.path.abspath(filepath)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._current_bytes -= entry[2]
+
+    def clear(self):
+        """Leert den Cache vollständig (Zähler bleiben erhalten)."""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self):
+        """Gibt die Cache-Zähler und den aktuellen Speicherverbrauch zurück."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "estimated_bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _store(self, key, signature, value):
+        cost = signature[1] * self.size_factor
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._current_bytes -= old[2]
+            # Dokumente, die allein das Budget sprengen, werden gar nicht erst gecacht.
+            if cost > self.max_bytes:
+                return
+            self._evict_locked(cost)
+            self._entries[key] = (signature, value, cost)
+            self._current_bytes += cost
+
+    def _evict_locked(self, incoming_cost):
+        while self._entries and self._current_bytes + incoming_cost > self.max_bytes:
+            _, (_, _, cost) = self._entries.popitem(last=False)
+            self._current_bytes -= cost
+            self.evictions += 1
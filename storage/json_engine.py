@@ -0,0 +1,176 @@
+"""
+Speicher-Engine auf Basis der bisherigen JSON-Dateien.
+
+    <users_dir>/...                         indizierte Benutzerablage (storage.users)
+    <user_data_dir>/<user_id>/<kind>.json   Profil, Einstellungen, Logs
+    <user_data_dir>/<user_id>/projects/     ein Projekt pro Datei (storage.projects)
+    <settings_file>                         globale Einstellungen
+    <templates_dir>/<template_id>.json      Projektvorlagen
+"""
+import os
+import shutil
+
+from .engine import StorageEngine
+from .json_io import document_version, load_json, save_json
+from .locks import file_lock
+from .projects import ProjectStore, PROJECT_ID_PATTERN
+from .users import UserRepository
+
+
+class JsonCatalogMixin:
+    """
+    Globale Einstellungen und Projektvorlagen als Dateien (`settings_file`,
+    `templates_dir`). Beide Engines lesen sie von hier, damit der Wechsel der
+    Engine nichts daran ändert, was Benutzer sehen.
+    """
+
+    def template_path(self, template_id):
+        return os.path.join(self.templates_dir, f"{template_id}.json")
+
+    # --- Globale Einstellungen ---
+
+    def load_global_settings(self, default=None, mutable=False):
+        return load_json(self.settings_file, {} if default is None else default, mutable=mutable)
+
+    def save_global_settings(self, data):
+        save_json(self.settings_file, data)
+
+    def global_settings_version(self):
+        return document_version(self.settings_file)
+
+    def global_settings_lock(self):
+        return file_lock(self.settings_file + '.lock')
+
+    # --- Projektvorlagen ---
+
+    def list_template_ids(self):
+        if not os.path.isdir(self.templates_dir):
+            return []
+        return sorted(name[:-len('.json')] for name in os.listdir(self.templates_dir) if name.endswith('.json'))
+
+    def template_signatures(self):
+        if not os.path.isdir(self.templates_dir):
+            return {}
+        signatures = {}
+        with os.scandir(self.templates_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file():
+                    # Wie die ETags einzelner Dokumente: mtime, Größe und Inode (storage.json_cache.file_signature)
+                    version = document_version(entry.path)
+                    if version is not None:
+                        signatures[entry.name[:-len('.json')]] = version
+        return signatures
+
+    def load_template(self, template_id):
+        if not PROJECT_ID_PATTERN.match(str(template_id)):
+            return None
+        path = self.template_path(template_id)
+        if not os.path.exists(path):
+            return None
+        return load_json(path, None)
+
+    def save_template(self, template_id, data):
+        if not PROJECT_ID_PATTERN.match(str(template_id)):
+            raise ValueError(f"Ungültige Vorlagen-ID: {template_id!r}")
+        save_json(self.template_path(template_id), data)
+
+
+class JsonFileEngine(JsonCatalogMixin, StorageEngine):
+    """Legt alle Daten als JSON-Dateien im Dateisystem ab."""
+
+    name = 'json'
+
+    def __init__(self, user_data_dir, users_dir, users_file, settings_file, templates_dir):
+        self.user_data_dir = user_data_dir
+        self.settings_file = settings_file
+        self.templates_dir = templates_dir
+        self.users = UserRepository(users_dir, legacy_users_file=users_file)
+        self.projects = ProjectStore(user_data_dir)
+
+    # --- Benutzer ---
+
+    def get_user(self, username):
+        return self.users.get(username)
+
+    def find_user(self, identifier):
+        return self.users.find_by_identifier(identifier)
+
+    def username_exists(self, username):
+        return self.users.username_exists(username)
+
+    def email_exists(self, email):
+        return self.users.email_exists(email)
+
+    def add_user(self, username, record):
+        return self.users.add(username, record)
+
+    def count_users(self):
+        return self.users.count()
+
+    def list_users(self, offset=0, limit=100):
+        return self.users.list_page(offset, limit)
+
+    def iter_users(self):
+        for user in self.users.list_page(0, self.users.count()):
+            yield user['username'], user
+
+    def replace_all_users(self, users):
+        self.users.replace_all(users)
+
+    # --- Benutzerdokumente ---
+
+    def _user_doc_path(self, user_id, kind):
+        return os.path.join(self.user_data_dir, str(user_id), f"{kind}.json")
+
+    def load_user_doc(self, user_id, kind, default=None, mutable=False):
+        return load_json(self._user_doc_path(user_id, kind), default, mutable=mutable)
+
+    def save_user_doc(self, user_id, kind, data):
+        save_json(self._user_doc_path(user_id, kind), data)
+
+    def user_lock(self, user_id):
+        return self.projects.user_lock(user_id)
+
+    def init_user(self, user_id, documents):
+        os.makedirs(os.path.join(self.user_data_dir, str(user_id), 'img'), exist_ok=True)
+        for kind, data in documents.items():
+            self.save_user_doc(user_id, kind, data)
+        self.projects.init_user(user_id)
+
+    def delete_all_user_data(self):
+        if not os.path.exists(self.user_data_dir):
+            return f"[INFO]: Verzeichnis '{self.user_data_dir}' existiert nicht, keine Aktion erforderlich."
+        shutil.rmtree(self.user_data_dir)
+        return f"[SUCCESS]: Verzeichnis '{self.user_data_dir}' und sein gesamter Inhalt wurden gelöscht."
+
+    # --- Projekte ---
+
+    def list_project_ids(self, user_id):
+        return self.projects.list_ids(user_id)
+
+    def count_projects(self, user_id):
+        return self.projects.count(user_id)
+
+    def project_exists(self, user_id, project_id):
+        return self.projects.exists(user_id, project_id)
+
+    def project_version(self, user_id, project_id):
+        return self.projects.version(user_id, project_id)
+
+    def project_updated_at(self, user_id, project_id):
+        return self.projects.updated_at(user_id, project_id)
+
+    def load_project(self, user_id, project_id, mutable=False):
+        return self.projects.load(user_id, project_id, mutable=mutable)
+
+    def load_all_projects(self, user_id):
+        return self.projects.load_all(user_id)
+
+    def load_project_summaries(self, user_id):
+        return self.projects.summaries(user_id)
+
+    def save_project(self, user_id, project_id, data):
+        return self.projects.save(user_id, project_id, data)
+
+    def delete_project(self, user_id, project_id):
+        return self.projects.delete(user_id, project_id)
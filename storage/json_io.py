@@ -0,0 +1,168 @@
+"""
+Lesen und Schreiben der JSON-Dateien der Anwendung.
+
+Alle Lesezugriffe laufen über den gemeinsamen `document_cache`, damit
+unveränderte Dateien nicht bei jedem Request erneut geparst werden.
+Geschrieben wird immer atomar (temporäre Datei + Rename), optional über
+ein Write-Ahead-Journal (siehe `configure_writes`). Kodiert wird mit dem
+über `configure_codec` gewählten Codec (siehe storage.codec).
+"""
+import os
+import sys
+import time
+
+from .atomic import AtomicWriter, FSYNC_ALWAYS
+from .codec import get_codec
+from .journal import WriteJournal
+from .json_cache import JsonDocumentCache, file_signature, thaw
+
+document_cache = JsonDocumentCache()
+atomic_writer = AtomicWriter(FSYNC_ALWAYS)
+write_journal = None
+codec = get_codec('auto')
+pretty_print = False
+
+
+class EmptyJsonFile(ValueError):
+    """Wird intern geworfen, wenn eine Datei existiert, aber leer ist."""
+
+
+def _parse_file(filepath):
+    with open(filepath, 'rb') as f:
+        content = f.read()
+    if not content:
+        raise EmptyJsonFile(filepath)
+    return codec.loads(content)
+
+
+def _encode(data):
+    return codec.dumps(data, pretty=pretty_print)
+
+
+def _encode_line(entry):
+    return codec.dumps(entry)
+
+
+def _decode(content):
+    return codec.loads(content)
+
+
+def configure_codec(name='auto', pretty=False):
+    """
+    Wählt den JSON-Codec ('auto', 'orjson', 'ujson' oder 'json') und das Dateiformat.
+    `pretty=True` schreibt eingerückt wie bisher, sonst kompakt.
+    Bestehende Dateien bleiben in beiden Formaten lesbar.
+    """
+    global codec, pretty_print
+    codec = get_codec(name)
+    pretty_print = pretty
+    return codec
+
+
+def configure_writes(fsync_policy=None, group_commit_interval=None, journal_path=None, journal_flush_delay=0.5):
+    """
+    Legt die Schreibstrategie fest.
+    `fsync_policy`: 'always', 'group' oder 'never' (siehe storage.atomic).
+    `journal_path`: Wenn gesetzt, laufen Speichervorgänge über ein Write-Ahead-Journal,
+    das nach `journal_flush_delay` Sekunden im Hintergrund zusammengefasst geschrieben wird.
+    """
+    global write_journal
+    atomic_writer.configure(fsync_policy, group_commit_interval)
+    if write_journal is not None:
+        write_journal.close()
+        write_journal = None
+    if journal_path:
+        write_journal = WriteJournal(journal_path, atomic_writer, _encode, journal_flush_delay,
+                                     encode_line=_encode_line, decode=_decode)
+
+
+def flush_writes():
+    """Überträgt ausstehende Journal-Einträge sofort (z. B. beim Herunterfahren)."""
+    if write_journal is not None:
+        write_journal.flush()
+
+
+def load_json(filepath, default_data={}, mutable=False):
+    """
+    Lädt JSON-Daten aus einer Datei.
+    Wenn die Datei nicht existiert, leer ist oder fehlerhaftes JSON enthält, wird default_data zurückgegeben.
+
+    Ohne `mutable` wird die schreibgeschützte Cache-Ansicht zurückgegeben.
+    Aufrufer, die das Ergebnis verändern und wieder speichern, übergeben
+    `mutable=True` und erhalten eine eigene Kopie.
+    """
+    found = False
+    if write_journal is not None:
+        found, data = write_journal.pending(filepath)
+    if not found:
+        try:
+            data = document_cache.load(filepath, _parse_file)
+        except FileNotFoundError:
+            print(f"DEBUG: Datei nicht gefunden: {filepath}", file=sys.stderr)
+            data = default_data
+        except EmptyJsonFile:
+            print(f"DEBUG: Datei ist leer: {filepath}", file=sys.stderr)
+            data = default_data
+        except ValueError as e:
+            print(f"FEHLER: Beim Laden von JSON aus {filepath}: {e}", file=sys.stderr)
+            data = default_data
+    return thaw(data) if mutable else data
+
+
+def json_exists(filepath):
+    """Wie os.path.exists, berücksichtigt aber noch nicht übertragene Journal-Einträge."""
+    if write_journal is not None and write_journal.pending(filepath)[0]:
+        return True
+    return os.path.exists(filepath)
+
+
+def document_version(filepath):
+    """
+    Gibt eine Versionskennung des gespeicherten Stands zurück (z. B. für ETags) oder None, wenn die Datei fehlt.
+    Da jeder Speichervorgang per Rename eine neue Inode erzeugt, ändert sich die
+    Kennung auch dann, wenn mtime und Größe zufällig gleich bleiben.
+    """
+    if write_journal is not None:
+        sequence = write_journal.pending_sequence(filepath)
+        if sequence is not None:
+            return f"j{sequence:x}"
+    try:
+        return '-'.join(f"{value:x}" for value in file_signature(filepath))
+    except FileNotFoundError:
+        return None
+
+
+def document_mtime(filepath):
+    """Zeitpunkt der letzten Änderung (Unix-Zeit) oder None. Noch nicht übertragene Journal-Einträge zählen als jetzt."""
+    if write_journal is not None and write_journal.pending_sequence(filepath) is not None:
+        return time.time()
+    try:
+        return os.stat(filepath).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def save_json(filepath, data):
+    """
+    Speichert JSON-Daten atomar in einer Datei.
+    Erstellt bei Bedarf die Verzeichnisse.
+    """
+    if write_journal is not None:
+        write_journal.append(filepath, data)
+        return True
+    atomic_writer.write_bytes(filepath, _encode(data))
+    document_cache.store(filepath, data)
+    return True
+
+
+def remove_json(filepath):
+    """Löscht eine JSON-Datei samt Cache- und Journal-Einträgen. Gibt False zurück, wenn sie nicht existierte."""
+    existed = json_exists(filepath)
+    if write_journal is not None:
+        write_journal.discard(filepath)
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+    document_cache.invalidate(filepath)
+    return existed
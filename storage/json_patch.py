@@ -0,0 +1,182 @@
+"""
+JSON Patch (RFC 6902) für gespeicherte Dokumente.
+
+Neben der Standardform
+
+    [{"op": "replace", "path": "/phases/0/tasks/1/completed", "value": true}]
+
+wird eine kompakte Listenform akzeptiert, die bei vielen kleinen
+Änderungen deutlich weniger Bytes über die Leitung schickt:
+
+    [["replace", "/phases/0/tasks/1/completed", true], ["move", "/phases/1", "/phases/0"]]
+
+Das dritte Element ist bei add/replace/test der Wert, bei move/copy der
+Quellpfad ("from").
+"""
+import copy
+
+OPERATIONS = ('add', 'remove', 'replace', 'move', 'copy', 'test')
+
+
+class JsonPatchError(ValueError):
+    """Ungültiger oder nicht anwendbarer Patch."""
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """Eine 'test'-Operation ist fehlgeschlagen (Dokument hat sich anders entwickelt als erwartet)."""
+
+
+def _json_equal(a, b):
+    """
+    Gleichheit nach RFC 6902 §4.6: Zahlen vergleichen numerisch (1 == 1.0), aber
+    true/false sind keine Zahlen und Werte verschiedener JSON-Typen nie gleich.
+    """
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    if isinstance(a, (int, float)) or isinstance(b, (int, float)):
+        return isinstance(a, (int, float)) and isinstance(b, (int, float)) and a == b
+    if isinstance(a, dict) or isinstance(b, dict):
+        return (isinstance(a, dict) and isinstance(b, dict) and a.keys() == b.keys()
+                and all(_json_equal(value, b[key]) for key, value in a.items()))
+    if isinstance(a, list) or isinstance(b, list):
+        return (isinstance(a, list) and isinstance(b, list) and len(a) == len(b)
+                and all(_json_equal(x, y) for x, y in zip(a, b)))
+    return a == b
+
+
+def normalize_patch(ops):
+    """Wandelt Standard- und Kompaktform in eine Liste von Operations-Dicts um und prüft die Pflichtfelder."""
+    if not isinstance(ops, list):
+        raise JsonPatchError("Ein Patch muss eine Liste von Operationen sein.")
+    normalized = []
+    for index, op in enumerate(ops):
+        if isinstance(op, list):
+            if len(op) < 2:
+                raise JsonPatchError(f"Operation {index}: Kompaktform benötigt mindestens [op, path].")
+            compact = op
+            op = {"op": compact[0], "path": compact[1]}
+            if len(compact) > 2:
+                op["from" if compact[0] in ('move', 'copy') else "value"] = compact[2]
+        if not isinstance(op, dict) or op.get('op') not in OPERATIONS:
+            raise JsonPatchError(f"Operation {index}: unbekannte Operation {op.get('op') if isinstance(op, dict) else op!r}.")
+        if not isinstance(op.get('path'), str):
+            raise JsonPatchError(f"Operation {index}: 'path' fehlt.")
+        if op['op'] in ('add', 'replace', 'test') and 'value' not in op:
+            raise JsonPatchError(f"Operation {index}: 'value' fehlt.")
+        if op['op'] in ('move', 'copy') and not isinstance(op.get('from'), str):
+            raise JsonPatchError(f"Operation {index}: 'from' fehlt.")
+        normalized.append(op)
+    return normalized
+
+
+def _parse_pointer(pointer):
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise JsonPatchError(f"Ungültiger JSON-Pointer: {pointer!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _array_index(container, token, allow_end=False):
+    if allow_end and token == '-':
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        raise JsonPatchError(f"Ungültiger Array-Index: {token!r}")
+    index = int(token)
+    upper = len(container) if allow_end else len(container) - 1
+    if index > upper:
+        raise JsonPatchError(f"Array-Index außerhalb des Bereichs: {index}")
+    return index
+
+
+def _resolve_parent(document, tokens):
+    """Gibt (Elterncontainer, letztes Token) zurück."""
+    node = document
+    for token in tokens[:-1]:
+        if isinstance(node, dict):
+            if token not in node:
+                raise JsonPatchError(f"Pfad existiert nicht: /{'/'.join(tokens)}")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_array_index(node, token)]
+        else:
+            raise JsonPatchError(f"Pfad existiert nicht: /{'/'.join(tokens)}")
+    return node, tokens[-1]
+
+
+def _get(document, tokens):
+    if not tokens:
+        return document
+    parent, token = _resolve_parent(document, tokens)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Pfad existiert nicht: /{'/'.join(tokens)}")
+        return parent[token]
+    if isinstance(parent, list):
+        return parent[_array_index(parent, token)]
+    raise JsonPatchError(f"Pfad existiert nicht: /{'/'.join(tokens)}")
+
+
+def _add(document, tokens, value):
+    if not tokens:
+        return value
+    parent, token = _resolve_parent(document, tokens)
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_array_index(parent, token, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Ziel ist kein Container: /{'/'.join(tokens)}")
+    return document
+
+
+def _remove(document, tokens):
+    if not tokens:
+        raise JsonPatchError("Das Wurzeldokument kann nicht entfernt werden.")
+    parent, token = _resolve_parent(document, tokens)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Pfad existiert nicht: /{'/'.join(tokens)}")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_array_index(parent, token))
+    raise JsonPatchError(f"Pfad existiert nicht: /{'/'.join(tokens)}")
+
+
+def apply_patch(document, ops):
+    """
+    Wendet einen Patch an und gibt das neue Dokument zurück.
+    `document` wird direkt verändert; Aufrufer übergeben daher eine eigene Kopie
+    (z. B. `load_json(..., mutable=True)`). Schlägt eine Operation fehl, wird
+    JsonPatchError geworfen und das Ergebnis darf nicht gespeichert werden.
+    """
+    for op in normalize_patch(ops):
+        tokens = _parse_pointer(op['path'])
+        name = op['op']
+        if name == 'add':
+            document = _add(document, tokens, copy.deepcopy(op['value']))
+        elif name == 'remove':
+            _remove(document, tokens)
+        elif name == 'replace':
+            _get(document, tokens)
+            if not tokens:
+                document = copy.deepcopy(op['value'])
+            else:
+                parent, token = _resolve_parent(document, tokens)
+                if isinstance(parent, list):
+                    parent[_array_index(parent, token)] = copy.deepcopy(op['value'])
+                else:
+                    parent[token] = copy.deepcopy(op['value'])
+        elif name == 'move':
+            from_tokens = _parse_pointer(op['from'])
+            if tokens[:len(from_tokens)] == from_tokens and len(tokens) > len(from_tokens):
+                raise JsonPatchError("Ein Wert kann nicht in sein eigenes Kind verschoben werden.")
+            value = _remove(document, from_tokens)
+            document = _add(document, tokens, value)
+        elif name == 'copy':
+            value = copy.deepcopy(_get(document, _parse_pointer(op['from'])))
+            document = _add(document, tokens, value)
+        elif name == 'test':
+            if not _json_equal(_get(document, tokens), op['value']):
+                raise JsonPatchTestFailed(f"Test fehlgeschlagen für {op['path']}.")
+    return document
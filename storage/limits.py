@@ -0,0 +1,101 @@
+"""
+Struktur- und Größenlimits für Projekte (Gäste, Tarife registrierter Benutzer).
+
+Ein Projekt-Body wird in drei Stufen geprüft, jede bricht beim ersten Verstoß ab:
+
+1. Größe: Content-Length bzw. die gelesenen Bytes gegen `max_project_bytes`,
+   bevor überhaupt geparst wird.
+2. Beim Parsen: Der `object_pairs_hook` prüft jedes JSON-Objekt, sobald es fertig
+   gelesen ist (Unteraufgaben-Listen vor ihren Aufgaben, Aufgaben vor ihren Phasen).
+   Ein Verstoß beendet das Parsen, der Rest des Bodys wird nicht mehr aufgebaut.
+3. Bereits vorhandene Projekte (aus Vorlagen oder nach einem Patch) in einem
+   Durchlauf über den Baum mit derselben Prüfung (`check_project`).
+
+Limits kommen aus den globalen Einstellungen, z. B.
+
+    "guest_limits": {"projects": 3, "phases_per_project": 5, "tasks_per_phase": 10,
+                     "subtasks_per_task": 10, "max_project_bytes": 262144}
+    "plan_limits": {"basic": {"phases_per_project": 20, "max_project_bytes": 1048576}}
+"""
+import json
+
+# Standardwerte der Gast-Limits, falls die globalen Einstellungen sie nicht festlegen
+DEFAULT_GUEST_LIMITS = {
+    'phases_per_project': 5,
+    'tasks_per_phase': 10,
+    'subtasks_per_task': 10,
+    'max_project_bytes': 256 * 1024,
+}
+
+
+class LimitExceeded(ValueError):
+    """Ein Projekt überschreitet ein Limit. `status` ist der passende HTTP-Status (403 oder 413)."""
+
+    def __init__(self, message, status=403):
+        super().__init__(message)
+        self.status = status
+
+
+class ProjectLimits:
+    """Obergrenzen für Aufbau und Größe eines Projekts; None bedeutet unbegrenzt."""
+
+    def __init__(self, phases_per_project=None, tasks_per_phase=None, subtasks_per_task=None,
+                 max_project_bytes=None, subject="Als Gast"):
+        self.phases_per_project = phases_per_project
+        self.tasks_per_phase = tasks_per_phase
+        self.subtasks_per_task = subtasks_per_task
+        self.max_project_bytes = max_project_bytes
+        # Beginn der Fehlermeldungen, z. B. "Als Gast" oder "In Ihrem Tarif"
+        self.subject = subject
+
+    @classmethod
+    def from_settings(cls, limits, defaults=None, subject="Als Gast"):
+        """Erzeugt Limits aus einem Eintrag der globalen Einstellungen (guest_limits, plan_limits[...])."""
+        values = dict(defaults or {})
+        values.update(limits or {})
+        return cls(values.get('phases_per_project'), values.get('tasks_per_phase'),
+                   values.get('subtasks_per_task'), values.get('max_project_bytes'), subject)
+
+    def _exceeded(self, maximum, what):
+        return LimitExceeded(f"{self.subject} können Sie maximal {maximum} {what} erstellen.")
+
+    def check_size(self, size):
+        """Prüft eine Body-Größe in Bytes (z. B. Content-Length), bevor er gelesen wird."""
+        if self.max_project_bytes is not None and size is not None and size > self.max_project_bytes:
+            raise LimitExceeded(f"{self.subject} darf ein Projekt höchstens {self.max_project_bytes // 1024} KB groß sein.", 413)
+
+    def check_object(self, item):
+        """Prüft ein einzelnes JSON-Objekt auf zu lange phases-, tasks- oder subtasks-Listen."""
+        subtasks = item.get('subtasks')
+        if self.subtasks_per_task is not None and isinstance(subtasks, list) and len(subtasks) > self.subtasks_per_task:
+            raise self._exceeded(self.subtasks_per_task, "Unteraufgaben pro Aufgabe")
+        tasks = item.get('tasks')
+        if self.tasks_per_phase is not None and isinstance(tasks, list) and len(tasks) > self.tasks_per_phase:
+            raise self._exceeded(self.tasks_per_phase, "Aufgaben pro Phase")
+        phases = item.get('phases')
+        if self.phases_per_project is not None and isinstance(phases, list) and len(phases) > self.phases_per_project:
+            raise self._exceeded(self.phases_per_project, "Phasen pro Projekt")
+
+    def _pairs_hook(self, pairs):
+        item = dict(pairs)
+        self.check_object(item)
+        return item
+
+    def loads(self, data):
+        """
+        Parst einen Projekt-Body (bytes oder str) und bricht beim ersten Verstoß ab.
+        Wirft LimitExceeded oder ValueError bei ungültigem JSON.
+        """
+        self.check_size(len(data))
+        return json.loads(data, object_pairs_hook=self._pairs_hook)
+
+    def check_project(self, project):
+        """Prüft ein bereits geparstes Projekt in einem Durchlauf; wirft LimitExceeded beim ersten Verstoß."""
+        self.check_object(project)
+        for phase in project.get('phases') or []:
+            if not isinstance(phase, dict):
+                continue
+            self.check_object(phase)
+            for task in phase.get('tasks') or []:
+                if isinstance(task, dict):
+                    self.check_object(task)
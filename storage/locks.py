@@ -0,0 +1,73 @@
+"""
+Sperren für Read-Modify-Write-Vorgänge über Threads und Prozesse hinweg.
+
+`file_lock(pfad)` nimmt zuerst eine prozessinterne Thread-Sperre und dann
+eine exklusive `fcntl.flock`-Sperre auf die Sperrdatei. Damit können
+mehrere Gunicorn-/Waitress-Worker gefahrlos auf dieselben Benutzerdaten
+schreiben. Auf Systemen ohne fcntl (Windows) greift nur die Thread-Sperre,
+d. h. dort ist nur der Betrieb mit einem einzelnen Prozess sicher.
+
+Die Sperren sind pro Thread reentrant: Wer eine Sperre hält, kann sie
+erneut betreten, ohne sich selbst zu blockieren.
+"""
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+LOCK_FILE_NAME = '.lock'
+
+_registry_lock = threading.Lock()
+_thread_locks = weakref.WeakValueDictionary()
+_held = threading.local()
+
+
+def _thread_lock_for(key):
+    with _registry_lock:
+        lock = _thread_locks.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _thread_locks[key] = lock
+        return lock
+
+
+@contextmanager
+def file_lock(lock_path):
+    """Exklusive, reentrante Sperre auf `lock_path` (die Datei wird bei Bedarf angelegt)."""
+    key = os.path.abspath(lock_path)
+    held = getattr(_held, 'counts', None)
+    if held is None:
+        held = _held.counts = {}
+    if held.get(key):
+        held[key] += 1
+        try:
+            yield
+        finally:
+            held[key] -= 1
+        return
+
+    thread_lock = _thread_lock_for(key)
+    with thread_lock:
+        fd = None
+        if fcntl is not None:
+            os.makedirs(os.path.dirname(key), exist_ok=True)
+            fd = os.open(key, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        held[key] = 1
+        try:
+            yield
+        finally:
+            del held[key]
+            if fd is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+
+def directory_lock(directory):
+    """Sperre für alle Schreibvorgänge innerhalb eines Verzeichnisses (z. B. eines Benutzers)."""
+    return file_lock(os.path.join(directory, LOCK_FILE_NAME))
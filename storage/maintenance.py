@@ -0,0 +1,289 @@
+"""
+Wartung der Benutzerdaten: verwaiste Verzeichnisse, abgelaufene Gäste, Logs.
+
+    python -m storage.maintenance                 # Standardpfade und -engine aus app.py
+    python -m storage.maintenance --dry-run       # nur berichten, nichts löschen
+    python -m storage.maintenance --rate 20       # höchstens 20 Dateioperationen pro Sekunde
+    python -m storage.maintenance --delete-orphans  # verwaiste Verzeichnisse löschen statt verschieben
+
+Ein Lauf (`run_maintenance`)
+
+1. verschiebt Verzeichnisse unter user_data, deren Name keine Benutzer-ID ist
+   (gelöschte Benutzer, `guest_*`-Reste aus der Zeit vor storage.guest_store),
+   in das Quarantäne-Verzeichnis `quarantine_dir`, sofern sie seit mindestens
+   `orphan_min_age` Sekunden unverändert sind. Gelöscht werden sie nur mit
+   `delete_orphans`. Ist der Benutzerbestand leer oder nicht vollständig lesbar
+   (z. B. beschädigter Index), wird dieser Schritt übersprungen: Sonst sähen
+   alle Verzeichnisse verwaist aus.
+2. entfernt abgelaufene Gast-Arbeitsbereiche im Speicher (nur im App-Prozess),
+3. kürzt das Log-Dokument jedes Benutzers auf die neuesten `log_max_entries`
+   Einträge; ältere landen gzip-komprimiert in <user_data>/<id>/log_archive/,
+   davon bleiben die neuesten `log_archives_kept` Dateien erhalten,
+
+und berichtet den freigegebenen Platz. Alle Dateioperationen laufen über eine
+Drossel (`io_rate` Operationen pro Sekunde), damit die Wartung nicht mit den
+Anfragen um die Platte konkurriert.
+
+In der App startet `MaintenanceScheduler` einen Hintergrund-Thread, der alle
+`interval` Sekunden einen Lauf versucht. Eine Stempeldatei unter Dateisperre
+sorgt dafür, dass bei mehreren Worker-Prozessen nur einer pro Intervall arbeitet.
+"""
+import os
+import sys
+import gzip
+import time
+import shutil
+import argparse
+import threading
+
+from . import json_io
+from .locks import file_lock
+
+LOG_ARCHIVE_DIR = 'log_archive'
+# Zielverzeichnis für verwaiste Benutzerverzeichnisse, neben user_data
+ORPHAN_QUARANTINE_DIR = 'user_data_orphans'
+
+
+class Throttle:
+    """Begrenzt Operationen auf `rate` pro Sekunde (0 oder None: unbegrenzt)."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if now < self._next:
+            time.sleep(self._next - now)
+            now = self._next
+        self._next = now + self.interval
+
+
+class MaintenanceReport:
+    """Ergebnis eines Wartungslaufs."""
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.orphan_dirs = 0
+        self.orphan_target = None  # Quarantäne-Verzeichnis oder None (gelöscht)
+        self.guests_expired = 0
+        self.logs_compacted = 0
+        self.log_entries_archived = 0
+        self.archives_removed = 0
+        self.bytes_reclaimed = 0
+        self.errors = []
+        self.duration = 0.0
+
+    def lines(self):
+        prefix = "[DRY-RUN] " if self.dry_run else ""
+        orphan_action = f" (verschoben nach {self.orphan_target})" if self.orphan_target else " (gelöscht)"
+        lines = [
+            f"{prefix}Verwaiste Benutzerverzeichnisse: {self.orphan_dirs}" + (orphan_action if self.orphan_dirs else ""),
+            f"{prefix}Abgelaufene Gast-Arbeitsbereiche: {self.guests_expired}",
+            f"{prefix}Gekürzte Logs: {self.logs_compacted} ({self.log_entries_archived} Einträge archiviert, "
+            f"{self.archives_removed} alte Archive gelöscht)",
+            f"{prefix}Freigegeben: {self.bytes_reclaimed / 1024:.1f} KB in {self.duration:.1f} s",
+        ]
+        lines.extend(f"[FEHLER]: {error}" for error in self.errors)
+        return lines
+
+
+def _tree_size(path):
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _user_ids(engine):
+    return {str(record.get('id')) for username, record in engine.iter_users() if record.get('id')}
+
+
+def _verified_user_ids(engine):
+    """IDs aller Benutzer oder None, wenn der Benutzerbestand leer oder nicht vollständig lesbar ist."""
+    try:
+        user_ids = _user_ids(engine)
+        expected = engine.count_users()
+    except Exception:
+        return None
+    # Fehlt auch nur ein Datensatz (beschädigte Datei, Eintrag ohne ID), ist die Menge unvollständig
+    if not user_ids or len(user_ids) != expected:
+        return None
+    return user_ids
+
+
+def remove_orphan_user_dirs(engine, user_data_dir, report, throttle, min_age=3600, quarantine_dir=None,
+                            delete=False):
+    """
+    Verschiebt Verzeichnisse unter `user_data_dir`, die zu keinem Benutzer gehören, nach
+    `quarantine_dir` (Standard: ORPHAN_QUARANTINE_DIR neben user_data) oder löscht sie mit `delete`.
+    """
+    if not os.path.isdir(user_data_dir):
+        return
+    with os.scandir(user_data_dir) as entries:
+        directories = [entry for entry in entries if entry.is_dir()]
+    if not directories:
+        return
+    user_ids = _verified_user_ids(engine)
+    if user_ids is None:
+        report.errors.append("Verwaiste Verzeichnisse übersprungen: Der Benutzerbestand ist leer "
+                             "oder nicht vollständig lesbar.")
+        return
+    if not delete:
+        quarantine_dir = quarantine_dir or os.path.join(os.path.dirname(os.path.abspath(user_data_dir)),
+                                                        ORPHAN_QUARANTINE_DIR)
+        report.orphan_target = quarantine_dir
+    deadline = time.time() - min_age
+    for entry in directories:
+        if entry.name in user_ids:
+            continue
+        throttle.wait()
+        try:
+            if entry.stat().st_mtime > deadline:
+                continue  # evtl. gerade erst angelegt (Registrierung läuft noch)
+            if delete:
+                size = _tree_size(entry.path)
+                if not report.dry_run:
+                    shutil.rmtree(entry.path)
+                report.bytes_reclaimed += size
+            elif not report.dry_run:
+                os.makedirs(quarantine_dir, exist_ok=True)
+                shutil.move(entry.path, os.path.join(quarantine_dir, f"{entry.name}-{time.strftime('%Y%m%d-%H%M%S')}"))
+        except OSError as e:
+            report.errors.append(f"{entry.path}: {e}")
+            continue
+        report.orphan_dirs += 1
+
+
+def _rotate_archives(archive_dir, keep, report, throttle):
+    names = sorted(name for name in os.listdir(archive_dir) if name.endswith('.json.gz'))
+    for name in names[:-keep] if keep else names:
+        throttle.wait()
+        path = os.path.join(archive_dir, name)
+        report.bytes_reclaimed += os.path.getsize(path)
+        if not report.dry_run:
+            os.remove(path)
+        report.archives_removed += 1
+
+
+def compact_logs(engine, user_data_dir, report, throttle, max_entries=500, archives_kept=5):
+    """Kürzt die Logs aller Benutzer und archiviert ältere Einträge gzip-komprimiert."""
+    for user_id in sorted(_user_ids(engine)):
+        throttle.wait()
+        try:
+            with engine.user_lock(user_id):
+                logs = engine.load_user_doc(user_id, 'logs', [])
+                if isinstance(logs, list) and len(logs) <= max_entries:
+                    continue
+                entries = list(logs) if isinstance(logs, list) else []
+                archived, kept = entries[:len(entries) - max_entries], entries[len(entries) - max_entries:]
+                before = len(json_io.codec.dumps(logs))
+                archive = gzip.compress(json_io.codec.dumps(archived), mtime=0)
+                report.bytes_reclaimed += max(before - len(json_io.codec.dumps(kept)) - len(archive), 0)
+                if not report.dry_run:
+                    archive_dir = os.path.join(user_data_dir, str(user_id), LOG_ARCHIVE_DIR)
+                    os.makedirs(archive_dir, exist_ok=True)
+                    stamp, number = time.strftime('%Y%m%d-%H%M%S'), 0
+                    while os.path.exists(os.path.join(archive_dir, f"logs-{stamp}-{number}.json.gz")):
+                        number += 1
+                    with open(os.path.join(archive_dir, f"logs-{stamp}-{number}.json.gz"), 'wb') as f:
+                        f.write(archive)
+                    engine.save_user_doc(user_id, 'logs', kept)
+            report.logs_compacted += 1
+            report.log_entries_archived += len(archived)
+            archive_dir = os.path.join(user_data_dir, str(user_id), LOG_ARCHIVE_DIR)
+            if os.path.isdir(archive_dir):
+                _rotate_archives(archive_dir, archives_kept, report, throttle)
+        except OSError as e:
+            report.errors.append(f"Logs von {user_id}: {e}")
+
+
+def run_maintenance(engine, user_data_dir, dry_run=False, io_rate=50, orphan_min_age=3600,
+                    log_max_entries=500, log_archives_kept=5, quarantine_dir=None, delete_orphans=False):
+    """Führt einen vollständigen Wartungslauf aus und gibt den MaintenanceReport zurück."""
+    started = time.monotonic()
+    report = MaintenanceReport(dry_run)
+    throttle = Throttle(io_rate)
+    remove_orphan_user_dirs(engine, user_data_dir, report, throttle, orphan_min_age, quarantine_dir, delete_orphans)
+    guests = getattr(engine, 'guests', None)
+    if guests is not None and not dry_run:
+        report.guests_expired = guests.reap()
+    compact_logs(engine, user_data_dir, report, throttle, log_max_entries, log_archives_kept)
+    report.duration = time.monotonic() - started
+    return report
+
+
+class MaintenanceScheduler:
+    """Hintergrund-Thread, der alle `interval` Sekunden `run()` aufruft (höchstens ein Lauf je Intervall über alle Prozesse)."""
+
+    def __init__(self, run, interval, stamp_file):
+        self.run = run
+        self.interval = interval
+        self.stamp_file = stamp_file
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None and self.interval:
+            self._thread = threading.Thread(target=self._loop, name='maintenance', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.run_if_due()
+
+    def run_if_due(self):
+        """Führt einen Lauf aus, wenn seit dem letzten (auch aus einem anderen Prozess) `interval` Sekunden vergangen sind."""
+        with file_lock(self.stamp_file + '.lock'):
+            try:
+                if time.time() - os.path.getmtime(self.stamp_file) < self.interval:
+                    return None
+            except OSError:
+                pass
+            with open(self.stamp_file, 'w', encoding='utf-8') as f:
+                f.write(time.strftime('%Y-%m-%d %H:%M:%S'))
+        try:
+            report = self.run()
+        except Exception as e:  # Der Thread darf nicht sterben
+            print(f"WARNUNG: Wartungslauf fehlgeschlagen: {e}", file=sys.stderr)
+            return None
+        for line in report.lines():
+            print(f"[Wartung] {line}", file=sys.stderr)
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benutzerdaten aufräumen (verwaiste Verzeichnisse, Logs).")
+    parser.add_argument('--dry-run', action='store_true', help="nur berichten, nichts löschen")
+    parser.add_argument('--rate', type=float, default=None, help="Dateioperationen pro Sekunde (0: unbegrenzt)")
+    parser.add_argument('--delete-orphans', action='store_true',
+                        help="verwaiste Benutzerverzeichnisse löschen statt in die Quarantäne zu verschieben")
+    args = parser.parse_args(argv)
+
+    import app
+    engine = app.create_storage_engine()
+    try:
+        report = run_maintenance(
+            engine, app.USER_DATA_DIR, dry_run=args.dry_run,
+            io_rate=app.MAINTENANCE_IO_RATE if args.rate is None else args.rate,
+            orphan_min_age=app.ORPHAN_DIR_MIN_AGE, log_max_entries=app.LOG_MAX_ENTRIES,
+            log_archives_kept=app.LOG_ARCHIVES_KEPT, quarantine_dir=app.ORPHAN_QUARANTINE_DIR,
+            delete_orphans=args.delete_orphans or app.DELETE_ORPHAN_DIRS)
+    finally:
+        engine.close()
+    for line in report.lines():
+        print(line)
+    return 1 if report.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
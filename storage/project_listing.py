@@ -0,0 +1,127 @@
+"""
+Projektliste mit Kurzfassungen, Feldauswahl, Sortierung und Cursor-Paginierung.
+
+Statt aller Projekte mit sämtlichen Phasen, Aufgaben und Unteraufgaben liefert
+die Liste pro Projekt nur ausgewählte Felder der Kurzfassung aus dem
+Kurzfassungs-Index der Engine (siehe storage.summaries).
+
+Der Cursor ist ein undurchsichtiger String (URL-sicheres Base64), der Sortierung
+und das zuletzt gelieferte Element enthält. Die nächste Seite beginnt direkt
+dahinter, auch wenn zwischendurch Projekte hinzukommen oder gelöscht werden.
+"""
+import json
+import base64
+import binascii
+
+from .summaries import SUMMARY_FIELDS
+
+LIST_FIELDS = SUMMARY_FIELDS
+DEFAULT_LIST_FIELDS = ('id', 'name', 'progress', 'updatedAt')
+# 'position' entspricht der Erstellungsreihenfolge
+SORT_KEYS = ('position', 'name', 'updated', 'progress')
+
+
+class ListingError(ValueError):
+    """Ungültige Parameter für die Projektliste (Feld, Sortierung oder Cursor)."""
+
+
+def parse_fields(value):
+    """Wandelt 'id,name,progress' in ein Feld-Tupel um. Leer bedeutet Standardfelder."""
+    if not value:
+        return DEFAULT_LIST_FIELDS
+    fields = tuple(field.strip() for field in value.split(',') if field.strip())
+    unknown = [field for field in fields if field not in LIST_FIELDS]
+    if unknown:
+        raise ListingError(f"Unbekannte Felder: {', '.join(unknown)} (erlaubt: {', '.join(LIST_FIELDS)})")
+    return fields
+
+
+def project_fields(summary, fields):
+    return {field: summary[field] for field in fields}
+
+
+def _sort_value(summary, sort):
+    if sort == 'name':
+        return summary['name'].casefold()
+    if sort == 'updated':
+        return summary['updatedAt'] or 0
+    return summary['progress']
+
+
+def encode_cursor(sort, descending, summary, position=None):
+    """Cursor, der direkt hinter `summary` weiterliest."""
+    state = {'s': sort, 'd': descending, 'id': summary['id']}
+    if sort == 'position':
+        state['i'] = position
+    else:
+        state['k'] = _sort_value(summary, sort)
+    raw = json.dumps(state, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort, descending):
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        state = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise ListingError("Ungültiger Cursor.")
+    if not isinstance(state, dict) or state.get('s') != sort or state.get('d') != descending or 'id' not in state:
+        raise ListingError("Der Cursor passt nicht zur angeforderten Sortierung.")
+    # Die Werte werden mit den Sortierschlüsseln verglichen; falsche Typen würden dort TypeError werfen
+    if sort == 'position':
+        key_ok = state.get('i') is None or _is_number(state['i'], integer=True)
+    elif sort == 'name':
+        key_ok = isinstance(state.get('k'), str)
+    else:
+        key_ok = _is_number(state.get('k'))
+    if not isinstance(state['id'], str) or not key_ok:
+        raise ListingError("Ungültiger Cursor.")
+    return state
+
+
+def _is_number(value, integer=False):
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) if integer else isinstance(value, (int, float))
+
+
+def iter_project_summaries(engine, user_id, sort='position', descending=False, cursor=None, limit=50):
+    """
+    Liefert bis zu `limit + 1` Paare (Kurzfassung, Position) ab dem Cursor.
+    Das zusätzliche Element zeigt dem Aufrufer nur an, dass es eine weitere Seite gibt.
+    Gelesen wird nur der Kurzfassungs-Index, nie die Projekte selbst.
+    """
+    if sort not in SORT_KEYS:
+        raise ListingError(f"Unbekannte Sortierung: {sort!r} (erlaubt: {', '.join(SORT_KEYS)})")
+    state = decode_cursor(cursor, sort, descending)
+    summaries = list(engine.load_project_summaries(user_id))
+    if descending:
+        summaries.reverse()
+
+    if sort == 'position':
+        start = 0
+        if state is not None:
+            ids = [summary['id'] for summary in summaries]
+            try:
+                start = ids.index(state['id']) + 1
+            except ValueError:
+                # Das letzte Projekt der Vorseite wurde gelöscht: an seiner alten Position weitermachen
+                start = int(state.get('i') or 0)
+        candidates = ((summary, position) for position, summary in enumerate(summaries[start:], start))
+    else:
+        ordered = sorted(((summary, position) for position, summary in enumerate(summaries)),
+                         key=lambda entry: (_sort_value(entry[0], sort), entry[0]['id']), reverse=descending)
+        if state is not None:
+            after = (state.get('k'), state['id'])
+            if descending:
+                ordered = [entry for entry in ordered if (_sort_value(entry[0], sort), entry[0]['id']) < after]
+            else:
+                ordered = [entry for entry in ordered if (_sort_value(entry[0], sort), entry[0]['id']) > after]
+        candidates = iter(ordered)
+
+    for count, entry in enumerate(candidates):
+        if count > limit:
+            break
+        yield entry
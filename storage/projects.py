@@ -0,0 +1,229 @@
+"""
+Projektablage mit einer Datei pro Projekt.
+
+Layout pro Benutzer:
+
+    <user_data_dir>/<user_id>/projects/_manifest.json   {"projects": [projectId, ...]}
+    <user_data_dir>/<user_id>/projects/_summaries.json  {"projects": {projectId: Kurzfassung}}
+    <user_data_dir>/<user_id>/projects/<projectId>.json
+
+Lesen oder Speichern eines einzelnen Projekts kostet damit nur dieses eine
+Projekt. Das Manifest wird nur beim Anlegen und Löschen geschrieben und hält
+die Reihenfolge der Projekte fest. Der Kurzfassungs-Index (storage.summaries)
+wird bei jedem Speichern und Löschen für das betroffene Projekt aktualisiert;
+fehlende Einträge werden beim Lesen nachberechnet.
+
+Bestehende projects.json-Dateien werden beim ersten Zugriff auf den
+Benutzer automatisch aufgeteilt (siehe `migrate_user`) und anschließend in
+projects.json.migrated umbenannt. Für eine Komplettmigration:
+
+    python -m storage.projects [user_data_dir]
+"""
+import os
+import re
+import sys
+import time
+
+from .json_io import document_cache, document_mtime, document_version, json_exists, load_json, remove_json, save_json
+from .locks import directory_lock
+from .summaries import summarize_project
+
+PROJECTS_DIR_NAME = 'projects'
+MANIFEST_FILE_NAME = '_manifest.json'
+SUMMARIES_FILE_NAME = '_summaries.json'
+LEGACY_FILE_NAME = 'projects.json'
+MIGRATED_SUFFIX = '.migrated'
+
+# Projekt-IDs werden als Dateinamen verwendet und müssen daher harmlos sein.
+# Ein führender Unterstrich ist den Verwaltungsdateien (Manifest, Index) vorbehalten.
+PROJECT_ID_PATTERN = re.compile(r'^[A-Za-z0-9-][A-Za-z0-9_-]{0,127}$')
+
+
+def is_valid_project_id(project_id):
+    """Prüft, ob eine Projekt-ID als Dateiname verwendet werden darf."""
+    return bool(project_id) and bool(PROJECT_ID_PATTERN.match(str(project_id)))
+
+
+class ProjectStore:
+    """Liest und schreibt Projekte einzeln statt über eine monolithische projects.json."""
+
+    def __init__(self, user_data_dir):
+        self.user_data_dir = user_data_dir
+
+    # --- Pfade ---
+
+    def user_dir(self, user_id):
+        return os.path.join(self.user_data_dir, str(user_id))
+
+    def projects_dir(self, user_id):
+        return os.path.join(self.user_dir(user_id), PROJECTS_DIR_NAME)
+
+    def manifest_path(self, user_id):
+        return os.path.join(self.projects_dir(user_id), MANIFEST_FILE_NAME)
+
+    def summaries_path(self, user_id):
+        return os.path.join(self.projects_dir(user_id), SUMMARIES_FILE_NAME)
+
+    def project_path(self, user_id, project_id):
+        return os.path.join(self.projects_dir(user_id), f"{project_id}.json")
+
+    def user_lock(self, user_id):
+        """
+        Prozessübergreifende Sperre auf die Projekte eines Benutzers.
+        Aufrufer, die lesen, prüfen und dann schreiben, halten sie über den ganzen Vorgang.
+        """
+        return directory_lock(self.user_dir(user_id))
+
+    # --- Lesen ---
+
+    def list_ids(self, user_id):
+        """Gibt die Projekt-IDs des Benutzers in Erstellungsreihenfolge zurück."""
+        self.migrate_user(user_id)
+        return list(load_json(self.manifest_path(user_id), {"projects": []}).get('projects', []))
+
+    def count(self, user_id):
+        return len(self.list_ids(user_id))
+
+    def exists(self, user_id, project_id):
+        if not is_valid_project_id(project_id):
+            return False
+        self.migrate_user(user_id)
+        return json_exists(self.project_path(user_id, project_id))
+
+    def version(self, user_id, project_id):
+        """Gibt die Versionskennung des gespeicherten Projekts zurück (Grundlage für ETags) oder None."""
+        if not self.exists(user_id, project_id):
+            return None
+        return document_version(self.project_path(user_id, project_id))
+
+    def updated_at(self, user_id, project_id):
+        """Gibt den Zeitpunkt der letzten Speicherung (Unix-Zeit) zurück oder None."""
+        if not self.exists(user_id, project_id):
+            return None
+        return document_mtime(self.project_path(user_id, project_id))
+
+    def load(self, user_id, project_id, mutable=False):
+        """Lädt ein einzelnes Projekt oder gibt None zurück."""
+        if not self.exists(user_id, project_id):
+            return None
+        return load_json(self.project_path(user_id, project_id), None, mutable=mutable)
+
+    def load_all(self, user_id):
+        """Lädt alle Projekte des Benutzers (für die Gesamtliste)."""
+        projects = []
+        for project_id in self.list_ids(user_id):
+            project = load_json(self.project_path(user_id, project_id), None)
+            if project is not None:
+                projects.append(project)
+        return projects
+
+    def summaries(self, user_id):
+        """Gibt die Kurzfassungen aller Projekte in Erstellungsreihenfolge zurück."""
+        project_ids = self.list_ids(user_id)
+        index = load_json(self.summaries_path(user_id), {"projects": {}}).get('projects', {})
+        if any(project_id not in index for project_id in project_ids):
+            index = self._complete_summaries(user_id)
+        return [index[project_id] for project_id in project_ids if project_id in index]
+
+    def _complete_summaries(self, user_id):
+        """Berechnet fehlende Index-Einträge (z. B. nach einer Migration) aus den Projektdateien nach."""
+        with self.user_lock(user_id):
+            summaries = load_json(self.summaries_path(user_id), {"projects": {}}, mutable=True)
+            for project_id in self.list_ids(user_id):
+                if project_id not in summaries['projects']:
+                    project = load_json(self.project_path(user_id, project_id), None)
+                    if project is not None:
+                        summaries['projects'][project_id] = summarize_project(
+                            project_id, project, document_mtime(self.project_path(user_id, project_id)))
+            save_json(self.summaries_path(user_id), summaries)
+        return summaries['projects']
+
+    # --- Schreiben ---
+
+    def init_user(self, user_id):
+        """Legt ein leeres Manifest und einen leeren Index für einen neuen Benutzer an."""
+        save_json(self.summaries_path(user_id), {"projects": {}})
+        save_json(self.manifest_path(user_id), {"projects": []})
+
+    def save(self, user_id, project_id, data):
+        """Speichert ein Projekt. Das Manifest wird nur bei neuen Projekten angefasst."""
+        if not is_valid_project_id(project_id):
+            raise ValueError(f"Ungültige Projekt-ID: {project_id!r}")
+        # Die Kurzfassung vor dem Schreiben bilden: Scheitert sie, bleibt der alte Stand unangetastet
+        summary = summarize_project(project_id, data, time.time())
+        self.migrate_user(user_id)
+        with self.user_lock(user_id):
+            is_new = not json_exists(self.project_path(user_id, project_id))
+            save_json(self.project_path(user_id, project_id), data)
+            summaries = load_json(self.summaries_path(user_id), {"projects": {}}, mutable=True)
+            summaries['projects'][project_id] = summary
+            save_json(self.summaries_path(user_id), summaries)
+            if is_new:
+                manifest = load_json(self.manifest_path(user_id), {"projects": []}, mutable=True)
+                if project_id not in manifest['projects']:
+                    manifest['projects'].append(project_id)
+                    save_json(self.manifest_path(user_id), manifest)
+        return is_new
+
+    def delete(self, user_id, project_id):
+        """Löscht ein Projekt. Gibt False zurück, wenn es nicht existiert."""
+        if not self.exists(user_id, project_id):
+            return False
+        with self.user_lock(user_id):
+            remove_json(self.project_path(user_id, project_id))
+            summaries = load_json(self.summaries_path(user_id), {"projects": {}}, mutable=True)
+            if summaries['projects'].pop(project_id, None) is not None:
+                save_json(self.summaries_path(user_id), summaries)
+            manifest = load_json(self.manifest_path(user_id), {"projects": []}, mutable=True)
+            if project_id in manifest['projects']:
+                manifest['projects'].remove(project_id)
+                save_json(self.manifest_path(user_id), manifest)
+        return True
+
+    # --- Migration ---
+
+    def migrate_user(self, user_id):
+        """
+        Teilt eine alte projects.json in Einzeldateien auf, falls noch kein Manifest existiert.
+        Gibt die Anzahl migrierter Projekte zurück (0, wenn nichts zu tun war).
+        """
+        if json_exists(self.manifest_path(user_id)):
+            return 0
+        with self.user_lock(user_id):
+            if json_exists(self.manifest_path(user_id)):
+                return 0
+            legacy_path = os.path.join(self.user_dir(user_id), LEGACY_FILE_NAME)
+            legacy_projects = load_json(legacy_path, {}) if os.path.exists(legacy_path) else {}
+            project_ids = []
+            summaries = {}
+            now = time.time()
+            for project_id, project in legacy_projects.items():
+                if not is_valid_project_id(project_id):
+                    print(f"WARNUNG: Projekt '{project_id}' von Benutzer {user_id} hat eine ungültige ID und wird übersprungen.", file=sys.stderr)
+                    continue
+                save_json(self.project_path(user_id, project_id), project)
+                project_ids.append(project_id)
+                summaries[project_id] = summarize_project(project_id, project, now)
+            save_json(self.summaries_path(user_id), {"projects": summaries})
+            # Das Manifest zuletzt schreiben: Es markiert die Migration als abgeschlossen.
+            save_json(self.manifest_path(user_id), {"projects": project_ids})
+            if os.path.exists(legacy_path):
+                os.replace(legacy_path, legacy_path + MIGRATED_SUFFIX)
+                document_cache.invalidate(legacy_path)
+            return len(project_ids)
+
+    def migrate_all(self):
+        """Migriert alle Benutzerverzeichnisse. Gibt {user_id: Anzahl} zurück."""
+        results = {}
+        if not os.path.isdir(self.user_data_dir):
+            return results
+        for entry in os.scandir(self.user_data_dir):
+            if entry.is_dir():
+                results[entry.name] = self.migrate_user(entry.name)
+        return results
+
+
+if __name__ == '__main__':
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join('static', 'data', 'user_data')
+    for migrated_user, migrated_count in ProjectStore(target_dir).migrate_all().items():
+        print(f"[INFO]: Benutzer {migrated_user}: {migrated_count} Projekt(e) migriert.")
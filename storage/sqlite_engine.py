@@ -0,0 +1,356 @@
+"""
+Speicher-Engine auf Basis einer eingebetteten SQLite-Datenbank.
+
+Die Datenbank läuft im WAL-Modus, d. h. Leser blockieren Schreiber nicht
+und mehrere Worker-Prozesse können parallel lesen. Verbindungen werden in
+einem kleinen Pool wiederverwendet; da alle SQL-Anweisungen konstante
+Strings mit Platzhaltern sind, greift der Statement-Cache von sqlite3
+(vorbereitete Anweisungen werden pro Verbindung wiederverwendet).
+
+Dokumente (Projekte, Profile, ...) werden als JSON-Text gespeichert, Benutzer
+haben echte Spalten mit Indizes für Benutzername, ID und E-Mail.
+
+Globale Einstellungen und Projektvorlagen liegen wie bei der JSON-Engine in
+den Dateien (siehe JsonCatalogMixin). Datenbanken älterer Versionen, die sie
+in eigenen Tabellen führten, übertragen sie beim Öffnen einmalig dorthin.
+"""
+import os
+import time
+import queue
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+
+from . import json_io
+from .engine import StorageEngine
+from .json_cache import freeze
+from .json_engine import JsonCatalogMixin
+from .locks import file_lock
+from .projects import is_valid_project_id
+from .summaries import summarize_project
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    email TEXT UNIQUE,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_docs (
+    user_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, kind)
+);
+CREATE TABLE IF NOT EXISTS projects (
+    user_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    updated_at REAL NOT NULL DEFAULT 0,
+    summary TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, project_id)
+);
+CREATE INDEX IF NOT EXISTS projects_by_position ON projects (user_id, position);
+-- Datenbankweite, nie zurückgesetzte Zähler (z. B. für Projektversionen)
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+-- Nur noch für die Übernahme aus älteren Datenbanken (siehe _export_catalog)
+CREATE TABLE IF NOT EXISTS global_settings (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS templates (
+    template_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL
+);
+"""
+
+# Spalten, die nach der ersten Version des Schemas hinzugekommen sind: (Tabelle, Spalte, Definition)
+SCHEMA_ADDED_COLUMNS = (
+    ('projects', 'updated_at', 'REAL NOT NULL DEFAULT 0'),
+    ('projects', 'summary', 'TEXT'),
+    ('templates', 'version', 'INTEGER NOT NULL DEFAULT 1'),
+)
+
+SQL_GET_USER = "SELECT record FROM users WHERE username = ?"
+SQL_GET_USER_BY_EMAIL = "SELECT record FROM users WHERE email = ?"
+SQL_USERNAME_EXISTS = "SELECT 1 FROM users WHERE username = ?"
+SQL_EMAIL_EXISTS = "SELECT 1 FROM users WHERE email = ?"
+SQL_INSERT_USER = "INSERT INTO users (username, id, email, record) VALUES (?, ?, ?, ?)"
+SQL_COUNT_USERS = "SELECT COUNT(*) FROM users"
+SQL_LIST_USERS = "SELECT record FROM users ORDER BY username LIMIT ? OFFSET ?"
+SQL_ALL_USERS = "SELECT username, record FROM users ORDER BY username"
+SQL_DELETE_USERS = "DELETE FROM users"
+
+SQL_GET_USER_DOC = "SELECT data FROM user_docs WHERE user_id = ? AND kind = ?"
+SQL_PUT_USER_DOC = "INSERT OR REPLACE INTO user_docs (user_id, kind, data) VALUES (?, ?, ?)"
+SQL_DELETE_USER_DOCS = "DELETE FROM user_docs"
+
+SQL_LIST_PROJECT_IDS = "SELECT project_id FROM projects WHERE user_id = ? ORDER BY position"
+SQL_COUNT_PROJECTS = "SELECT COUNT(*) FROM projects WHERE user_id = ?"
+SQL_PROJECT_VERSION = "SELECT version FROM projects WHERE user_id = ? AND project_id = ?"
+SQL_PROJECT_UPDATED_AT = "SELECT updated_at FROM projects WHERE user_id = ? AND project_id = ?"
+SQL_GET_PROJECT = "SELECT data FROM projects WHERE user_id = ? AND project_id = ?"
+SQL_ALL_PROJECTS = "SELECT data FROM projects WHERE user_id = ? ORDER BY position"
+SQL_PROJECT_SUMMARIES = "SELECT project_id, summary, updated_at FROM projects WHERE user_id = ? ORDER BY position"
+SQL_SET_SUMMARY = "UPDATE projects SET summary = ? WHERE user_id = ? AND project_id = ?"
+SQL_UPDATE_PROJECT = ("UPDATE projects SET data = ?, summary = ?, updated_at = ?, version = ? "
+                      "WHERE user_id = ? AND project_id = ?")
+SQL_INSERT_PROJECT = ("INSERT INTO projects (user_id, project_id, position, version, updated_at, summary, data) "
+                      "VALUES (?, ?, (SELECT COALESCE(MAX(position), 0) + 1 FROM projects WHERE user_id = ?), ?, ?, ?, ?)")
+# Projektversionen stammen aus einem globalen Zähler: Ein gelöschtes und neu angelegtes
+# Projekt erhält so nie wieder die Version (und damit das ETag) eines früheren Stands.
+SQL_SEED_PROJECT_VERSION = ("INSERT OR IGNORE INTO counters (name, value) "
+                            "SELECT 'project_version', COALESCE(MAX(version), 0) FROM projects")
+SQL_BUMP_PROJECT_VERSION = "UPDATE counters SET value = value + 1 WHERE name = 'project_version'"
+SQL_GET_PROJECT_VERSION_COUNTER = "SELECT value FROM counters WHERE name = 'project_version'"
+SQL_DELETE_PROJECT = "DELETE FROM projects WHERE user_id = ? AND project_id = ?"
+SQL_DELETE_PROJECTS = "DELETE FROM projects"
+
+SQL_LEGACY_SETTINGS = "SELECT version, data FROM global_settings WHERE id = 1"
+SQL_LEGACY_TEMPLATES = "SELECT template_id, version, data FROM templates"
+SQL_DELETE_LEGACY_SETTINGS = "DELETE FROM global_settings"
+SQL_DELETE_LEGACY_TEMPLATES = "DELETE FROM templates"
+
+
+def _dumps(data):
+    return json_io.codec.dumps(data).decode('utf-8')
+
+
+def _loads(text, mutable):
+    data = json_io.codec.loads(text)
+    return data if mutable else freeze(data)
+
+
+class SqliteEngine(JsonCatalogMixin, StorageEngine):
+    """Legt Benutzer, Benutzerdokumente und Projekte in einer SQLite-Datenbank ab."""
+
+    name = 'sqlite'
+
+    def __init__(self, database_path, settings_file, templates_dir, pool_size=8, busy_timeout_ms=5000):
+        self.database_path = database_path
+        self.settings_file = settings_file
+        self.templates_dir = templates_dir
+        self.busy_timeout_ms = busy_timeout_ms
+        self.lock_dir = database_path + '.locks'
+        os.makedirs(os.path.dirname(os.path.abspath(database_path)), exist_ok=True)
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            self._add_missing_columns(conn)
+            conn.execute(SQL_SEED_PROJECT_VERSION)
+        self._export_catalog()
+
+    # --- Verbindungspool ---
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database_path, timeout=self.busy_timeout_ms / 1000,
+                               check_same_thread=False, isolation_level=None, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        return conn
+
+    @staticmethod
+    def _add_missing_columns(conn):
+        """Ergänzt Spalten in Datenbanken, die mit einem älteren Schema angelegt wurden."""
+        for table, column, definition in SCHEMA_ADDED_COLUMNS:
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _export_catalog(self):
+        """
+        Überträgt Vorlagen und globale Einstellungen aus den Tabellen älterer Datenbanken
+        in die Dateien und leert die Tabellen. Eine Datei wird nur ersetzt, wenn sie fehlt
+        oder der Eintrag in der Datenbank bearbeitet wurde (version > 1).
+        """
+        with self._transaction() as conn:
+            settings = conn.execute(SQL_LEGACY_SETTINGS).fetchone()
+            templates = conn.execute(SQL_LEGACY_TEMPLATES).fetchall()
+            if settings is not None and (settings[0] > 1 or not os.path.exists(self.settings_file)):
+                json_io.save_json(self.settings_file, json_io.codec.loads(settings[1]))
+            for template_id, version, data in templates:
+                if version > 1 or not os.path.exists(self.template_path(template_id)):
+                    self.save_template(template_id, json_io.codec.loads(data))
+            if settings is not None or templates:
+                conn.execute(SQL_DELETE_LEGACY_SETTINGS)
+                conn.execute(SQL_DELETE_LEGACY_TEMPLATES)
+                json_io.flush_writes()
+
+    @contextmanager
+    def _connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Schreibtransaktion; BEGIN IMMEDIATE sichert die Schreibsperre gleich zu Beginn."""
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _fetch_one(self, sql, params):
+        with self._connection() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def _fetch_all(self, sql, params=()):
+        with self._connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    # --- Benutzer ---
+
+    def get_user(self, username):
+        row = self._fetch_one(SQL_GET_USER, (username,)) if username else None
+        return json_io.codec.loads(row[0]) if row else None
+
+    def find_user(self, identifier):
+        if not identifier:
+            return None
+        row = self._fetch_one(SQL_GET_USER, (identifier,)) or self._fetch_one(SQL_GET_USER_BY_EMAIL, (identifier,))
+        return json_io.codec.loads(row[0]) if row else None
+
+    def username_exists(self, username):
+        return self._fetch_one(SQL_USERNAME_EXISTS, (username,)) is not None
+
+    def email_exists(self, email):
+        return self._fetch_one(SQL_EMAIL_EXISTS, (email,)) is not None
+
+    def add_user(self, username, record):
+        record = dict(record, username=username)
+        try:
+            with self._transaction() as conn:
+                conn.execute(SQL_INSERT_USER, (username, record['id'], record.get('email'), _dumps(record)))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def count_users(self):
+        return self._fetch_one(SQL_COUNT_USERS, ())[0]
+
+    def list_users(self, offset=0, limit=100):
+        return [json_io.codec.loads(row[0]) for row in self._fetch_all(SQL_LIST_USERS, (limit, offset))]
+
+    def iter_users(self):
+        for username, record in self._fetch_all(SQL_ALL_USERS):
+            yield username, json_io.codec.loads(record)
+
+    def replace_all_users(self, users):
+        with self._transaction() as conn:
+            conn.execute(SQL_DELETE_USERS)
+            conn.executemany(SQL_INSERT_USER, [
+                (username, record['id'], record.get('email'), _dumps(dict(record, username=username)))
+                for username, record in users.items()
+            ])
+
+    # --- Benutzerdokumente ---
+
+    def load_user_doc(self, user_id, kind, default=None, mutable=False):
+        row = self._fetch_one(SQL_GET_USER_DOC, (str(user_id), kind))
+        if row is None:
+            return default
+        return _loads(row[0], mutable)
+
+    def save_user_doc(self, user_id, kind, data):
+        with self._transaction() as conn:
+            conn.execute(SQL_PUT_USER_DOC, (str(user_id), kind, _dumps(data)))
+
+    def user_lock(self, user_id):
+        digest = hashlib.sha1(str(user_id).encode('utf-8')).hexdigest()
+        return file_lock(os.path.join(self.lock_dir, digest[:2], f"{digest}.lock"))
+
+    def init_user(self, user_id, documents):
+        with self._transaction() as conn:
+            conn.executemany(SQL_PUT_USER_DOC, [(str(user_id), kind, _dumps(data)) for kind, data in documents.items()])
+
+    def delete_all_user_data(self):
+        with self._transaction() as conn:
+            conn.execute(SQL_DELETE_PROJECTS)
+            conn.execute(SQL_DELETE_USER_DOCS)
+        return f"[SUCCESS]: Alle Projekte und Benutzerdokumente in '{self.database_path}' wurden gelöscht."
+
+    # --- Projekte ---
+
+    def list_project_ids(self, user_id):
+        return [row[0] for row in self._fetch_all(SQL_LIST_PROJECT_IDS, (str(user_id),))]
+
+    def count_projects(self, user_id):
+        return self._fetch_one(SQL_COUNT_PROJECTS, (str(user_id),))[0]
+
+    def project_exists(self, user_id, project_id):
+        return self.project_version(user_id, project_id) is not None
+
+    def project_version(self, user_id, project_id):
+        row = self._fetch_one(SQL_PROJECT_VERSION, (str(user_id), project_id))
+        # Präfix 's' statt des früheren 'v': ETags aus der Zeit der Versionen pro Projekt passen nicht mehr
+        return f"s{row[0]:x}" if row else None
+
+    def project_updated_at(self, user_id, project_id):
+        row = self._fetch_one(SQL_PROJECT_UPDATED_AT, (str(user_id), project_id))
+        return row[0] if row else None
+
+    def load_project(self, user_id, project_id, mutable=False):
+        row = self._fetch_one(SQL_GET_PROJECT, (str(user_id), project_id))
+        return _loads(row[0], mutable) if row else None
+
+    def load_all_projects(self, user_id):
+        return [_loads(row[0], False) for row in self._fetch_all(SQL_ALL_PROJECTS, (str(user_id),))]
+
+    def load_project_summaries(self, user_id):
+        summaries = []
+        for project_id, summary, updated_at in self._fetch_all(SQL_PROJECT_SUMMARIES, (str(user_id),)):
+            if summary is None:
+                # Projekt aus einer Datenbank ohne Kurzfassungs-Spalte: einmalig nachberechnen
+                project = self.load_project(user_id, project_id)
+                if project is None:
+                    continue
+                summary = _dumps(summarize_project(project_id, project, updated_at))
+                with self._transaction() as conn:
+                    conn.execute(SQL_SET_SUMMARY, (summary, str(user_id), project_id))
+            summaries.append(_loads(summary, False))
+        return summaries
+
+    def save_project(self, user_id, project_id, data):
+        if not is_valid_project_id(project_id):
+            raise ValueError(f"Ungültige Projekt-ID: {project_id!r}")
+        payload = _dumps(data)
+        now = time.time()
+        summary = _dumps(summarize_project(project_id, data, now))
+        with self._transaction() as conn:
+            conn.execute(SQL_BUMP_PROJECT_VERSION)
+            version = conn.execute(SQL_GET_PROJECT_VERSION_COUNTER).fetchone()[0]
+            if conn.execute(SQL_UPDATE_PROJECT, (payload, summary, now, version, str(user_id), project_id)).rowcount:
+                return False
+            conn.execute(SQL_INSERT_PROJECT, (str(user_id), project_id, str(user_id), version, now, summary, payload))
+            return True
+
+    def delete_project(self, user_id, project_id):
+        with self._transaction() as conn:
+            return conn.execute(SQL_DELETE_PROJECT, (str(user_id), project_id)).rowcount > 0
@@ -0,0 +1,77 @@
+"""
+Kurzfassungen von Projekten für Listen und Fortschrittsanzeigen.
+
+Die Speicher-Engines legen beim Speichern eines Projekts dessen Kurzfassung
+in einem Index pro Benutzer ab. Listen lesen dann nur noch diese kleinen
+Einträge statt des vollständigen Baums aus Phasen, Aufgaben und Unteraufgaben.
+
+Fortschritt wie auf dem Dashboard: Aufgaben mit Unteraufgaben zählen mit ihren
+Unteraufgaben, Aufgaben ohne Unteraufgaben zählen selbst als ein Element.
+Eine Aufgabe mit Unteraufgaben gilt als erledigt, wenn alle Unteraufgaben
+erledigt sind; eine Phase, wenn alle Aufgaben erledigt sind (wie in der Checkliste).
+"""
+
+SUMMARY_FIELDS = ('id', 'name', 'phaseCount', 'taskCount', 'subtaskCount',
+                  'completedPhases', 'completedTasks', 'completedSubtasks', 'commentCount',
+                  'totalItems', 'completedItems', 'progress', 'updatedAt')
+
+
+def _comment_count(item):
+    comments = item.get('comments')
+    return len(comments) if isinstance(comments, list) else 0
+
+
+def _children(item, key):
+    """Die Unterelemente unter `key`; Einträge, die keine Objekte sind, werden übersprungen (wie in ProjectLimits)."""
+    children = item.get(key)
+    return [child for child in children if isinstance(child, dict)] if isinstance(children, list) else []
+
+
+def summarize_project(project_id, project, updated_at=None):
+    """Berechnet die Kurzfassung eines Projekts in einem Durchlauf über den Baum."""
+    phase_count = task_count = subtask_count = 0
+    completed_phases = completed_tasks = completed_subtasks = 0
+    total = completed = 0
+    comment_count = _comment_count(project)
+    for phase in _children(project, 'phases'):
+        phase_count += 1
+        comment_count += _comment_count(phase)
+        tasks = _children(phase, 'tasks')
+        phase_done = bool(phase.get('completed')) if not tasks else True
+        for task in tasks:
+            task_count += 1
+            comment_count += _comment_count(task)
+            subtasks = _children(task, 'subtasks')
+            if subtasks:
+                done_subtasks = 0
+                for subtask in subtasks:
+                    comment_count += _comment_count(subtask)
+                    if subtask.get('completed'):
+                        done_subtasks += 1
+                subtask_count += len(subtasks)
+                completed_subtasks += done_subtasks
+                total += len(subtasks)
+                completed += done_subtasks
+                task_done = done_subtasks == len(subtasks)
+            else:
+                task_done = bool(task.get('completed'))
+                total += 1
+                completed += task_done
+            completed_tasks += task_done
+            phase_done = phase_done and task_done
+        completed_phases += phase_done
+    return {
+        'id': project_id,
+        'name': project.get('projectName') or project.get('name') or '',
+        'phaseCount': phase_count,
+        'taskCount': task_count,
+        'subtaskCount': subtask_count,
+        'completedPhases': completed_phases,
+        'completedTasks': completed_tasks,
+        'completedSubtasks': completed_subtasks,
+        'commentCount': comment_count,
+        'totalItems': total,
+        'completedItems': completed,
+        'progress': round(completed / total * 100) if total else 0,
+        'updatedAt': updated_at,
+    }
@@ -0,0 +1,163 @@
+"""
+Katalog der Projektvorlagen.
+
+Alle Vorlagen werden einmal geladen, geprüft und samt Inhalt im Speicher
+gehalten. Höchstens alle `check_interval` Sekunden fragt der Katalog die
+Engine nach den Signaturen der Vorlagen (JSON-Engine: mtime und Größe je
+Datei, SQLite: Versionszähler) und lädt nur neue oder geänderte Vorlagen nach.
+
+Vorlagenformate:
+
+    {"name": ..., "description": ..., "data": {"phases": [...]}}   (Standard)
+    {"name": ..., "phases": [...]}
+    {"<projectId>": {"projectName": ..., "phases": [...]}}          (bsp.json, Format einer alten projects.json)
+"""
+import sys
+import time
+import uuid
+import hashlib
+import threading
+
+from .json_cache import freeze, thaw
+
+# Vorlage für das Beispielprojekt beim ersten Login; taucht nicht in der Vorlagenliste auf
+INITIAL_TEMPLATE_ID = 'bsp'
+
+
+class Template:
+    """Eine geladene und geprüfte Vorlage."""
+
+    __slots__ = ('id', 'name', 'description', 'phases', 'body', 'signature', 'etag')
+
+    def __init__(self, template_id, name, description, phases, body, signature):
+        self.id = template_id
+        self.name = name
+        self.description = description
+        self.phases = phases
+        self.body = body
+        self.signature = signature
+        self.etag = hashlib.sha1(f"{template_id}:{signature}".encode('utf-8')).hexdigest()[:16]
+
+
+def _extract_project(body):
+    """Gibt (Name, Phasen) aus einem der unterstützten Formate zurück oder wirft ValueError."""
+    if not isinstance(body, dict):
+        raise ValueError("Vorlage ist kein JSON-Objekt.")
+    if isinstance(body.get('data'), dict) and 'phases' in body['data']:
+        return body.get('name'), body['data']['phases']
+    if 'phases' in body:
+        return body.get('name') or body.get('projectName'), body['phases']
+    if len(body) == 1:
+        project = next(iter(body.values()))
+        if isinstance(project, dict) and 'phases' in project:
+            return project.get('projectName') or project.get('name'), project['phases']
+    raise ValueError("Vorlage enthält keine Phasen.")
+
+
+def _validate_phases(phases):
+    if not isinstance(phases, list):
+        raise ValueError("'phases' ist keine Liste.")
+    for phase in phases:
+        if not isinstance(phase, dict) or not isinstance(phase.get('tasks', []), list):
+            raise ValueError("Ungültige Phase.")
+        for task in phase.get('tasks', []):
+            if not isinstance(task, dict) or not isinstance(task.get('subtasks', []), list):
+                raise ValueError("Ungültige Aufgabe.")
+
+
+def _copy_without(item, key):
+    return {name: thaw(value) for name, value in item.items() if name != key}
+
+
+def instantiate_template(template, project_id, project_name=None):
+    """
+    Erzeugt ein neues Projekt aus einer Vorlage.
+    Phasen, Aufgaben und Unteraufgaben werden in einem Durchlauf kopiert und
+    erhalten dabei neue, projektweit eindeutige IDs (phaseId, taskId, subtaskId).
+    """
+    token = uuid.uuid4().hex[:8]
+    phases = []
+    for p, phase in enumerate(template.phases, 1):
+        new_phase = _copy_without(phase, 'tasks')
+        new_phase['phaseId'] = f"phase_{token}_{p}"
+        new_phase['tasks'] = tasks = []
+        for t, task in enumerate(phase.get('tasks') or [], 1):
+            new_task = _copy_without(task, 'subtasks')
+            new_task['taskId'] = f"task_{token}_{p}_{t}"
+            new_task['subtasks'] = [
+                dict(_copy_without(subtask, 'subtaskId'), subtaskId=f"sub_{token}_{p}_{t}_{s}")
+                for s, subtask in enumerate(task.get('subtasks') or [], 1)
+            ]
+            tasks.append(new_task)
+        phases.append(new_phase)
+    return {"projectId": project_id, "projectName": project_name or template.name, "phases": phases}
+
+
+class TemplateCatalog:
+    """Im Speicher gehaltener, inkrementell aktualisierter Vorlagenkatalog."""
+
+    def __init__(self, engine, check_interval=2.0):
+        self.engine = engine
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._templates = {}
+        self._rejected = {}  # template_id -> Signatur ungültiger Vorlagen, damit sie nicht bei jeder Prüfung neu geladen werden
+        self._listing = ((), None)  # (Liste für /api/templates, ETag), wird nur als Ganzes ersetzt
+        self._checked_at = None
+
+    def refresh(self, force=False):
+        """Lädt neue und geänderte Vorlagen nach. Ohne `force` höchstens alle `check_interval` Sekunden."""
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return
+            signatures = self.engine.template_signatures()
+            templates = {}
+            for template_id, signature in signatures.items():
+                current = self._templates.get(template_id)
+                if current is not None and current.signature == signature:
+                    templates[template_id] = current
+                    continue
+                if self._rejected.get(template_id) == signature:
+                    continue
+                template = self._load(template_id, signature)
+                if template is not None:
+                    templates[template_id] = template
+                    self._rejected.pop(template_id, None)
+                else:
+                    self._rejected[template_id] = signature
+            if templates.keys() != self._templates.keys() or any(
+                    templates[key] is not self._templates[key] for key in templates):
+                index = freeze([
+                    {'id': template.id, 'name': template.name, 'description': template.description}
+                    for template_id, template in sorted(templates.items()) if template_id != INITIAL_TEMPLATE_ID
+                ])
+                digest = hashlib.sha1()
+                for template_id, template in sorted(templates.items()):
+                    digest.update(f"{template_id}:{template.etag};".encode('utf-8'))
+                self._templates = templates
+                self._listing = (index, digest.hexdigest()[:16])
+            self._checked_at = time.monotonic()
+
+    def _load(self, template_id, signature):
+        body = self.engine.load_template(template_id)
+        try:
+            name, phases = _extract_project(body)
+            _validate_phases(phases)
+        except ValueError as e:
+            print(f"WARNUNG: Vorlage '{template_id}' wird übersprungen: {e}", file=sys.stderr)
+            return None
+        description = body.get('description', '') if isinstance(body, dict) else ''
+        return Template(template_id, name or template_id, description, freeze(phases), freeze(body), signature)
+
+    def index(self):
+        """Gibt (Liste {id, name, description} ohne bsp, ETag) zurück."""
+        self.refresh()
+        return self._listing
+
+    def get(self, template_id):
+        """Gibt die Vorlage oder None zurück."""
+        self.refresh()
+        return self._templates.get(template_id)
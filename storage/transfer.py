@@ -0,0 +1,71 @@
+"""
+Kopiert alle Daten von einer Speicher-Engine in eine andere.
+
+    python -m storage.transfer json sqlite      # JSON-Dateien -> SQLite (Standardpfade aus app.py)
+    python -m storage.transfer sqlite json      # zurück, z. B. für ein Backup als Dateien
+
+Optional: --database <pfad> für die SQLite-Datei. Die Ziel-Engine sollte
+leer sein; vorhandene Einträge mit gleicher ID werden überschrieben.
+"""
+import sys
+import argparse
+
+from .engine import USER_DOCUMENT_KINDS
+
+
+def transfer(source, target, log=print):
+    """Überträgt Benutzer, Benutzerdokumente, Projekte, globale Einstellungen und Vorlagen."""
+    users = {username: dict(record) for username, record in source.iter_users()}
+    target.replace_all_users(users)
+    log(f"{len(users)} Benutzer übertragen.")
+
+    project_count = 0
+    for record in users.values():
+        user_id = record['id']
+        for kind in USER_DOCUMENT_KINDS:
+            data = source.load_user_doc(user_id, kind, None, mutable=True)
+            if data is not None:
+                target.save_user_doc(user_id, kind, data)
+        for project_id in source.list_project_ids(user_id):
+            data = source.load_project(user_id, project_id, mutable=True)
+            if data is not None:
+                target.save_project(user_id, project_id, data)
+                project_count += 1
+    log(f"{project_count} Projekte übertragen.")
+
+    if (source.settings_file, source.templates_dir) == (target.settings_file, target.templates_dir):
+        # Beide Engines lesen Einstellungen und Vorlagen aus denselben Dateien
+        log("Globale Einstellungen und Vorlagen werden gemeinsam genutzt, nichts zu übertragen.")
+        return
+    target.save_global_settings(source.load_global_settings({}, mutable=True))
+    template_ids = source.list_template_ids()
+    for template_id in template_ids:
+        data = source.load_template(template_id)
+        if data is not None:
+            target.save_template(template_id, data)
+    log(f"Globale Einstellungen und {len(template_ids)} Vorlagen übertragen.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daten zwischen Speicher-Engines kopieren.")
+    parser.add_argument('source', choices=('json', 'sqlite'))
+    parser.add_argument('target', choices=('json', 'sqlite'))
+    parser.add_argument('--database', help="Pfad der SQLite-Datenbank (Standard: SQLITE_DATABASE aus app.py)")
+    args = parser.parse_args(argv)
+    if args.source == args.target:
+        parser.error("Quelle und Ziel müssen verschieden sein.")
+
+    import app
+    database = args.database or app.SQLITE_DATABASE
+    source = app.create_storage_engine(args.source, database)
+    target = app.create_storage_engine(args.target, database)
+    try:
+        transfer(source, target)
+    finally:
+        source.close()
+        target.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
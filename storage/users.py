@@ -0,0 +1,154 @@
+"""
+Indizierte Benutzerablage.
+
+Statt einer einzigen users.json, die für jeden Login komplett geparst und
+linear durchsucht wird, liegt jeder Benutzer in einer eigenen Datei:
+
+    <users_dir>/records/<aa>/<sha1(username)>.json
+    <users_dir>/index.json   {"usernames": [...], "emails": {email: username}}
+
+Ein Login per Benutzername öffnet genau eine Datensatzdatei, ein Login per
+E-Mail zusätzlich den (im Dokument-Cache gehaltenen) Index. Eine alte
+users.json (oder eine neue, z. B. von reset.py) wird beim nächsten Zugriff
+in den Bestand übernommen und danach in users.json.migrated umbenannt.
+Benutzer, die nur im Bestand existieren, bleiben dabei erhalten.
+"""
+import os
+import bisect
+import hashlib
+import shutil
+
+from .json_cache import thaw
+from .json_io import document_cache, flush_writes, json_exists, load_json, save_json
+from .locks import directory_lock
+
+INDEX_FILE_NAME = 'index.json'
+RECORDS_DIR_NAME = 'records'
+MIGRATED_SUFFIX = '.migrated'
+EMPTY_INDEX = {"usernames": [], "emails": {}}
+
+
+class UserRepository:
+    """Zugriff auf Benutzerdatensätze über Benutzername- und E-Mail-Index."""
+
+    def __init__(self, users_dir, legacy_users_file=None):
+        self.users_dir = users_dir
+        self.legacy_users_file = legacy_users_file
+        self.index_path = os.path.join(users_dir, INDEX_FILE_NAME)
+        self.records_dir = os.path.join(users_dir, RECORDS_DIR_NAME)
+
+    # --- Lesen ---
+
+    def get(self, username):
+        """Gibt den Datensatz (inkl. 'username') zu einem Benutzernamen zurück oder None."""
+        if not username:
+            return None
+        self._sync_legacy()
+        record = load_json(self._record_path(username), None)
+        return dict(record) if record else None
+
+    def find_by_email(self, email):
+        """Gibt den Datensatz zu einer E-Mail-Adresse zurück oder None."""
+        if not email:
+            return None
+        username = self._load_index()['emails'].get(email)
+        return self.get(username) if username else None
+
+    def find_by_identifier(self, identifier):
+        """Sucht zuerst per Benutzername, dann per E-Mail (wie das Login-Formular)."""
+        if identifier and self.username_exists(identifier):
+            return self.get(identifier)
+        return self.find_by_email(identifier)
+
+    def username_exists(self, username):
+        if not username:
+            return False
+        self._sync_legacy()
+        return json_exists(self._record_path(username))
+
+    def email_exists(self, email):
+        return email in self._load_index()['emails']
+
+    def count(self):
+        return len(self._load_index()['usernames'])
+
+    def list_page(self, offset=0, limit=100):
+        """Gibt eine alphabetisch sortierte Seite von Datensätzen zurück. Lädt nur die Datensätze dieser Seite."""
+        usernames = self._load_index()['usernames'][offset:offset + limit]
+        return [user for user in (self.get(name) for name in usernames) if user]
+
+    def iter_user_ids(self):
+        """Liefert die IDs aller Benutzer (z. B. für Aufräumjobs)."""
+        for username in self._load_index()['usernames']:
+            user = self.get(username)
+            if user:
+                yield user['id']
+
+    # --- Schreiben ---
+
+    def add(self, username, record):
+        """
+        Legt einen neuen Benutzer an und aktualisiert die Indizes inkrementell.
+        Gibt False zurück, wenn Benutzername oder E-Mail bereits vergeben sind.
+        """
+        with directory_lock(self.users_dir):
+            index = self._load_index(mutable=True)
+            if self.username_exists(username) or record.get('email') in index['emails']:
+                return False
+            save_json(self._record_path(username), dict(record, username=username))
+            bisect.insort(index['usernames'], username)
+            if record.get('email'):
+                index['emails'][record['email']] = username
+            save_json(self.index_path, index)
+            return True
+
+    def replace_all(self, users):
+        """Ersetzt den gesamten Bestand durch ein {username: record}-Dict (Format der alten users.json)."""
+        with directory_lock(self.users_dir):
+            self._rebuild(users)
+
+    # --- Interna ---
+
+    def _record_path(self, username):
+        digest = hashlib.sha1(username.encode('utf-8')).hexdigest()
+        return os.path.join(self.records_dir, digest[:2], f"{digest}.json")
+
+    def _load_index(self, mutable=False):
+        self._sync_legacy()
+        return load_json(self.index_path, EMPTY_INDEX, mutable=mutable)
+
+    def _sync_legacy(self):
+        """Übernimmt eine vorhandene users.json in den Bestand und benennt sie danach um."""
+        if not self.legacy_users_file or not os.path.exists(self.legacy_users_file):
+            return
+        with directory_lock(self.users_dir):
+            if not os.path.exists(self.legacy_users_file):
+                return
+            self._merge(thaw(load_json(self.legacy_users_file, {})))
+            os.replace(self.legacy_users_file, self.legacy_users_file + MIGRATED_SUFFIX)
+            document_cache.invalidate(self.legacy_users_file)
+
+    def _merge(self, users):
+        """Schreibt die Datensätze aus `users` in den Bestand; gleichnamige werden ersetzt, alle anderen bleiben."""
+        index = load_json(self.index_path, EMPTY_INDEX, mutable=True)
+        usernames = set(index['usernames'])
+        for username, record in users.items():
+            previous = load_json(self._record_path(username), None)
+            if previous and index['emails'].get(previous.get('email')) == username:
+                del index['emails'][previous['email']]
+            save_json(self._record_path(username), dict(record, username=username))
+            usernames.add(username)
+            if record.get('email'):
+                index['emails'].setdefault(record['email'], username)
+        save_json(self.index_path, {"usernames": sorted(usernames), "emails": index['emails']})
+
+    def _rebuild(self, users):
+        flush_writes()
+        if os.path.exists(self.records_dir):
+            shutil.rmtree(self.records_dir)
+        emails = {}
+        for username, record in users.items():
+            save_json(self._record_path(username), dict(record, username=username))
+            if record.get('email'):
+                emails.setdefault(record['email'], username)
+        save_json(self.index_path, {"usernames": sorted(users), "emails": emails})
@@ -2,11 +2,13 @@ import os
 import json
 from datetime import datetime
 
+from structure_rules import StructureRules
+
 # --- Konfiguration ---
 # Das Skript wird im Verzeichnis ausgeführt, in dem es sich befindet.
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-# Verzeichnisse, die bei der Analyse ignoriert werden sollen.
-IGNORED_DIRS = {'__pycache__', '.git', '.vscode', 'venv', 'structure_backup'}
+# Ausschluss- und Opak-Regeln (z. B. Benutzerdaten) kommen aus structure.json, siehe structure_rules.py
+RULES = StructureRules.from_structure_file(os.path.join(BASE_DIR, 'structure.json'))
 # Dateinamen für die JSON-Ausgaben
 STRUCTURE_OUTPUT_FILE = 'project_structure.json'
 JSON_PROFILE_OUTPUT_FILE = 'project_json.json'
@@ -60,13 +62,15 @@ def get_structure_dict(path):
     Durchläuft rekursiv einen Pfad und erstellt ein Dictionary, das die Struktur repräsentiert.
     """
     base_name = os.path.basename(path)
-    # Ignoriert spezifische Verzeichnisse und die Ausgabedateien selbst
-    if base_name in IGNORED_DIRS or base_name in [STRUCTURE_OUTPUT_FILE, JSON_PROFILE_OUTPUT_FILE]:
+    rel_path = os.path.relpath(path, BASE_DIR).replace('\\', '/')
+    is_dir = os.path.isdir(path)
+    # Ignoriert ausgeschlossene Pfade und die Ausgabedateien selbst
+    if base_name in [STRUCTURE_OUTPUT_FILE, JSON_PROFILE_OUTPUT_FILE] or (rel_path != '.' and RULES.is_excluded(rel_path, is_dir)):
         return None
 
-    rel_path = os.path.relpath(path, BASE_DIR).replace('\\', '/')
-    
-    if os.path.isdir(path):
+    if is_dir and RULES.is_opaque(rel_path):
+        return {"path": rel_path, "type": "directory", "opaque": True}
+    if is_dir:
         item = {"path": rel_path, "type": "directory", "children": []}
         try:
             for child_name in sorted(os.listdir(path)):
@@ -86,16 +90,19 @@ def scan_directory(path):
     print_log(f"Starte Scan im Verzeichnis: {path}")
     
     for root, dirs, files in os.walk(path, topdown=True):
-        # Ignorierte Verzeichnisse aus der weiteren Verarbeitung ausschließen
-        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+        rel_root = os.path.relpath(root, BASE_DIR).replace('\\', '/')
+        prefix = '' if rel_root == '.' else rel_root + '/'
+        # Ausgeschlossene Verzeichnisse aus der weiteren Verarbeitung ausschließen
+        dirs[:] = [d for d in dirs if not RULES.is_excluded(prefix + d, True)]
         
-        # Zähle die gültigen Verzeichnisse
+        # Zähle die gültigen Verzeichnisse; in opake Verzeichnisse (Laufzeitdaten) nicht absteigen
         stats["folder_count"] += len(dirs)
+        dirs[:] = [d for d in dirs if not RULES.is_opaque(prefix + d)]
         print_log(f"Untersuche: {os.path.relpath(root, BASE_DIR)} - {len(dirs)} Unterordner, {len(files)} Dateien", 1)
 
         for filename in files:
-            # Ignoriert die Ausgabedateien selbst
-            if filename in [STRUCTURE_OUTPUT_FILE, JSON_PROFILE_OUTPUT_FILE]:
+            # Ignoriert ausgeschlossene Dateien und die Ausgabedateien selbst
+            if filename in [STRUCTURE_OUTPUT_FILE, JSON_PROFILE_OUTPUT_FILE] or RULES.is_excluded(prefix + filename):
                 continue
 
             stats["file_count"] += 1
@@ -0,0 +1,110 @@
+"""
+Regeln für die Struktur-Werkzeuge (check_structure.py, structure_report.py).
+
+Die Regeln stehen unter dem Schlüssel "rules" in structure.json:
+
+    "rules": {
+      "exclude": ["__pycache__/", "/.*", "*.backup*"],
+      "include": ["/.gitignore"],
+      "opaque":  ["static/data/user_data/"]
+    }
+
+- exclude: Pfade, die weder gescannt noch gemeldet werden.
+- include: Ausnahmen von exclude (wie `!muster` in .gitignore).
+- opaque:  Verzeichnisse, deren Existenz geprüft wird, in die aber nicht
+  abgestiegen wird (Laufzeitdaten wie ein Ordner pro Benutzer).
+
+Die Muster folgen .gitignore: Ohne "/" passt ein Muster auf den Namen in jeder
+Tiefe, mit führendem oder innerem "/" auf den Pfad ab dem Projektverzeichnis.
+Ein "/" am Ende beschränkt das Muster auf Verzeichnisse. "*" und "?" passen
+nicht über "/" hinweg, "**" schon.
+
+Fehlen die Regeln in structure.json, gilt DEFAULT_RULES.
+"""
+import re
+import json
+
+DEFAULT_RULES = {
+    "exclude": [
+        "__pycache__/", ".git/", ".vscode/", "venv/", "structure_backup/", "/instance/",
+        # Versteckte Dateien und Ordner im Projektverzeichnis, Sicherungen, die Strukturdatei selbst
+        "/.*", "*.backup*", "/structure.json",
+        # Laufzeitdateien unter static/data (siehe DATA_PATHS in app.py)
+        "static/data/users.json", "static/data/users.json.migrated", "static/data/*.sqlite3*", "static/data/*.stamp",
+        "static/data/*.lock", "static/data/write_journal.log", "static/data/user_data_orphans/",
+    ],
+    "include": [],
+    "opaque": ["static/data/user_data/", "static/data/users/"],
+}
+
+
+def _translate(pattern):
+    """Übersetzt ein .gitignore-Muster in (regex, nur_verzeichnisse)."""
+    dir_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+    regex, i = '', 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            regex += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            regex += '[^/]'
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 1:]:
+            end = pattern.index(']', i + 1)
+            regex += '[' + pattern[i + 1:end].replace('!', '^', 1) + ']'
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    prefix = '' if anchored else '(?:.*/)?'
+    return re.compile(prefix + regex + r'\Z'), dir_only
+
+
+class StructureRules:
+    """Ausschluss-, Einschluss- und Opak-Regeln für Pfade relativ zum Projektverzeichnis (mit '/')."""
+
+    def __init__(self, exclude=(), include=(), opaque=()):
+        self.exclude = list(exclude)
+        self.include = list(include)
+        self.opaque = list(opaque)
+        self._exclude = [_translate(p) for p in self.exclude]
+        self._include = [_translate(p) for p in self.include]
+        self._opaque = [_translate(p) for p in self.opaque]
+
+    @classmethod
+    def from_dict(cls, rules):
+        rules = rules if isinstance(rules, dict) else DEFAULT_RULES
+        return cls(rules.get('exclude', ()), rules.get('include', ()), rules.get('opaque', ()))
+
+    @classmethod
+    def from_structure_file(cls, path):
+        """Liest die Regeln aus structure.json; ohne Datei oder Schlüssel gilt DEFAULT_RULES."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls.from_dict(json.load(f).get('rules'))
+        except (OSError, ValueError, AttributeError):
+            return cls.from_dict(DEFAULT_RULES)
+
+    def to_dict(self):
+        return {"exclude": self.exclude, "include": self.include, "opaque": self.opaque}
+
+    @staticmethod
+    def _matches(compiled, rel_path, is_dir):
+        return any(regex.match(rel_path) for regex, dir_only in compiled if is_dir or not dir_only)
+
+    def is_excluded(self, rel_path, is_dir=False):
+        return (self._matches(self._exclude, rel_path, is_dir)
+                and not self._matches(self._include, rel_path, is_dir))
+
+    def is_opaque(self, rel_path):
+        """True für Verzeichnisse, deren Inhalt nicht gescannt wird."""
+        return self._matches(self._opaque, rel_path, True)
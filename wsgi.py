@@ -0,0 +1,11 @@
+"""
+WSGI-Einstiegspunkt für den Produktivbetrieb.
+
+    gunicorn -c gunicorn.conf.py wsgi:app      (Linux, mehrere Worker-Prozesse)
+    python serve.py                            (waitress, z. B. unter Windows)
+
+`python app.py` startet dagegen den Flask-Entwicklungsserver.
+"""
+from app import create_app
+
+app = application = create_app()